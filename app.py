@@ -10,16 +10,16 @@ Workforce Analytics & Employee Management System
 
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
 import datetime
 import random
-import io
 
 # Local utilities
 from utils import database as db
 from utils.auth import require_login, logout_user, show_role_badge
-from utils.analytics import get_summary, department_distribution, gender_ratio, average_salary_by_dept
-from utils.pdf_export import generate_summary_pdf
+from utils.analytics import get_summary_db, department_distribution_db, gender_ratio_db, average_salary_by_dept_db
+from utils import report_jobs, charts
+from utils.csv_import import import_employees_csv
+from utils.employee_cube import get_cube
 
 st.set_page_config(page_title="Workforce Analytics System", page_icon="👩‍💼", layout="wide")
 
@@ -104,8 +104,7 @@ if df.empty:
         return pd.DataFrame(employees)
 
     df_gen = generate_employees(80)
-    for _, row in df_gen.iterrows():
-        db.add_employee(row.to_dict())
+    db.add_employees(df_gen)
     df = db.fetch_employees()
     st.success("✔ Realistic employees generated.")
 
@@ -126,29 +125,29 @@ tab = st.sidebar.radio("Select Module", tabs)
 if tab == "Employees" and role in ["Admin", "Manager", "HR"]:
     st.header("👩‍💼 Employee Management")
 
-    # Filters
+    # Filters (options, counts and salary metrics come from the rollup cube)
+    cube = get_cube()
     st.sidebar.header("Filters")
-    f_dept   = st.sidebar.selectbox("Department", ["All"] + sorted(df["Department"].dropna().unique()))
-    f_status = st.sidebar.selectbox("Status", ["All"] + sorted(df["Status"].dropna().unique()))
+    f_dept   = st.sidebar.selectbox("Department", ["All"] + cube.values("Department"))
+    f_status = st.sidebar.selectbox("Status", ["All"] + cube.values("Status"))
     f_gender = st.sidebar.selectbox("Gender", ["All", "Male", "Female"])
-    f_role   = st.sidebar.selectbox("Role", ["All"] + sorted(df["Role"].dropna().unique()))
+    f_role   = st.sidebar.selectbox("Role", ["All"] + cube.values("Role"))
+    filters = {"Department": f_dept, "Status": f_status, "Gender": f_gender, "Role": f_role}
 
-    filtered = df.copy()
-    if f_dept != "All": filtered = filtered[filtered["Department"] == f_dept]
-    if f_status != "All": filtered = filtered[filtered["Status"] == f_status]
-    if f_gender != "All": filtered = filtered[filtered["Gender"] == f_gender]
-    if f_role != "All": filtered = filtered[filtered["Role"] == f_role]
+    totals = cube.totals(filters)
+    m1, m2, m3, m4 = st.columns(4)
+    m1.metric("Employees", totals["headcount"])
+    m2.metric("Active", totals["active"])
+    m3.metric("Resigned", totals["resigned"])
+    m4.metric("Avg Salary", f"{totals['avg_salary']:,.0f}" if totals["avg_salary"] is not None else "-")
+
+    filtered = db.fetch_employees(where=filters)
 
     search = st.text_input("Search by Name / Role / Skills / ID").lower().strip()
     disp = filtered.copy()
     if search:
-        mask = (
-            disp["Name"].astype(str).str.lower().str.contains(search, na=False) |
-            disp["Role"].astype(str).str.lower().str.contains(search, na=False) |
-            disp["Skills"].astype(str).str.lower().str.contains(search, na=False) |
-            disp["Emp_ID"].astype(str).str.contains(search, na=False)
-        )
-        disp = disp[mask]
+        hits = db.search("employees", search, limit=None)
+        disp = disp[disp["Emp_ID"].isin(hits["Emp_ID"])]
 
     st.dataframe(disp[["Emp_ID","Name","Department","Role","Join_Date","Status"]], height=400)
 
@@ -157,14 +156,15 @@ if tab == "Employees" and role in ["Admin", "Manager", "HR"]:
     upload = st.file_uploader("Upload CSV", type=["csv"])
     if upload:
         try:
-            df_u = pd.read_csv(upload)
-            required_cols = ["Name","Age","Gender","Department","Role","Skills","Join_Date","Resign_Date","Status","Salary","Location"]
-            for col in required_cols:
-                if col not in df_u.columns:
-                    df_u[col] = ""
-            for _, row in df_u.iterrows():
-                db.add_employee(row.to_dict())
-            st.success("CSV imported successfully!")
+            progress = st.progress(0.0, text="Importing...")
+            def on_progress(rows, fraction):
+                progress.progress(fraction if fraction is not None else 0.0, text=f"Imported {rows} rows...")
+            result = import_employees_csv(upload, on_progress=on_progress)
+            progress.progress(1.0, text="Done")
+            st.success(f"CSV imported: {result['imported']} of {result['read']} rows added.")
+            if result["rejected"]:
+                st.warning(f"{result['rejected']} rows rejected.")
+                st.dataframe(result["rejects"], height=250)
         except Exception as e:
             st.error("CSV import failed.")
             st.exception(e)
@@ -195,63 +195,46 @@ elif tab == "Feedback":
 # -------------------------
 elif tab == "Analytics":
     st.header("📊 Workforce Analytics & Summary")
-    filtered = df.copy()
-    summary = get_summary(filtered)
+    summary = get_summary_db()
     c1, c2, c3 = st.columns(3)
     c1.metric("Total Employees", summary["total"])
     c2.metric("Active", summary["active"])
     c3.metric("Resigned", summary["resigned"])
 
     # Department Distribution
-    dept_counts = department_distribution(filtered)
-    fig, ax = plt.subplots(figsize=(8,4))
-    ax.bar(dept_counts.index, dept_counts.values)
-    ax.set_xlabel("Department")
-    ax.set_ylabel("Employees")
-    ax.set_title("Employees by Department")
-    plt.xticks(rotation=30)
-    st.pyplot(fig)
+    dept_counts = department_distribution_db()
+    fig = charts.bar_chart(dept_counts, "Employees by Department", "Department", "Employees",
+                           figsize=(8,4), palette=None, rotation=30)
+    st.image(fig)
 
     # Gender Ratio
-    g = gender_ratio(filtered)
-    fig2, ax2 = plt.subplots(figsize=(5,5))
-    ax2.pie(g.values, labels=g.index, autopct="%1.1f%%")
-    ax2.set_title("Gender Split")
-    st.pyplot(fig2)
+    g = gender_ratio_db()
+    fig2 = charts.pie_chart(g, "Gender Split", figsize=(5,5), palette=None, startangle=0)
+    st.image(fig2)
 
     # Average Salary
-    sal = average_salary_by_dept(filtered)
-    fig3, ax3 = plt.subplots(figsize=(8,4))
-    ax3.bar(sal.index, sal.values)
-    ax3.set_xlabel("Department")
-    ax3.set_ylabel("Average Salary")
-    ax3.set_title("Department-wise Salary")
-    plt.xticks(rotation=30)
-    st.pyplot(fig3)
+    sal = average_salary_by_dept_db()
+    fig3 = charts.bar_chart(sal, "Department-wise Salary", "Department", "Average Salary",
+                            figsize=(8,4), palette=None, rotation=30)
+    st.image(fig3)
 
     # PDF Export
     st.subheader("📄 Export PDF Summary")
-    pdf_buffer = io.BytesIO()
     if st.button("Generate PDF"):
         try:
-            generate_summary_pdf(
-                buffer=pdf_buffer,
+            # the analytics tab covers every employee: let the worker stream the table
+            st.session_state["analytics_pdf_job"] = report_jobs.submit_summary_pdf(
                 total=summary["total"],
                 active=summary["active"],
                 resigned=summary["resigned"],
-                df=filtered,
-                mood_df=db.fetch_mood_logs(),
+                df=report_jobs.rows("employees"),
+                mood_df=report_jobs.rows("mood_logs"),
                 dept_fig=fig,
                 gender_fig=fig2,
                 salary_fig=fig3,
                 title="Workforce Summary Report"
             )
-            st.download_button(
-                label="Download PDF",
-                data=pdf_buffer,
-                file_name="workforce_summary_report.pdf",
-                mime="application/pdf"
-            )
         except Exception as e:
             st.error("Failed to generate PDF.")
             st.exception(e)
+    report_jobs.show_job("analytics_pdf_job", "workforce_summary_report.pdf", "Download PDF")
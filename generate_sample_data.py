@@ -65,9 +65,11 @@ for _ in range(200):
         'Salary': float(salary),
         'Location': location
     }
-    
+
     data.append(row)
-    db.add_employee(row)
+
+# Insert all rows in one transaction
+db.add_employees(data)
 
 # Optional: save to CSV
 df = pd.DataFrame(data)
@@ -2,7 +2,7 @@
 import random
 from datetime import datetime, timedelta, date
 from utils import database as db
-import sqlite3
+from utils.db_pool import transaction
 
 RANDOM_SEED = 42
 random.seed(RANDOM_SEED)
@@ -93,15 +93,11 @@ if __name__ == "__main__":
     db.initialize_all_tables()
 
     # Clear existing employees
-    conn = sqlite3.connect(db.DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM employees")
-    conn.commit()
-    conn.close()
+    with transaction() as conn:
+        conn.execute("DELETE FROM employees")
 
     employees = generate_realistic_employees(1000)
-    for emp in employees:
-        db.add_employee(emp)
+    db.add_employees(employees)
 
     print("✅ 1000 realistic employees generated successfully!")
     print("Default users: admin/admin123 | manager/manager123 | employee/employee123")
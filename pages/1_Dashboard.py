@@ -6,36 +6,23 @@ Integrates with utils.database and utils.analytics.
 """
 
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
 from utils import database as db
-from utils.analytics import get_summary, department_distribution, gender_ratio, average_salary_by_dept
+from utils import charts
+from utils.analytics import get_summary_db, department_distribution_db, gender_ratio_db, average_salary_by_dept_db
 
 # -------------------------
 st.set_page_config(page_title="Dashboard", page_icon="📊", layout="wide")
 st.title("📊 Workforce Dashboard")
 
 # -------------------------
-# Load employee data
-try:
-    df = db.fetch_employees()
-except Exception as e:
-    st.error("Failed to fetch employee data from database.")
-    st.exception(e)
-    df = pd.DataFrame(columns=[
-        "Emp_ID","Name","Age","Gender","Department","Role",
-        "Skills","Join_Date","Resign_Date","Status","Salary","Location"
-    ])
-
-# -------------------------
-# Summary Cards
+# Summary Cards (aggregated in SQLite; no full employee load)
 st.header("1️⃣ Key Metrics")
 try:
-    total, active, resigned = get_summary(df) if not df.empty else (0,0,0)
+    summary = get_summary_db()
     col1, col2, col3 = st.columns(3)
-    col1.metric("Total Employees", total)
-    col2.metric("Active Employees", active)
-    col3.metric("Resigned Employees", resigned)
+    col1.metric("Total Employees", summary["total"])
+    col2.metric("Active Employees", summary["active"])
+    col3.metric("Resigned Employees", summary["resigned"])
 except Exception as e:
     st.error("Error computing summary metrics.")
     st.exception(e)
@@ -44,8 +31,8 @@ except Exception as e:
 # Department-wise Distribution
 st.header("2️⃣ Department Distribution")
 try:
-    if not df.empty and "Department" in df.columns:
-        dept_counts = department_distribution(df)
+    dept_counts = department_distribution_db()
+    if not dept_counts.empty:
         st.bar_chart(dept_counts)
     else:
         st.info("No 'Department' data available.")
@@ -58,25 +45,19 @@ except Exception as e:
 st.header("3️⃣ Skill Inventory & Role Mapping")
 
 try:
-    if not df.empty:
-        # Extract all skills
-        skill_list = []
-        if "Skills" in df.columns:
-            for s in df["Skills"].dropna():
-                skill_list.extend([skill.strip() for skill in s.split(";") if skill.strip()])
+    role_counts = db.aggregate("employees", {"n": ("count", None)}, group_by="Role")
+    role_counts = role_counts[role_counts["Role"].notna()].set_index("Role")["n"].sort_values(ascending=False)
+    if not role_counts.empty:
+        # Skill counts from the employee_skills index
+        skill_counts = db.skill_counts().set_index("Skill")["Count"]
 
-        if skill_list:
-            skill_counts = pd.Series(skill_list).value_counts()
+        if not skill_counts.empty:
             st.subheader("🔹 Skill Distribution")
             st.bar_chart(skill_counts)
 
         # Role mapping
-        if "Role" in df.columns:
-            role_counts = df["Role"].value_counts()
-            st.subheader("🔹 Role Mapping")
-            st.bar_chart(role_counts)
-        else:
-            st.info("No 'Role' column found.")
+        st.subheader("🔹 Role Mapping")
+        st.bar_chart(role_counts)
     else:
         st.info("No employee data to display Skill Inventory or Role Mapping.")
 except Exception as e:
@@ -87,12 +68,9 @@ except Exception as e:
 # Gender Ratio
 st.header("4️⃣ Gender Ratio")
 try:
-    if not df.empty and "Gender" in df.columns:
-        gender_counts = gender_ratio(df)
-        fig, ax = plt.subplots()
-        ax.pie(gender_counts, labels=gender_counts.index, autopct="%1.1f%%", startangle=90)
-        ax.axis("equal")
-        st.pyplot(fig)
+    gender_counts = gender_ratio_db()
+    if gender_counts.sum() > 0:
+        st.image(charts.pie_chart(gender_counts, "", figsize=(6.4, 4.8), palette=None))
     else:
         st.info("No 'Gender' data available.")
 except Exception as e:
@@ -103,8 +81,8 @@ except Exception as e:
 # Average Salary by Department
 st.header("5️⃣ Average Salary by Department")
 try:
-    if not df.empty and "Department" in df.columns and "Salary" in df.columns:
-        avg_salary = average_salary_by_dept(df)
+    avg_salary = average_salary_by_dept_db()
+    if not avg_salary.empty:
         st.bar_chart(avg_salary)
     else:
         st.info("No 'Department' or 'Salary' data available.")
@@ -116,9 +94,10 @@ except Exception as e:
 # Recent Employees Table
 st.header("6️⃣ Recent Employees")
 try:
-    if not df.empty:
-        recent_df = df.sort_values(by="Join_Date", ascending=False).head(10)
-        st.dataframe(recent_df[["Emp_ID","Name","Department","Role","Join_Date","Status"]])
+    recent_df = db.fetch_employees(columns=["Emp_ID","Name","Department","Role","Join_Date","Status"],
+                                   order_by="Join_Date DESC", limit=10)
+    if not recent_df.empty:
+        st.dataframe(recent_df)
     else:
         st.info("No employee data to display.")
 except Exception as e:
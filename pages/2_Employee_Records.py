@@ -8,73 +8,59 @@ Integrates with utils.database and utils.analytics.
 import streamlit as st
 import pandas as pd
 from utils import database as db
-from utils.analytics import get_summary
+from utils.employee_cube import get_cube
 
 # -------------------------
 st.set_page_config(page_title="Employee Records", page_icon="📄", layout="wide")
 st.title("📄 Employee Records")
 
-# -------------------------
-# Load employee data
-try:
-    df = db.fetch_employees()
-except Exception as e:
-    st.error("Failed to fetch employee data from database.")
-    st.exception(e)
-    df = pd.DataFrame(columns=[
-        "Emp_ID","Name","Age","Gender","Department","Role",
-        "Skills","Join_Date","Resign_Date","Status","Salary","Location"
-    ])
-
 # -------------------------
 # Sidebar Filters
 st.sidebar.header("🔍 Filter Employee Data")
 
-def safe_options(df_local, col):
-    """Return sorted unique options for a column, plus 'All'."""
-    if col in df_local.columns:
-        opts = sorted(df_local[col].dropna().unique().tolist())
-        return ["All"] + opts
-    return ["All"]
-
-selected_dept = st.sidebar.selectbox("Department", safe_options(df, "Department"))
-selected_status = st.sidebar.selectbox("Status", safe_options(df, "Status"))
-selected_gender = st.sidebar.selectbox("Gender", safe_options(df, "Gender"))
-selected_role = st.sidebar.selectbox("Role", safe_options(df, "Role"))
-selected_skills = st.sidebar.selectbox("Skills", safe_options(df, "Skills"))
-
-# Apply filters
-filtered_df = df.copy()
-if selected_dept != "All":
-    filtered_df = filtered_df[filtered_df["Department"] == selected_dept]
-if selected_status != "All":
-    filtered_df = filtered_df[filtered_df["Status"] == selected_status]
-if selected_gender != "All":
-    filtered_df = filtered_df[filtered_df["Gender"] == selected_gender]
-if selected_role != "All":
-    filtered_df = filtered_df[filtered_df["Role"] == selected_role]
-if selected_skills != "All":
-    filtered_df = filtered_df[filtered_df["Skills"] == selected_skills]
-
+try:
+    cube = get_cube()  # rollup cube: dropdown options and filter counts without row scans
+except Exception:
+    cube = None
+
+def safe_options(col):
+    """Return sorted distinct options for a column (from the rollup cube), plus 'All'."""
+    try:
+        return ["All"] + (cube.values(col) if cube is not None else db.fetch_distinct(col))
+    except Exception:
+        return ["All"]
+
+selected_dept = st.sidebar.selectbox("Department", safe_options("Department"))
+selected_status = st.sidebar.selectbox("Status", safe_options("Status"))
+selected_gender = st.sidebar.selectbox("Gender", safe_options("Gender"))
+selected_role = st.sidebar.selectbox("Role", safe_options("Role"))
+try:
+    skill_options = ["All"] + db.fetch_skills()
+except Exception:
+    skill_options = ["All"]
+selected_skill = st.sidebar.selectbox("Skill", skill_options)
+
+# Filters are pushed down to SQLite; "All" is skipped
+filters = {
+    "Department": selected_dept,
+    "Status": selected_status,
+    "Gender": selected_gender,
+    "Role": selected_role,
+    "Skill": selected_skill,  # employees having this skill (employee_skills index)
+}
 
 # -------------------------
 # Skill Inventory & Role Mapping
 st.header("🔧 Skill Inventory & Role Mapping")
 try:
-    if not filtered_df.empty and "Skills" in filtered_df.columns and "Role" in filtered_df.columns:
-        # Split semicolon-separated skills into individual rows
-        skill_rows = filtered_df.assign(Skill=filtered_df['Skills'].str.split(';')).explode('Skill')
-        skill_rows['Skill'] = skill_rows['Skill'].str.strip()
-
-        # Group by Skill and Role, count employees
-        skill_role_counts = skill_rows.groupby(['Skill', 'Role']).size().reset_index(name='Count')
-
+    skill_role_counts = db.skill_counts(where=filters, by="Role")
+    if not skill_role_counts.empty:
         # Display table
         st.subheader("Employee Count by Skill & Role")
         st.dataframe(skill_role_counts)
 
         # Optional: Bar chart for top 10 skills
-        top_skills = skill_rows['Skill'].value_counts().head(10)
+        top_skills = db.skill_counts(where=filters).head(10).set_index("Skill")["Count"]
         st.subheader("Top 10 Skills in Workforce")
         st.bar_chart(top_skills)
     else:
@@ -87,44 +73,67 @@ except Exception as e:
 # Search
 st.header("1️⃣ Search Employee Records")
 search_term = st.text_input("Search by Name, ID, Skills, or Role").strip()
-display_df = filtered_df.copy()
-
-if search_term:
-    cond = pd.Series([False]*len(display_df), index=display_df.index)
-    for col in ["Name","Emp_ID","Skills","Role"]:
-        if col in display_df.columns:
-            cond = cond | display_df[col].astype(str).str.contains(search_term, case=False, na=False)
-    display_df = display_df[cond]
 
 # -------------------------
-# Sorting
-available_sort_cols = [c for c in ["Emp_ID","Name","Age","Salary","Join_Date","Department","Role","Skills"] if c in display_df.columns]
-if not available_sort_cols:
-    available_sort_cols = display_df.columns.tolist()
-
-sort_col = st.selectbox("Sort by", options=available_sort_cols, index=0)
-ascending = st.radio("Order", ["Ascending","Descending"], horizontal=True) == "Ascending"
-
-try:
-    if sort_col in display_df.columns:
-        display_df = display_df.sort_values(by=sort_col, ascending=ascending, key=lambda s: s.astype(str))
-except Exception:
-    pass
+# Sorting & page size
+sort_options = ["Emp_ID","Name","Age","Salary","Join_Date","Department","Role","Skills"]
+c1, c2, c3 = st.columns([2, 2, 1])
+sort_col = c1.selectbox("Sort by", options=sort_options, index=0)
+ascending = c2.radio("Order", ["Ascending","Descending"], horizontal=True) == "Ascending"
+page_size = c3.selectbox("Rows per page", [25, 50, 100, 250], index=1)
+
+# Keyset pagination: session keeps the cursor that starts each visited page.
+# Any change of filters / search / sort / page size starts again at page 1.
+view_key = (tuple(filters.items()), search_term, sort_col, ascending, page_size)
+if st.session_state.get("records_view") != view_key:
+    st.session_state["records_view"] = view_key
+    st.session_state["records_cursors"] = [None]
+cursors = st.session_state["records_cursors"]
 
 # -------------------------
 # Display Table
 st.header("2️⃣ Employee Records Table")
+# counts: the cube answers any sidebar selection; a search needs SQLite
+use_cube = cube is not None and not search_term and cube.can_answer(filters)
+totals = cube.totals(filters) if use_cube else None
 try:
-    styled = display_df.style.set_properties(**{"background-color":"white","color":"black"})
+    total_rows = totals["headcount"] if use_cube else db.count_employees(where=filters, search=search_term)
+    page_df, next_cursor = db.fetch_employee_page(
+        where=filters, search=search_term, sort_by=sort_col, descending=not ascending,
+        page_size=page_size, cursor=cursors[-1]
+    )
+except Exception as e:
+    st.error("Failed to fetch employee records.")
+    st.exception(e)
+    total_rows, page_df, next_cursor = 0, pd.DataFrame(), None
+
+page_no = len(cursors)
+page_count = max(1, -(-total_rows // page_size))
+nav1, nav2, nav3 = st.columns([1, 3, 1])
+if nav1.button("◀ Previous", disabled=page_no == 1):
+    cursors.pop()
+    st.rerun()
+nav2.markdown(f"Page **{page_no}** of **{page_count}** · {total_rows} matching employees")
+if nav3.button("Next ▶", disabled=next_cursor is None):
+    cursors.append(next_cursor)
+    st.rerun()
+
+try:
+    styled = page_df.style.set_properties(**{"background-color":"white","color":"black"})
     st.dataframe(styled, height=500)
 except Exception:
-    st.dataframe(display_df, height=500)
+    st.dataframe(page_df, height=500)
 
 # -------------------------
 # Summary
 st.header("3️⃣ Summary Statistics")
 try:
-    total, active, resigned = get_summary(display_df) if not display_df.empty else (0,0,0)
+    total = total_rows
+    if use_cube:
+        active, resigned = totals["active"], totals["resigned"]
+    else:
+        active = db.count_employees(where={**filters, "Status": "Active"}, search=search_term) if selected_status in ("All", "Active") else 0
+        resigned = db.count_employees(where={**filters, "Status": "Resigned"}, search=search_term) if selected_status in ("All", "Resigned") else 0
     col1, col2, col3 = st.columns(3)
     col1.metric("Total Employees", total)
     col2.metric("Active Employees", active)
@@ -1,13 +1,11 @@
 # pages/4_Reports.py
 import streamlit as st
-import pandas as pd
 from utils import database as db
 from utils.auth import require_login, show_role_badge, logout_user
-from utils.pdf_export import generate_summary_pdf
-import io
-import matplotlib.pyplot as plt
+from utils import report_jobs, charts
 import seaborn as sns
-from utils.analytics import get_summary, department_distribution, gender_ratio, average_salary_by_dept
+from utils.analytics import get_summary_db, department_distribution_db, gender_ratio_db, average_salary_by_dept_db
+from utils.analytics import headcount_history, salary_quantiles_db
 
 sns.set_style("whitegrid")
 
@@ -27,33 +25,22 @@ if role not in ["Admin", "Manager"]:
     st.warning("Access denied. Admin/Manager only.")
     st.stop()
 
-# -------------------------
-# Fetch employee and mood data
-# -------------------------
-try:
-    df = db.fetch_employees()
-except Exception:
-    df = pd.DataFrame()
-
-try:
-    mood_df = db.fetch_mood_logs()
-except Exception:
-    mood_df = pd.DataFrame()
-
 # -------------------------
 # Filters
 # -------------------------
 st.header("📊 Workforce Reports")
 
-dept_filter = st.selectbox("Filter by Department", ["All"] + sorted(df["Department"].dropna().unique().tolist()))
-filtered_df = df.copy()
-if dept_filter != "All":
-    filtered_df = filtered_df[filtered_df["Department"] == dept_filter]
+try:
+    dept_options = ["All"] + db.fetch_distinct("Department")
+except Exception:
+    dept_options = ["All"]
+dept_filter = st.selectbox("Filter by Department", dept_options)
+filters = {"Department": dept_filter}
 
 # -------------------------
-# Summary Metrics
+# Summary Metrics (aggregated in SQLite)
 # -------------------------
-summary = get_summary(filtered_df)
+summary = get_summary_db(filters)
 st.metric("Total Employees", summary["total"])
 st.metric("Active Employees", summary["active"])
 st.metric("Resigned Employees", summary["resigned"])
@@ -64,68 +51,72 @@ st.markdown("---")
 # Generate Charts
 # -------------------------
 # Department Distribution
+# (PNG bytes from the shared chart cache, reused by the PDF below)
 dept_fig = None
-if not filtered_df.empty and "Department" in filtered_df.columns:
-    dept_ser = department_distribution(filtered_df)
-    fig, ax = plt.subplots(figsize=(8,5))
-    sns.barplot(x=dept_ser.index, y=dept_ser.values, palette="pastel", ax=ax)
-    ax.set_xlabel("Department")
-    ax.set_ylabel("Number of Employees")
-    ax.set_title("Department-wise Employee Distribution")
-    plt.xticks(rotation=45)
-    st.pyplot(fig, use_container_width=True)
-    dept_fig = fig
+dept_ser = department_distribution_db(filters)
+if not dept_ser.empty:
+    dept_fig = charts.bar_chart(dept_ser, "Department-wise Employee Distribution", "Department", "Number of Employees")
+    st.image(dept_fig, use_container_width=True)
 
 # Gender Ratio
 gender_fig = None
-if not filtered_df.empty and "Gender" in filtered_df.columns:
-    gender_counts = gender_ratio(filtered_df)
-    fig, ax = plt.subplots(figsize=(6,6))
-    ax.pie(gender_counts.values, labels=gender_counts.index, autopct="%1.1f%%",
-           startangle=90, colors=sns.color_palette("pastel"))
-    ax.axis("equal")
-    ax.set_title("Gender Distribution")
-    st.pyplot(fig, use_container_width=True)
-    gender_fig = fig
+gender_counts = gender_ratio_db(filters)
+if gender_counts.sum() > 0:
+    gender_fig = charts.pie_chart(gender_counts, "Gender Distribution")
+    st.image(gender_fig, use_container_width=True)
 
 # Average Salary by Department
 salary_fig = None
-if not filtered_df.empty and "Salary" in filtered_df.columns and "Department" in filtered_df.columns:
-    avg_salary = average_salary_by_dept(filtered_df)
-    fig, ax = plt.subplots(figsize=(8,5))
-    sns.barplot(x=avg_salary.index, y=avg_salary.values, palette="pastel", ax=ax)
-    ax.set_xlabel("Department")
-    ax.set_ylabel("Average Salary")
-    ax.set_title("Average Salary by Department")
-    plt.xticks(rotation=45)
-    st.pyplot(fig, use_container_width=True)
-    salary_fig = fig
+avg_salary = average_salary_by_dept_db(filters)
+if not avg_salary.empty:
+    salary_fig = charts.bar_chart(avg_salary, "Average Salary by Department", "Department", "Average Salary")
+    st.image(salary_fig, use_container_width=True)
+
+# Salary bands (quantiles read from the salary histograms)
+st.subheader("💰 Salary Bands")
+band_by = st.selectbox("Salary bands by", ["Department", "Role", "Location"])
+bands = salary_quantiles_db(band_by, where=filters)
+if not bands.empty:
+    st.image(charts.band_chart(bands, f"Salary Bands by {band_by}", band_by, "Salary"), use_container_width=True)
+    st.dataframe(bands.round(0))
+else:
+    st.info("No salary data available.")
+
+# Headcount & attrition over time (monthly)
+st.subheader("📈 Headcount & Attrition Over Time")
+try:
+    history = headcount_history(
+        db.fetch_employees(columns=["Join_Date", "Resign_Date"], where=filters), freq="M"
+    ).set_index("date")
+    if not history.empty:
+        st.line_chart(history[["headcount"]])
+        st.bar_chart(history[["hires", "resignations"]])
+        st.line_chart(history[["attrition_rate"]])
+    else:
+        st.info("No join dates available for a headcount history.")
+except Exception as e:
+    st.error("Failed to build headcount history.")
+    st.exception(e)
 
 # -------------------------
 # Download PDF
 # -------------------------
 st.subheader("📄 Download Workforce Summary PDF")
-pdf_buffer = io.BytesIO()
 if st.button("Generate PDF"):
     try:
-        generate_summary_pdf(
-            buffer=pdf_buffer,
+        # built in a background worker, which streams employee and mood rows itself
+        st.session_state["reports_pdf_job"] = report_jobs.submit_summary_pdf(
             total=summary["total"],
             active=summary["active"],
             resigned=summary["resigned"],
-            df=filtered_df,
-            mood_df=mood_df,
+            df=report_jobs.rows("employees", where=filters),
+            mood_df=report_jobs.rows("mood_logs"),
             dept_fig=dept_fig,
             gender_fig=gender_fig,
             salary_fig=salary_fig,
             title="Workforce Summary Report"
         )
-        st.download_button(
-            label="Download PDF",
-            data=pdf_buffer,
-            file_name="workforce_summary_report.pdf",
-            mime="application/pdf"
-        )
     except Exception as e:
         st.error("Failed to generate PDF.")
         st.exception(e)
+report_jobs.show_job("reports_pdf_job", "workforce_summary_report.pdf", "Download PDF")
@@ -3,7 +3,7 @@ import streamlit as st
 import pandas as pd
 import datetime
 
-from utils.auth import require_login, show_role_badge, logout_user
+from utils.auth import require_login, show_role_badge, logout_user, current_emp_id
 from utils import database as db
 
 def show():
@@ -23,14 +23,23 @@ def show():
     # Load Data
     # -----------------------
     try:
-        emp_df = db.fetch_employees()
+        emp_df = db.fetch_employees(columns=["Emp_ID", "Name"])
     except Exception as e:
         st.error("Failed to load employees.")
         st.exception(e)
         emp_df = pd.DataFrame()
 
+    # employees only see their own tasks: read them from their profile, not the full table
+    my_emp_id = current_emp_id() if role == "Employee" else None
+    if role == "Employee" and my_emp_id is None:
+        st.info("No employee record is linked to your login, so no tasks are shown.")
     try:
-        tasks_df = db.fetch_tasks()
+        if role != "Employee":
+            tasks_df = db.fetch_tasks()
+        elif my_emp_id is not None:
+            tasks_df = db.employee_profile(my_emp_id)["tasks"]
+        else:
+            tasks_df = pd.DataFrame(columns=db.TABLE_COLUMNS["tasks"])
     except Exception as e:
         st.error("Failed to load tasks.")
         st.exception(e)
@@ -87,16 +96,11 @@ def show():
 
     tasks_display = tasks_df.copy()
     if not tasks_display.empty and emp_df.shape[0] > 0:
-        emp_map = emp_df.set_index("Emp_ID")["Name"].to_dict()
-        tasks_display["Employee"] = tasks_display["emp_id"].map(emp_map).fillna(tasks_display["emp_id"].astype(str))
+        tasks_display["Employee"] = db.names_for(tasks_display["emp_id"])
 
         if search_text:
-            mask = (
-                tasks_display["task_name"].str.lower().str.contains(search_text, na=False) |
-                tasks_display["Employee"].str.lower().str.contains(search_text, na=False) |
-                tasks_display["remarks"].str.lower().str.contains(search_text, na=False)
-            )
-            tasks_display = tasks_display[mask]
+            hits = db.search("tasks", search_text, limit=None)
+            tasks_display = tasks_display[tasks_display["task_id"].isin(hits["task_id"])]
 
         if filter_status != "All":
             tasks_display = tasks_display[tasks_display["status"] == filter_status]
@@ -105,7 +109,7 @@ def show():
             tasks_display = tasks_display[tasks_display["priority"] == filter_priority]
 
     st.dataframe(
-        tasks_display[["task_id","task_name","Employee","assigned_by","due_date","priority","status","remarks"]],
+        tasks_display.reindex(columns=["task_id","task_name","Employee","assigned_by","due_date","priority","status","remarks"]),
         height=300
     )
 
@@ -51,8 +51,7 @@ st.subheader("Mood History")
 try:
     mood_df = db.fetch_mood_logs()
     if not mood_df.empty and not employees_df.empty:
-        emp_map = employees_df.set_index("Emp_ID")["Name"].to_dict()
-        mood_df["Employee"] = mood_df["emp_id"].map(emp_map).fillna(mood_df["emp_id"].astype(str))
+        mood_df["Employee"] = db.names_for(mood_df["emp_id"])
         mood_df["log_date_parsed"] = pd.to_datetime(mood_df["log_date"], errors="coerce")
         st.dataframe(
             mood_df[["Employee", "mood", "remarks", "log_date_parsed"]]
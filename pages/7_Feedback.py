@@ -3,8 +3,9 @@ import streamlit as st
 import pandas as pd
 import datetime
 
-from utils.auth import require_login, show_role_badge, logout_user
+from utils.auth import require_login, show_role_badge, logout_user, current_emp_id
 from utils import database as db
+from utils import feedback_analytics as fa
 
 def show():
     require_login()
@@ -18,14 +19,25 @@ def show():
 
     # Load employees and feedback
     try:
-        emp_df = db.fetch_employees()
+        emp_df = db.fetch_employees(columns=["Emp_ID", "Name"])
     except Exception as e:
         st.error("Failed to load employees.")
         st.exception(e)
         emp_df = pd.DataFrame()
 
+    # employees only see feedback they received or gave: read it from their profile
+    my_emp_id = current_emp_id() if role == "Employee" else None
+    if role == "Employee" and my_emp_id is None:
+        st.info("No employee record is linked to your login, so no feedback is shown.")
     try:
-        feedback_df = db.fetch_feedback()
+        if role != "Employee":
+            feedback_df = db.fetch_feedback()
+        elif my_emp_id is not None:
+            profile = db.employee_profile(my_emp_id, feedback=None)
+            feedback_df = pd.concat([profile["feedback_received"], profile["feedback_given"]])[db.TABLE_COLUMNS["feedback"]]
+            feedback_df = feedback_df.drop_duplicates("feedback_id").sort_values("feedback_id").reset_index(drop=True)
+        else:
+            feedback_df = pd.DataFrame(columns=db.TABLE_COLUMNS["feedback"])
     except Exception as e:
         st.error("Failed to load feedback.")
         st.exception(e)
@@ -46,8 +58,8 @@ def show():
                 st.error("Please select a receiver and write a message.")
             else:
                 receiver_id = int(receiver.split(" - ")[0])
-                sender_user = db.get_user_by_username(username)
-                sender_id = sender_user["id"] if sender_user else None
+                # sender_id / receiver_id are both Emp_IDs (profiles and analytics join on them)
+                sender_id = current_emp_id()
                 try:
                     db.add_feedback(sender_id, receiver_id, message.strip(), rating)
                     st.success("Feedback submitted successfully.")
@@ -66,20 +78,15 @@ def show():
     feedback_display = feedback_df.copy()
 
     if not feedback_display.empty and emp_df.shape[0] > 0:
-        emp_map = emp_df.set_index("Emp_ID")["Name"].to_dict()
-        feedback_display["Sender"] = feedback_display["sender_id"].map(emp_map).fillna(feedback_display["sender_id"].astype(str))
-        feedback_display["Receiver"] = feedback_display["receiver_id"].map(emp_map).fillna(feedback_display["receiver_id"].astype(str))
+        feedback_display["Sender"] = db.names_for(feedback_display["sender_id"])
+        feedback_display["Receiver"] = db.names_for(feedback_display["receiver_id"])
 
         if search_text:
-            mask = (
-                feedback_display["message"].str.lower().str.contains(search_text, na=False) |
-                feedback_display["Sender"].str.lower().str.contains(search_text, na=False) |
-                feedback_display["Receiver"].str.lower().str.contains(search_text, na=False)
-            )
-            feedback_display = feedback_display[mask]
+            hits = db.search("feedback", search_text, limit=None)
+            feedback_display = feedback_display[feedback_display["feedback_id"].isin(hits["feedback_id"])]
 
     st.dataframe(
-        feedback_display[["feedback_id","Sender","Receiver","message","rating","log_date"]],
+        feedback_display.reindex(columns=["feedback_id","Sender","Receiver","message","rating","log_date"]),
         height=300
     )
 
@@ -127,9 +134,27 @@ def show():
     # Feedback Analytics
     # -----------------------
     st.subheader("📊 Feedback Analytics")
-    if not feedback_df.empty:
-        rating_counts = feedback_df["rating"].value_counts().sort_index()
+    if role == "Employee":
+        st.info("Organization-wide feedback analytics are available to managers, HR and admins.")
+    elif not feedback_df.empty:
+        rating_counts = fa.rating_distribution()
         st.bar_chart(rating_counts)
+
+        st.markdown("**Weekly trend**")
+        weekly = fa.weekly_trend()
+        if not weekly.empty:
+            st.line_chart(weekly.set_index("week")[["feedback", "avg_rating"]])
+
+        col1, col2 = st.columns(2)
+        top = fa.top_rated(n=10, min_ratings=3)
+        top.insert(0, "Employee", db.names_for(top["receiver_id"]))
+        col1.markdown("**Top-rated employees** (3+ ratings)")
+        col1.dataframe(top[["Employee", "rated", "avg_rating", "recent_avg"]], height=300)
+
+        givers = fa.frequent_givers(n=10)
+        givers.insert(0, "Sender", db.names_for(givers["sender_id"]))
+        col2.markdown("**Frequent feedback givers**")
+        col2.dataframe(givers[["Sender", "feedback", "avg_rating"]], height=300)
     else:
         st.info("No feedback available yet.")
 
@@ -139,8 +164,7 @@ def show():
     st.markdown("🔮 **Upcoming Features / To-Do**")
     st.markdown("""
     - Allow anonymous feedback option.
-    - Add monthly/weekly trend analysis.
-    - Dashboard-style charts: Top-rated employees, frequent feedback givers.
+    - Add monthly trend analysis.
     - Export feedback reports as PDF/CSV.
     - Integrate feedback with performance reviews & task completion.
     - Enable notifications when new feedback is received.
@@ -1,9 +1,9 @@
 import streamlit as st
-import pandas as pd
 import plotly.express as px
 
 from utils.auth import require_login, show_role_badge, logout_user
 from utils import database as db
+from utils.mood_analytics import mood_series, mood_summary
 
 
 def show():
@@ -13,58 +13,69 @@ def show():
 
     st.title("📊 Mood Analytics Dashboard")
 
-    # Load mood data
+    # Precomputed series from the mood engine (only new logs are read on each rerun)
     try:
-        mood_df = db.fetch_mood()
+        org_df = mood_series("org")
     except Exception as e:
         st.error("Failed to load mood data.")
         st.exception(e)
         return
 
-    if mood_df.empty:
+    if org_df.empty:
         st.info("No mood entries available to analyze.")
         return
 
-    # Convert date column
-    mood_df["date"] = pd.to_datetime(mood_df["date"], errors="coerce")
-
     st.markdown("### 📅 Mood Trend Over Time")
     trend_fig = px.line(
-        mood_df,
+        org_df,
         x="date",
-        y="mood",
-        markers=True,
-        title="Mood Trend Over Time",
+        y=["score", "rolling_7", "rolling_30"],
+        title="Mood Trend Over Time (daily score, 7 / 30-day rolling means)",
     )
     st.plotly_chart(trend_fig, use_container_width=True)
 
+    st.markdown("### 🏢 Weekly Mood by Department")
+    dept_fig = px.line(
+        mood_series("department", freq="W"),
+        x="date",
+        y="rolling_30",
+        color="Department",
+        title="30-day Rolling Mood by Department",
+    )
+    st.plotly_chart(dept_fig, use_container_width=True)
+
     st.markdown("### 📊 Mood Distribution")
-    dist_fig = px.histogram(
-        mood_df,
+    dist_df = db.aggregate("mood_logs", {"entries": ("count", None)}, group_by="mood")
+    dist_fig = px.bar(
+        dist_df,
         x="mood",
-        nbins=10,
+        y="entries",
         title="Mood Distribution",
     )
     st.plotly_chart(dist_fig, use_container_width=True)
 
     st.markdown("### 🧍 Employee-wise Mood Comparison")
-    box_fig = px.box(
-        mood_df,
+    emp_df = mood_summary("employee")
+    emp_df["username"] = db.names_for(emp_df["emp_id"])
+    box_fig = px.bar(
+        emp_df.sort_values("avg_score"),
         x="username",
-        y="mood",
-        title="Mood Comparison by Employee",
+        y=["avg_score", "avg_30d"],
+        barmode="group",
+        title="Average Mood by Employee (all time / last 30 days)",
     )
     st.plotly_chart(box_fig, use_container_width=True)
 
     st.markdown("---")
 
     st.markdown("### 🔍 Filter Mood Data")
-    users = sorted(mood_df["username"].unique().tolist())
+    users = sorted(emp_df["username"].unique().tolist())
     selected_user = st.selectbox("Select Employee", ["All"] + users)
 
     if selected_user != "All":
-        filtered_df = mood_df[mood_df["username"] == selected_user]
+        emp_id = emp_df.loc[emp_df["username"] == selected_user, "emp_id"].iloc[0]
+        filtered_df = db.fetch_mood(emp_id=emp_id, newest_first=True)
     else:
-        filtered_df = mood_df.copy()
+        filtered_df = db.fetch_mood(limit=1000, newest_first=True)
 
     st.dataframe(filtered_df.reset_index(drop=True), height=300)
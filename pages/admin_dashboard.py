@@ -4,12 +4,12 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import datetime
-import io
 
 from utils.auth import require_login
 from utils import database as db
-from utils.analytics import get_summary, department_distribution, gender_ratio, average_salary_by_dept, employee_options
-from utils.pdf_export import generate_summary_pdf
+from utils.analytics import get_summary_db, department_distribution_db, gender_ratio_db, average_salary_by_dept_db, employee_options
+from utils.analytics import task_sla, task_sla_summary, salary_quantiles_db
+from utils import report_jobs, charts
 
 sns.set_style("whitegrid")
 
@@ -35,18 +35,15 @@ def show():
     search_term = st.text_input("Search employees by Name, ID, Role or Skills").strip()
     display_df = df.copy()
     if search_term:
-        cond = pd.Series(False, index=display_df.index)
-        for col in ["Name","Emp_ID","Role","Skills"]:
-            if col in display_df.columns:
-                cond |= display_df[col].astype(str).str.contains(search_term, case=False, na=False)
-        display_df = display_df[cond]
+        hits = db.search("employees", search_term, limit=None)
+        display_df = display_df[display_df["Emp_ID"].isin(hits["Emp_ID"])]
 
     cols_to_show = [c for c in ["Emp_ID","Name","Department","Role","Join_Date","Status"] if c in display_df.columns]
     st.dataframe(display_df[cols_to_show], height=300)
 
     # Metrics
     st.header("📊 Workforce Summary Metrics")
-    summary = get_summary(display_df)
+    summary = get_summary_db(search=search_term)
     col1, col2, col3 = st.columns(3)
     col1.metric("Total Employees", summary["total"])
     col2.metric("Active Employees", summary["active"])
@@ -141,13 +138,12 @@ def show():
     except Exception:
         tasks_df = pd.DataFrame()
     if not tasks_df.empty:
-        tasks_df["due_date_parsed"] = pd.to_datetime(tasks_df["due_date"], errors="coerce").dt.date
-        today = pd.Timestamp.today().date()
-        tasks_df["overdue"] = tasks_df["due_date_parsed"].apply(lambda d: d<today if pd.notna(d) else False)
-        emp_map = df.set_index("Emp_ID")["Name"].to_dict()
-        tasks_df["Employee"] = tasks_df["emp_id"].map(emp_map).fillna(tasks_df["emp_id"].astype(str))
-        display_cols = ["task_id","task_name","Employee","assigned_by","due_date","status","overdue"]
+        tasks_df = task_sla(tasks_df)
+        tasks_df["Employee"] = db.names_for(tasks_df["emp_id"])
+        display_cols = ["task_id","task_name","Employee","assigned_by","due_date","status","overdue","days_overdue"]
         st.dataframe(tasks_df[display_cols], height=250)
+        st.subheader("SLA by Manager")
+        st.dataframe(task_sla_summary(tasks_df, by="assigned_by"), height=200)
     else:
         st.info("No tasks found.")
 
@@ -174,15 +170,9 @@ def show():
     dept_fig = None
     if not display_df.empty and "Department" in display_df.columns:
         try:
-            dept_ser = department_distribution(display_df)
-            fig1, ax1 = plt.subplots(figsize=(8,4))
-            dept_fig = fig1
-            sns.barplot(x=dept_ser.index, y=dept_ser.values, ax=ax1, palette="pastel")
-            ax1.set_xlabel("Department")
-            ax1.set_ylabel("Count")
-            ax1.set_title("Department Distribution")
-            plt.xticks(rotation=45)
-            st.pyplot(fig1, use_container_width=True)
+            dept_ser = department_distribution_db(search=search_term)
+            dept_fig = charts.bar_chart(dept_ser, "Department Distribution", "Department", "Count", figsize=(8,4))
+            st.image(dept_fig, use_container_width=True)
         except Exception:
             st.info("Unable to render Department chart.")
     else:
@@ -192,13 +182,9 @@ def show():
     gender_fig = None
     if not display_df.empty and "Gender" in display_df.columns:
         try:
-            gender_ser = gender_ratio(display_df)
-            fig2, ax2 = plt.subplots(figsize=(5,5))
-            gender_fig = fig2
-            ax2.pie(gender_ser.values, labels=gender_ser.index, autopct="%1.1f%%", startangle=90)
-            ax2.axis("equal")
-            ax2.set_title("Gender Ratio")
-            st.pyplot(fig2, use_container_width=True)
+            gender_ser = gender_ratio_db(search=search_term)
+            gender_fig = charts.pie_chart(gender_ser, "Gender Ratio", figsize=(5,5), palette=None)
+            st.image(gender_fig, use_container_width=True)
         except Exception:
             st.info("Unable to render Gender chart.")
     else:
@@ -208,34 +194,46 @@ def show():
     salary_fig = None
     if not display_df.empty and "Salary" in display_df.columns and "Department" in display_df.columns:
         try:
-            avg_salary = average_salary_by_dept(display_df)
-            fig3, ax3 = plt.subplots(figsize=(8,4))
-            salary_fig = fig3
-            sns.barplot(x=avg_salary.index, y=avg_salary.values, ax=ax3, palette="pastel")
-            ax3.set_xlabel("Department")
-            ax3.set_ylabel("Average Salary")
-            ax3.set_title("Average Salary by Department")
-            plt.xticks(rotation=45)
-            st.pyplot(fig3, use_container_width=True)
+            avg_salary = average_salary_by_dept_db(search=search_term)
+            salary_fig = charts.bar_chart(avg_salary, "Average Salary by Department", "Department", "Average Salary",
+                                          figsize=(8,4))
+            st.image(salary_fig, use_container_width=True)
         except Exception:
             st.info("Unable to render Salary chart.")
+        bands = salary_quantiles_db("Department", search=search_term)
+        if not bands.empty:
+            st.subheader("Salary Bands by Department")
+            st.dataframe(bands.round(0), height=250)
     else:
         st.info("No Salary data available.")
 
     st.markdown("---")
-    # PDF export (uses current display_df)
+    # PDF export (same search as the records above, read by the worker)
     st.header("5️⃣ Export PDF Report")
     if st.button("Generate & Download PDF"):
         try:
-            buf = io.BytesIO()
             # pass the same figures used above; if None, pdf_export will skip
-            generate_summary_pdf(buf, summary["total"], summary["active"], summary["resigned"],
-                                 display_df, mood_df=db.fetch_mood_logs(),
-                                 gender_fig=gender_fig, salary_fig=salary_fig, dept_fig=dept_fig)
-            st.download_button("📥 Download Report (PDF)", buf, file_name="workforce_summary.pdf", mime="application/pdf")
+            st.session_state["admin_pdf_job"] = report_jobs.submit_summary_pdf(
+                summary["total"], summary["active"], summary["resigned"],
+                report_jobs.rows("employees", search=search_term), mood_df=report_jobs.rows("mood_logs"),
+                gender_fig=gender_fig, salary_fig=salary_fig, dept_fig=dept_fig)
         except Exception as e:
             st.error("Failed to generate PDF.")
             st.exception(e)
+    report_jobs.show_job("admin_pdf_job", "workforce_summary.pdf")
+
+    # Year-end pack: one personal summary PDF per employee, zipped
+    st.subheader("📦 Personal Summaries (ZIP)")
+    pack_status = st.selectbox("Employees", ["Active", "All"], key="pack_status")
+    pack_dept = st.selectbox("Department", ["All"] + db.fetch_distinct("Department"), key="pack_dept")
+    if st.button("Generate Personal Summaries"):
+        try:
+            pack_where = {"Status": None if pack_status == "All" else pack_status, "Department": pack_dept}
+            st.session_state["admin_pack_job"] = report_jobs.submit_employee_pack(pack_where)
+        except Exception as e:
+            st.error("Failed to start the export.")
+            st.exception(e)
+    report_jobs.show_job("admin_pack_job", "personal_summaries.zip", "📥 Download Summaries (ZIP)")
     # close figures to free memory
     try:
         plt.close('all')
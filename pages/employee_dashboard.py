@@ -2,9 +2,10 @@
 import streamlit as st
 import pandas as pd
 import matplotlib.pyplot as plt
-import io
-from utils.auth import require_login
+from utils.auth import require_login, current_emp_id
 from utils import database as db
+from utils.analytics import task_sla
+from utils import report_jobs
 
 def show():
     require_login()
@@ -15,40 +16,39 @@ def show():
     username = st.session_state.get("user", "Employee")
     st.title("👤 Employee Dashboard")
 
-    # Load employees
-    try:
-        df = db.fetch_employees()
-    except:
-        df = pd.DataFrame(columns=["Emp_ID","Name","Age","Gender","Department","Role","Skills",
-                                   "Join_Date","Resign_Date","Status","Salary","Location"])
-
     # determine emp_id
-    emp_id = st.session_state.get("my_emp_id")
+    emp_id = current_emp_id()
     if emp_id is None:
-        emp_opts = df["Emp_ID"].astype(str) + " - " + df["Name"]
-        emp_sel = st.selectbox("Select yourself", emp_opts)
-        emp_id = int(emp_sel.split(" - ")[0])
-        st.session_state["my_emp_id"] = emp_id
+        st.info("No employee record is linked to your login. Ask HR to add one under your username.")
+        st.stop()
 
-    my_data = df[df["Emp_ID"]==emp_id]
+    # Everything for this employee in one indexed, cached read
+    try:
+        profile = db.employee_profile(emp_id)
+    except Exception:
+        profile = None
+    my_data, my_moods = report_jobs.personal_frames(profile)
     st.subheader("1️⃣ Your Info")
     if not my_data.empty:
         st.table(my_data)
+        stats = profile["stats"]
+        c1, c2, c3 = st.columns(3)
+        c1.metric("Feedback received", stats["feedback_received"])
+        c2.metric("Avg rating", f"{stats['avg_rating_received']:.1f}" if stats["avg_rating_received"] is not None else "-")
+        c3.metric("Mood (30 days)", f"{stats['avg_mood_30d']:.1f}" if stats["avg_mood_30d"] is not None else "-")
     else:
         st.info("Your profile not found in employee table.")
 
     # Tasks
     st.header("2️⃣ Your Tasks")
-    try:
-        tasks_df = db.fetch_tasks()
-    except:
-        tasks_df = pd.DataFrame()
-    my_tasks = tasks_df[tasks_df["emp_id"]==emp_id] if not tasks_df.empty else pd.DataFrame()
+    my_tasks = profile["tasks"] if profile else pd.DataFrame()
     if not my_tasks.empty:
-        my_tasks["due_date_parsed"] = pd.to_datetime(my_tasks["due_date"], errors="coerce").dt.date
-        today = pd.Timestamp.today().date()
-        my_tasks["overdue"] = my_tasks["due_date_parsed"].apply(lambda d: d<today if pd.notna(d) else False)
-        st.dataframe(my_tasks[["task_id","task_name","assigned_by","due_date","status","overdue"]], height=300)
+        my_tasks = task_sla(my_tasks)
+        c1, c2, c3 = st.columns(3)
+        c1.metric("Open", int((my_tasks["due_bucket"] != "Completed").sum()))
+        c2.metric("Overdue", int(my_tasks["overdue"].sum()))
+        c3.metric("Due this week", int(my_tasks["due_bucket"].isin(["Due today", "Due this week"]).sum()))
+        st.dataframe(my_tasks[["task_id","task_name","assigned_by","due_date","status","overdue","days_overdue"]], height=300)
     else:
         st.info("No tasks assigned.")
 
@@ -65,32 +65,30 @@ def show():
 
     # Mood history
     st.header("4️⃣ Mood History & Analytics")
-    try:
-        mood_df = db.fetch_mood_logs()
-    except:
-        mood_df = pd.DataFrame()
-    my_moods = mood_df[mood_df["emp_id"]==emp_id] if not mood_df.empty else pd.DataFrame()
     if not my_moods.empty:
-        st.dataframe(my_moods[["mood","log_date"]].sort_values(by="log_date", ascending=False), height=300)
+        st.dataframe(my_moods[["mood","log_date"]], height=300)
     else:
         st.info("No mood logs available.")
 
+    if profile is not None and not profile["feedback_received"].empty:
+        st.subheader("Recent Feedback")
+        st.dataframe(profile["feedback_received"][["Sender","message","rating","log_date"]], height=200)
+
     # small export personal PDF
     st.markdown("---")
     st.header("5️⃣ Export My Summary PDF")
     if st.button("Download My PDF"):
         try:
-            buf = io.BytesIO()
             # personal df and personal mood logs
             generate_df = my_data
             generate_mood = my_moods
-            from utils.pdf_export import generate_summary_pdf
-            generate_summary_pdf(buf, len(generate_df), int(generate_df["Status"].eq("Active").sum()) if not generate_df.empty else 0, int(generate_df["Status"].eq("Resigned").sum()) if not generate_df.empty else 0,
-                                 generate_df, mood_df=generate_mood, dept_fig=None, gender_fig=None, salary_fig=None, title=f"{username} - Employee Summary")
-            st.download_button("📥 Download My Summary (PDF)", buf, file_name=f"{username}_summary.pdf", mime="application/pdf")
+            st.session_state["my_pdf_job"] = report_jobs.submit_summary_pdf(
+                len(generate_df), int(generate_df["Status"].eq("Active").sum()) if not generate_df.empty else 0, int(generate_df["Status"].eq("Resigned").sum()) if not generate_df.empty else 0,
+                generate_df, mood_df=generate_mood, dept_fig=None, gender_fig=None, salary_fig=None, title=f"{username} - Employee Summary")
         except Exception as e:
             st.error("Failed to generate PDF.")
             st.exception(e)
+    report_jobs.show_job("my_pdf_job", f"{username}_summary.pdf", "📥 Download My Summary (PDF)")
 
     try:
         plt.close('all')
@@ -7,7 +7,8 @@ import io
 
 from utils.auth import require_login
 from utils import database as db
-from utils.analytics import get_summary, department_distribution, gender_ratio, average_salary_by_dept, employee_options
+from utils.analytics import employee_options, task_sla, task_sla_summary
+from utils.mood_analytics import mood_summary
 
 def show():
     require_login()
@@ -18,20 +19,24 @@ def show():
     username = st.session_state.get("user", "Manager")
     st.title("📊 Manager Dashboard")
 
-    # Load employees
+    # Load employees (id/name only; used for name lookups)
     try:
-        df = db.fetch_employees()
+        df = db.fetch_employees(columns=["Emp_ID","Name"])
     except:
-        df = pd.DataFrame(columns=["Emp_ID","Name","Age","Gender","Department","Role","Skills",
-                                   "Join_Date","Resign_Date","Status","Salary","Location"])
+        df = pd.DataFrame(columns=["Emp_ID","Name"])
 
-    # manager may filter by department
+    # manager may filter by department (filter runs in SQLite)
     st.header("1️⃣ Employee Records")
-    depts = ["All"] + sorted(df["Department"].dropna().unique().tolist()) if not df.empty else ["All"]
+    try:
+        depts = ["All"] + db.fetch_distinct("Department")
+    except:
+        depts = ["All"]
     dept_filter = st.selectbox("Filter Department", depts)
-    filtered_df = df.copy()
-    if dept_filter != "All":
-        filtered_df = df[filtered_df["Department"]==dept_filter]
+    try:
+        filtered_df = db.fetch_employees(columns=["Emp_ID","Name","Department","Role","Status"],
+                                         where={"Department": dept_filter})
+    except:
+        filtered_df = pd.DataFrame(columns=["Emp_ID","Name","Department","Role","Status"])
 
     st.dataframe(filtered_df[["Emp_ID","Name","Department","Role","Status"]], height=250)
 
@@ -68,17 +73,17 @@ def show():
     # View tasks by manager
     st.subheader("Tasks Overview")
     try:
-        tasks_df = db.fetch_tasks()
+        tasks_df = db.fetch_tasks(where={"assigned_by": username})
     except:
         tasks_df = pd.DataFrame()
     if not tasks_df.empty:
-        tasks_df = tasks_df[tasks_df["assigned_by"]==username]
-        tasks_df["due_date_parsed"] = pd.to_datetime(tasks_df["due_date"], errors="coerce").dt.date
-        today = pd.Timestamp.today().date()
-        tasks_df["overdue"] = tasks_df["due_date_parsed"].apply(lambda d: d<today if pd.notna(d) else False)
-        emp_map = df.set_index("Emp_ID")["Name"].to_dict()
-        tasks_df["Employee"] = tasks_df["emp_id"].map(emp_map).fillna(tasks_df["emp_id"].astype(str))
-        st.dataframe(tasks_df[["task_id","task_name","Employee","due_date","status","overdue"]], height=300)
+        tasks_df = task_sla(tasks_df)
+        tasks_df["Employee"] = db.names_for(tasks_df["emp_id"])
+        st.dataframe(tasks_df[["task_id","task_name","Employee","due_date","status","overdue","days_overdue"]], height=300)
+        sla = task_sla_summary(tasks_df, by="emp_id")
+        sla.insert(0, "Employee", db.names_for(sla["emp_id"]))
+        st.subheader("SLA by Assignee")
+        st.dataframe(sla.drop(columns="emp_id"), height=200)
     else:
         st.info("No tasks found.")
 
@@ -107,20 +112,20 @@ def show():
                 st.error("Failed to log mood.")
                 st.exception(e)
 
-    # Mood history & average
+    # Mood history (latest entries for the selected department) & average
     try:
-        mood_df = db.fetch_mood_logs()
+        mood_df = db.fetch_mood(department=dept_filter, limit=500, newest_first=True)
     except:
         mood_df = pd.DataFrame()
 
     if not mood_df.empty:
-        mood_merged = pd.merge(mood_df, filtered_df[["Emp_ID","Name"]], left_on="emp_id", right_on="Emp_ID", how="left")
-        mood_display = mood_merged[["Name","mood","log_date"]].sort_values(by="log_date", ascending=False)
+        mood_display = mood_df[["username","mood_label","date"]].rename(
+            columns={"username": "Name", "mood_label": "mood", "date": "log_date"})
         st.dataframe(mood_display, height=300)
 
-        mood_map = {"😊 Happy":5,"😐 Neutral":3,"😔 Sad":2,"😡 Angry":1}
-        mood_merged["score"] = mood_merged["mood"].map(mood_map)
-        avg_mood = mood_merged.groupby("Name")["score"].mean().sort_values()
+        # per-employee averages come precomputed from the mood engine
+        avg = mood_summary("employee", keys=filtered_df["Emp_ID"].tolist())
+        avg_mood = avg.set_index(db.names_for(avg["emp_id"]))["avg_score"].sort_values()
         if not avg_mood.empty:
             st.subheader("Average Mood per Employee")
             fig2, ax2 = plt.subplots(figsize=(6,3))
@@ -51,7 +51,7 @@ except Exception as e:
 # 3️⃣ Check database and tables
 # -------------------------
 DB_PATH = "data/workforce.db"
-required_tables = ["employees", "moods", "tasks", "users"]
+required_tables = ["employees", "mood_logs", "tasks", "feedback", "users", "schema_migrations"]
 
 print("\nChecking database and tables...")
 if not os.path.exists(DB_PATH):
@@ -67,6 +67,11 @@ else:
                 print(f"❌ Missing table: {table}")
             else:
                 print(f"✅ Found table: {table}")
+        if "schema_migrations" in tables:
+            version = cursor.execute("SELECT COALESCE(MAX(version), 0) FROM schema_migrations").fetchone()[0]
+            print(f"✅ Schema version: {version}")
+        else:
+            print("⚠️ No schema version recorded. Run: python -m utils.migrations")
         conn.close()
     except Exception as e:
         print(f"❌ Error accessing database: {e}")
@@ -1,39 +1,16 @@
-import sqlite3
+from utils.db_pool import transaction, close_all
+from utils import migrations
 
 DB_PATH = "data/workforce.db"
 
-conn = sqlite3.connect(DB_PATH)
-cursor = conn.cursor()
+# Make sure the schema is current (tasks, mood_logs, indexes)
+migrations.migrate(DB_PATH)
 
-# Drop existing tables (reset)
-cursor.execute("DROP TABLE IF EXISTS tasks")
-cursor.execute("DROP TABLE IF EXISTS mood")
+# Reset: clear rows and id counters, keep the migrated schema
+with transaction(DB_PATH) as conn:
+    conn.execute("DELETE FROM tasks")
+    conn.execute("DELETE FROM mood_logs")
+    conn.execute("DELETE FROM sqlite_sequence WHERE name IN ('tasks', 'mood_logs')")
 
-# Recreate tasks table
-cursor.execute("""
-CREATE TABLE tasks (
-    task_id INTEGER PRIMARY KEY AUTOINCREMENT,
-    task_name TEXT NOT NULL,
-    emp_id INTEGER NOT NULL,
-    assigned_by TEXT,
-    due_date TEXT,
-    remarks TEXT,
-    status TEXT DEFAULT 'Pending',
-    created_date TEXT DEFAULT (date('now'))
-)
-""")
-
-# Recreate mood table
-cursor.execute("""
-CREATE TABLE mood (
-    mood_id INTEGER PRIMARY KEY AUTOINCREMENT,
-    emp_id INTEGER NOT NULL,
-    mood TEXT NOT NULL,
-    remarks TEXT,
-    log_date TEXT DEFAULT (date('now'))
-)
-""")
-
-conn.commit()
-conn.close()
+close_all()
 print("Tasks and Mood tables reset successfully!")
@@ -0,0 +1,64 @@
+# tests/conftest.py
+"""
+Shared fixtures: every test gets its own migrated SQLite file (never data/workforce.db).
+Run from the project root:  python -m pytest -q
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import database as db  # noqa: E402  (imported first: utils.auth imports it back)
+from utils import db_pool  # noqa: E402
+
+EMPLOYEES = [
+    {"Emp_ID": 1, "Name": "Asha", "Gender": "Female", "Department": "IT", "Role": "Developer",
+     "Skills": "Python; SQL", "Join_Date": "2020-01-15", "Status": "Active", "Salary": 85000, "Location": "Pune"},
+    {"Emp_ID": 2, "Name": "Ravi", "Gender": "Male", "Department": "IT", "Role": "Tester",
+     "Skills": "Selenium", "Join_Date": "2021-03-01", "Status": "Active", "Salary": 52000, "Location": "Delhi"},
+    {"Emp_ID": 3, "Name": "Meera", "Gender": "Female", "Department": "HR", "Role": "Recruiter",
+     "Skills": "Hiring", "Join_Date": "2019-07-10", "Resign_Date": "2023-02-28", "Status": "Resigned",
+     "Salary": 61000, "Location": "Pune"},
+    {"Emp_ID": 4, "Name": "John", "Gender": "Male", "Department": "Finance", "Role": "Analyst",
+     "Skills": "Excel, SQL", "Join_Date": "2022-11-05", "Status": "Active", "Salary": 73000, "Location": "Mumbai"},
+    {"Emp_ID": 5, "Name": "Sara", "Gender": "Female", "Department": "Finance", "Role": "Analyst",
+     "Skills": "Excel", "Join_Date": "2018-05-20", "Resign_Date": "2021-09-30", "Status": "Resigned",
+     "Salary": None, "Location": "Delhi"},
+    {"Emp_ID": 6, "Name": "Vik", "Gender": "Male", "Department": None, "Role": "Intern",
+     "Skills": "", "Join_Date": "2024-06-01", "Status": "Active", "Salary": 18000, "Location": None},
+]
+
+
+def _reset():
+    db_pool.close_all()
+    db.clear_cache()
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    """Path of a fresh, fully migrated database used as the default for every query"""
+    path = str(tmp_path / "workforce.db")
+    monkeypatch.setattr(db_pool, "DB_PATH", path)
+    _reset()
+    db.create_tables()
+    yield path
+    _reset()
+
+
+@pytest.fixture
+def employees(db_path):
+    """db_path with the EMPLOYEES sample rows"""
+    db.add_employees(EMPLOYEES)
+    return db_path
+
+
+@pytest.fixture(autouse=True)
+def _keep_main_module(monkeypatch):
+    """
+    AppTest leaves its script installed as sys.modules["__main__"]; spawned report
+    workers would re-run that script (against the default database) on start-up.
+    """
+    monkeypatch.setitem(sys.modules, "__main__", sys.modules["__main__"])
@@ -0,0 +1,27 @@
+# tests/test_bulk_insert.py
+import pandas as pd
+
+from utils import database as db
+from utils import db_pool
+
+
+def test_records_with_different_keys_keep_every_value(db_path):
+    db.add_tasks([
+        {"task_name": "a", "emp_id": 1, "assigned_by": "x"},
+        {"task_name": "b", "emp_id": 2, "assigned_by": "x", "remarks": "kept", "priority": "High"},
+        {"task_name": "c", "emp_id": 3, "assigned_by": "x"},
+    ], batch_size=2)
+    rows = db_pool.get_connection().execute(
+        "SELECT task_id, task_name, remarks, priority, status FROM tasks ORDER BY task_id").fetchall()
+    assert rows == [(1, "a", None, "Low", "Pending"), (2, "b", "kept", "High", "Pending"),
+                    (3, "c", None, "Low", "Pending")]
+
+
+def test_frames_and_generators_in_batches(db_path):
+    frame = pd.DataFrame({"emp_id": [1, 2, 3], "mood": ["Happy", None, "Sad"]})
+    assert db.add_mood_entries(frame, batch_size=2) == 3
+    assert db.add_mood_entries(({"emp_id": i, "mood": "Neutral"} for i in range(5)), batch_size=2) == 5
+    assert db.add_mood_entries([]) == 0
+    moods = db_pool.get_connection().execute("SELECT mood, remarks FROM mood_logs ORDER BY mood_id").fetchall()
+    assert [m for m, _ in moods] == ["Happy", None, "Sad"] + ["Neutral"] * 5
+    assert {r for _, r in moods} == {""}
@@ -0,0 +1,62 @@
+# tests/test_charts.py
+import pandas as pd
+import pytest
+
+from utils import charts
+from utils.charts import ChartCache
+
+COUNTS = pd.Series({"IT": 3, "HR": 1, "Finance": 2}, name="headcount")
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    fresh = ChartCache()
+    monkeypatch.setattr(charts, "_cache", fresh)
+    return fresh
+
+
+def test_same_chart_is_drawn_once(cache):
+    first = charts.bar_chart(COUNTS, "By department")
+    assert first[:8] == b"\x89PNG\r\n\x1a\n"
+    assert charts.bar_chart(COUNTS.copy(), "By department") is first
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_spec_and_data_change_the_key(cache):
+    charts.bar_chart(COUNTS, "By department")
+    charts.bar_chart(COUNTS, "Other title")
+    charts.bar_chart(COUNTS.replace(1, 4), "By department")
+    charts.pie_chart(COUNTS, "By department")
+    assert cache.stats()["charts"] == 4 and cache.stats()["hits"] == 0
+
+
+def test_svg_and_bad_formats(cache):
+    assert b"<svg" in charts.pie_chart(COUNTS, "Share", format="svg")[:500]
+    with pytest.raises(ValueError):
+        charts.pie_chart(COUNTS, "Share", format="gif")
+
+
+def test_band_chart_uses_only_the_quantile_columns(cache):
+    bands = pd.DataFrame({"p10": [10, 20], "p25": [20, 30], "p50": [30, 40], "p75": [40, 50], "p90": [50, 60],
+                          "count": [5, 6]}, index=["IT", "HR"])
+    first = charts.band_chart(bands, "Salary bands")
+    assert charts.band_chart(bands.assign(count=[7, 8]), "Salary bands") is first
+
+
+def test_bytes_bound_evicts_oldest():
+    cache = ChartCache(max_bytes=25)
+    for key in "abc":
+        cache.get_or_render(key, lambda: b"x" * 10)
+    assert cache.stats()["charts"] == 2 and cache.stats()["bytes"] == 20
+    assert cache.get_or_render("a", lambda: b"new") == b"new"
+    huge = ChartCache(max_bytes=5)
+    assert huge.get_or_render("big", lambda: b"x" * 10) == b"x" * 10  # the newest is always kept
+    assert huge.stats()["charts"] == 1
+
+
+def test_no_pyplot_figures_left_open(cache):
+    import matplotlib.pyplot as plt
+    before = plt.get_fignums()
+    charts.bar_chart(COUNTS, "No leak")
+    charts.pie_chart(COUNTS, "No leak")
+    assert plt.get_fignums() == before
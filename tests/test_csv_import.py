@@ -0,0 +1,82 @@
+# tests/test_csv_import.py
+import io
+
+import pytest
+
+from utils import database as db
+from utils import db_pool
+from utils.csv_import import import_employees_csv
+
+HEADER = "Emp_ID,Name,Department,Skills,Join_Date,Salary\n"
+
+
+def _import(body, **kwargs):
+    return import_employees_csv(io.BytesIO((HEADER + body).encode()), **kwargs)
+
+
+def _reasons(result):
+    return result["rejects"][["line", "reason"]].values.tolist()
+
+
+def test_valid_rows_imported_and_typed(db_path):
+    result = _import("1,Asha,IT,Python; SQL,2020-01-15,85000\n2,Ravi,HR,,15/03/2021,\n")
+    assert (result["read"], result["imported"], result["rejected"]) == (2, 2, 0)
+    rows = db.fetch_employees(compact=False).set_index("Emp_ID")
+    assert rows.loc[2, "Join_Date"] == "2021-03-15"
+    assert rows.loc[1, "Status"] == "Active"
+    assert db.skill_counts()["Skill"].tolist() == ["Python", "SQL"]
+
+
+def test_rejects_keep_line_numbers_and_reasons(employees):
+    result = _import(",,IT,,,\n9,Zed,IT,,not a date,\n10,Yan,IT,,,lots\n1,Dup,IT,,,\n")
+    assert _reasons(result) == [[2, "missing Name"], [3, "bad Join_Date"], [4, "bad Salary"],
+                                [5, "Emp_ID already exists"]]
+    assert result["imported"] == 0
+
+
+def test_rejected_row_does_not_make_a_later_row_a_duplicate(db_path):
+    result = _import("7,Bad,IT,,notadate,\n7,Good,IT,,2024-01-01,\n", chunksize=1)
+    assert _reasons(result) == [[2, "bad Join_Date"]]
+    assert db.fetch_employees(columns=["Emp_ID", "Name"]).values.tolist() == [[7, "Good"]]
+
+
+@pytest.mark.parametrize("chunksize", [1, 10])
+def test_duplicates_within_and_across_chunks(db_path, chunksize):
+    result = _import("5,A,IT,,,\n5,B,IT,,,\n6,C,IT,,,\n", chunksize=chunksize)
+    assert _reasons(result) == [[3, "duplicate Emp_ID"]]
+    assert result["imported"] == 2
+
+
+def test_blank_ids_do_not_collide_with_explicit_ids(employees):
+    # the table tops out at 6: blank ids must not take 7 / 8 from the rows below them
+    result = _import(",New A,IT,Go,,\n,New B,IT,,,\n7,Seven,IT,Rust; Go,,\n8,Eight,HR,,,\n")
+    assert (result["imported"], result["rejected"]) == (4, 0)
+    names = dict(db.fetch_employees(columns=["Emp_ID", "Name"]).values.tolist())
+    assert names[7] == "Seven" and names[8] == "Eight"
+    assert {names[9], names[10]} == {"New A", "New B"}
+
+
+def test_skills_written_once_per_row(db_path):
+    calls = []
+    conn = db_pool.get_connection()
+    conn.set_trace_callback(lambda sql: calls.append(sql) if "INSERT OR IGNORE INTO employee_skills" in sql else None)
+    try:
+        _import("50,A,IT,Python,,\n,B,IT,SQL,,\n")
+    finally:
+        conn.set_trace_callback(None)
+    assert len(calls) == 2  # one executemany row per employee with skills
+    assert db_pool.get_connection().execute("SELECT emp_id, skill FROM employee_skills ORDER BY emp_id").fetchall() == [
+        (50, "Python"), (51, "SQL")]
+
+
+def test_add_employees_rejects_duplicate_ids_in_batch(db_path):
+    with pytest.raises(ValueError):
+        db.add_employees([{"Emp_ID": 3, "Name": "A"}, {"Emp_ID": 3, "Name": "B"}])
+    assert db.count_employees() == 0
+
+
+def test_progress_is_rows_over_line_count(db_path):
+    progress = []
+    body = "".join(f"{i},N{i},IT,,,\n" for i in range(1, 11))
+    _import(body, chunksize=4, on_progress=lambda rows, fraction: progress.append((rows, fraction)))
+    assert progress == [(4, 0.4), (8, 0.8), (10, 1.0)]
@@ -0,0 +1,41 @@
+# tests/test_employee_cube.py
+import pytest
+
+from utils import database as db
+from utils.employee_cube import get_cube
+
+
+@pytest.mark.parametrize("where", [
+    {},
+    {"Status": "Active"},
+    {"Department": ["IT", "HR"], "Gender": "Female"},
+    {"Skill": "sql"},
+    {"Location": "Pune", "Status": "All"},
+])
+def test_totals_match_sql_counts(employees, where):
+    cube = get_cube()
+    assert cube.can_answer(where)
+    assert cube.totals(where)["headcount"] == db.count_employees(where=where)
+
+
+def test_cube_rebuilt_after_writes(employees):
+    before = get_cube()
+    db.update_employee(2, {"Status": "Resigned"})
+    cube = get_cube()
+    assert cube is not before
+    assert cube.totals({"Status": "Resigned"})["headcount"] == 3
+
+
+@pytest.mark.parametrize("where", [
+    {"Status": ("!=", "Resigned")},
+    {"Department": ("LIKE", "I%")},
+    {"Role": "Analyst", "Status": ("=", "Active")},
+])
+def test_operator_filters_are_left_to_sqlite(employees, where):
+    cube = get_cube()
+    assert not cube.can_answer(where)
+    frame = db.fetch_employees(columns=["Emp_ID"], where=where)
+    assert db.count_employees(where=where) == len(frame) > 0
+    streamed = [int(i) for chunk in db.iter_rows("employees", ["Emp_ID"], where, chunk_size=2)
+                for i in chunk["Emp_ID"]]
+    assert streamed == sorted(frame["Emp_ID"].tolist())
@@ -0,0 +1,50 @@
+# tests/test_employee_paging.py
+import pytest
+
+from utils import database as db
+from utils import db_pool
+
+
+def _walk(page_size, **kwargs):
+    ids, cursor, pages = [], None, 0
+    while True:
+        page, cursor = db.fetch_employee_page(page_size=page_size, cursor=cursor, **kwargs)
+        ids += page["Emp_ID"].astype(int).tolist()
+        pages += 1
+        if cursor is None:
+            return ids, pages
+
+
+def _expected(sort_by, descending, where_sql=""):
+    # SQLite sorts NULL lowest: first ascending, last descending
+    rows = db_pool.get_connection().execute(f"SELECT {sort_by}, Emp_ID FROM employees{where_sql}").fetchall()
+    rows.sort(key=lambda r: (r[0] is not None, r[0] if r[0] is not None else 0, r[1]), reverse=descending)
+    return [r[1] for r in rows]
+
+
+@pytest.mark.parametrize("sort_by", ["Emp_ID", "Name", "Salary", "Department", "Location"])
+@pytest.mark.parametrize("descending", [False, True])
+@pytest.mark.parametrize("page_size", [1, 2, 4])
+def test_pages_cover_every_row_once_in_order(employees, sort_by, descending, page_size):
+    ids, pages = _walk(page_size, sort_by=sort_by, descending=descending)
+    assert ids == _expected(sort_by, descending)
+    assert pages == -(-6 // page_size)
+
+
+def test_ties_are_broken_by_emp_id(employees):
+    db.add_employees([{"Emp_ID": 10 + i, "Name": "Same", "Salary": 50000} for i in range(5)])
+    assert _walk(2, sort_by="Salary")[0] == _expected("Salary", False)
+    assert _walk(3, sort_by="Salary", descending=True)[0] == _expected("Salary", True)
+
+
+def test_filters_and_search_apply_to_every_page(employees):
+    ids, _ = _walk(1, where={"Status": "Active"}, sort_by="Salary", descending=True)
+    assert ids == _expected("Salary", True, " WHERE Status = 'Active'")
+    assert _walk(1, search="sql")[0] == [1, 4]
+
+
+def test_last_page_has_no_cursor(employees):
+    page, cursor = db.fetch_employee_page(page_size=6)
+    assert len(page) == 6 and cursor is None
+    page, cursor = db.fetch_employee_page(page_size=5, sort_by="Location")
+    assert cursor == (page["Location"].iloc[-1], int(page["Emp_ID"].iloc[-1]))
@@ -0,0 +1,61 @@
+# tests/test_employee_profile.py
+import pytest
+
+from utils import database as db
+
+
+@pytest.fixture
+def profile_data(employees):
+    db.add_tasks([
+        {"task_name": "done", "emp_id": 1, "assigned_by": "b", "due_date": "2024-01-01", "status": "Completed"},
+        {"task_name": "late", "emp_id": 1, "assigned_by": "b", "due_date": "2024-02-01", "status": "Pending"},
+        {"task_name": "undated", "emp_id": 1, "assigned_by": "b", "status": "Pending"},
+        {"task_name": "soon", "emp_id": 1, "assigned_by": "b", "due_date": "2024-03-10", "status": "In Progress"},
+        {"task_name": "not mine", "emp_id": 2, "assigned_by": "b", "due_date": "2024-01-01", "status": "Pending"},
+    ])
+    db.add_mood_entries([
+        {"emp_id": 1, "mood": "Happy", "log_date": "2024-01-01 09:00:00"},
+        {"emp_id": 1, "mood": "Sad", "log_date": "2024-02-25 09:00:00"},
+        {"emp_id": 1, "mood": "😊 Happy", "log_date": "2024-03-01 09:00:00"},
+        {"emp_id": 2, "mood": "Angry", "log_date": "2024-03-01 09:00:00"},
+    ])
+    db.add_feedback(2, 1, "thanks", 5)
+    db.add_feedback(4, 1, "ok", 3)
+    db.add_feedback(1, 2, "nice", 4)
+    return employees
+
+
+def test_profile_parts_and_stats(profile_data):
+    profile = db.employee_profile(1, today="2024-03-05")
+    assert profile["employee"]["Name"] == "Asha"
+    assert profile["tasks"]["task_name"].tolist() == ["late", "soon", "undated", "done"]
+    assert profile["moods"]["mood"].tolist() == [5, 2, 5]  # newest first
+    assert profile["feedback_received"]["Sender"].tolist() == ["John", "Ravi"]
+    assert profile["feedback_given"]["Receiver"].tolist() == ["Ravi"]
+    assert profile["stats"] == {
+        "tasks_total": 4, "tasks_open": 3, "tasks_overdue": 1, "mood_entries": 3, "avg_mood": 4.0,
+        "avg_mood_30d": 3.5, "feedback_received": 2, "avg_rating_received": 4.0, "feedback_given": 1,
+    }
+
+
+def test_limits_cap_lists_not_stats(profile_data):
+    profile = db.employee_profile(1, moods=1, feedback=1, today="2024-03-05")
+    assert len(profile["moods"]) == 1 and len(profile["feedback_received"]) == 1
+    assert profile["stats"]["mood_entries"] == 3 and profile["stats"]["feedback_received"] == 2
+    assert len(db.employee_profile(1, moods=None, feedback=None)["moods"]) == 3
+
+
+def test_unknown_employee(profile_data):
+    profile = db.employee_profile(99)
+    assert profile["employee"] is None and profile["tasks"].empty
+    assert profile["stats"]["tasks_total"] == 0
+
+
+def test_cached_until_a_profile_table_changes(profile_data):
+    first = db.employee_profile(1, today="2024-03-05")
+    first["tasks"].drop(first["tasks"].index, inplace=True)  # callers get copies
+    hits = db.cache_stats()["hits"]
+    assert len(db.employee_profile(1, today="2024-03-05")["tasks"]) == 4
+    assert db.cache_stats()["hits"] == hits + 1
+    db.add_feedback(5, 1, "late note", 1)
+    assert db.employee_profile(1, today="2024-03-05")["stats"]["feedback_received"] == 3
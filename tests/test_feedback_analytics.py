@@ -0,0 +1,69 @@
+# tests/test_feedback_analytics.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import database as db
+from utils.feedback_analytics import FeedbackEngine
+
+
+def _expected(by):
+    """people() recomputed from scratch with a plain groupby"""
+    rows = db.fetch_feedback()
+    key = f"{by}_id"
+    rated = rows.dropna(subset=["rating"]).groupby(key)["rating"]
+    out = pd.DataFrame({"feedback": rows.groupby(key).size(), "avg_rating": rated.mean(),
+                        "std_rating": rated.std(), "recent_avg": rated.apply(lambda r: r.tail(5).mean())})
+    return out.sort_index()
+
+
+def _check(engine):
+    for by in ("receiver", "sender"):
+        got = engine.people(by).set_index(f"{by}_id").sort_index()
+        want = _expected(by)
+        assert got.index.tolist() == want.index.tolist()
+        for col in want:
+            assert np.allclose(got[col].astype(float), want[col].astype(float), equal_nan=True), (by, col)
+    ratings = db.fetch_feedback()["rating"].dropna().astype(int).value_counts().sort_index()
+    assert engine.rating_distribution().to_dict() == ratings.to_dict()
+
+
+@pytest.fixture
+def feedback(employees):
+    for i in range(12):
+        db.add_feedback(1 + i % 3, 1 + (i * 5) % 6, f"note {i}", None if i % 4 == 3 else 1 + i % 5)
+    return employees
+
+
+def test_new_rows_are_folded_in_incrementally(feedback):
+    engine = FeedbackEngine()
+    assert engine.refresh() == 12
+    _check(engine)
+    assert engine.refresh() == 0
+    db.add_feedback(4, 2, "late", 5)
+    db.add_feedback(5, 2, "later", 1)
+    assert engine.refresh() == 2  # only the rows past last_id are read
+    assert engine.last_id == db.fetch_feedback()["feedback_id"].max()
+    _check(engine)
+
+
+def test_deletes_rebuild_the_aggregates(feedback):
+    engine = FeedbackEngine()
+    engine.refresh()
+    ids = db.fetch_feedback()["feedback_id"].tolist()
+    db.delete_feedback(ids[0])
+    db.delete_feedback(ids[5])
+    db.add_feedback(6, 3, "new", 4)
+    assert engine.refresh() == 11  # deletion detected: the table is streamed again
+    assert engine.count == 11
+    _check(engine)
+
+
+def test_incremental_reads_bypass_the_query_cache(feedback, monkeypatch):
+    engine = FeedbackEngine()
+    engine.refresh()
+    monkeypatch.setattr(db, "fetch_feedback", lambda *a, **k: pytest.fail("cached read"))
+    for i in range(3):
+        db.add_feedback(1, 2, f"more {i}", 3)
+        assert engine.refresh() == 1
+    assert engine.people("receiver").set_index("receiver_id").loc[2, "feedback"] >= 3
@@ -0,0 +1,59 @@
+# tests/test_headcount_history.py
+import pandas as pd
+import pytest
+
+from utils import database as db
+from utils.analytics import headcount_history
+
+STAFF = pd.DataFrame({
+    "Join_Date": ["2024-01-01", "2024-01-01", "2024-01-10", "2024-02-05", "2024-02-20", None, "2024-03-01"],
+    "Resign_Date": [None, "2024-01-15", "2024-02-05", None, "2024-02-10", None, "2024-03-01"],
+    "Department": ["IT", "IT", "HR", "HR", None, "IT", "IT"],
+})
+
+
+def _brute(frame, day):
+    join = pd.to_datetime(frame["Join_Date"])
+    resign = pd.to_datetime(frame["Resign_Date"])
+    resign = resign.where(resign.isna() | (resign >= join), join)
+    here = (join <= day) & (resign.isna() | (resign > day))
+    return int(here.sum()), int((join == day).sum()), int((resign == day).sum())
+
+
+def test_daily_counts_match_a_day_by_day_scan():
+    history = headcount_history(STAFF, start="2023-12-30", end="2024-03-05")
+    assert history["date"].min() == pd.Timestamp("2023-12-30") and len(history) == 67
+    for row in history.itertuples():
+        assert (row.headcount, row.hires, row.resignations) == _brute(STAFF, row.date), row.date
+
+
+def test_groups_split_the_totals():
+    total = headcount_history(STAFF, end="2024-03-05").set_index("date")
+    by_dept = headcount_history(STAFF, by="Department", end="2024-03-05")
+    assert set(by_dept["Department"]) == {"IT", "HR", "Unknown"}
+    summed = by_dept.groupby("date")[["headcount", "hires", "resignations"]].sum()
+    assert summed.equals(total[["headcount", "hires", "resignations"]])
+
+
+def test_monthly_periods_and_attrition():
+    monthly = headcount_history(STAFF, freq="M", start="2024-01-01", end="2024-03-31").set_index("date")
+    assert monthly["headcount"].tolist() == [2, 2, 2]
+    assert monthly["hires"].tolist() == [3, 2, 1]
+    assert monthly["resignations"].tolist() == [1, 2, 1]
+    # January opens at 0 and closes at 2; February opens and closes at 2
+    assert monthly.loc["2024-01-01", "attrition_rate"] == 1.0
+    assert monthly.loc["2024-02-01", "attrition_rate"] == 1.0
+    assert monthly.loc["2024-03-01", "attrition_rate"] == 0.5
+
+
+def test_no_known_join_dates():
+    empty = headcount_history(STAFF.assign(Join_Date=None), freq="W")
+    assert empty.empty and "attrition_rate" in empty.columns
+
+
+def test_reads_the_employees_table_by_default(employees):
+    history = headcount_history(start="2018-01-01", end="2024-12-31")
+    frame = db.fetch_employees(columns=["Join_Date", "Resign_Date"], compact=False)
+    for row in history.iloc[::97].itertuples():
+        assert (row.headcount, row.hires, row.resignations) == _brute(frame, row.date), row.date
+    assert history["headcount"].iloc[-1] == 4  # Meera and Sara resigned
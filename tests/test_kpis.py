@@ -0,0 +1,88 @@
+# tests/test_kpis.py
+import pandas as pd
+import pytest
+
+from utils import database as db
+from utils import db_pool, kpis
+from utils.analytics import get_summary_db, department_distribution_db, gender_ratio_db, average_salary_by_dept_db
+
+OPERATOR_FILTERS = [
+    {"Status": ("!=", "Resigned")},
+    {"Status": ("=", "Active")},
+    {"Department": ("LIKE", "I%")},
+    {"Department": ("!=", "IT"), "Gender": "Female"},
+    {"Gender": ("<", "M"), "Status": ["Active", "Resigned"]},
+]
+
+
+def _drift():
+    return kpis.drift(db_pool.get_connection())
+
+
+def test_kpis_follow_inserts_updates_deletes(employees):
+    assert _drift() == 0
+    db.add_employee({"Name": "Noor", "Gender": "Female", "Department": "IT", "Status": "Active", "Salary": 90000})
+    db.add_employees([{"Name": f"Bulk {i}", "Department": "Ops", "Status": "Active", "Salary": 40000 + i}
+                      for i in range(50)])
+    assert _drift() == 0
+    db.update_employee(1, {"Department": "Finance", "Salary": 99000})
+    db.update_employee(2, {"Status": "Resigned", "Resign_Date": "2024-03-01"})
+    db.update_employee(4, {"Salary": None})
+    db.update_employee(6, {"Gender": "Male", "Department": "IT"})  # NULL key group -> real group
+    assert _drift() == 0
+    db.delete_employee(3)
+    db.delete_employee(5)
+    assert _drift() == 0
+
+
+def test_kpis_follow_raw_sql_writes(employees):
+    with db_pool.transaction() as conn:
+        conn.execute("UPDATE employees SET Department = 'Ops' WHERE Department = 'IT'")
+        conn.execute("UPDATE employees SET Salary = Salary * 1.1")
+        conn.execute("DELETE FROM employees WHERE Status = 'Resigned'")
+    assert _drift() == 0
+    # groups that lose their last employee disappear
+    conn = db_pool.get_connection()
+    assert conn.execute("SELECT COUNT(*) FROM agg_department WHERE department = 'IT'").fetchone()[0] == 0
+    assert conn.execute("SELECT COUNT(*) FROM agg_department WHERE headcount <= 0").fetchone()[0] == 0
+
+
+def test_rebuild_reports_and_fixes_drift(employees):
+    with db_pool.transaction() as conn:
+        conn.execute("UPDATE agg_department SET headcount = headcount + 5 WHERE department = 'IT'")
+    assert _drift() > 0
+    assert db.rebuild_kpis() > 0
+    assert _drift() == 0
+    assert db.rebuild_kpis() == 0
+
+
+def _expected(where):
+    frame = db.fetch_employees(where=where, compact=False)
+    return {
+        "summary": {
+            "total": len(frame),
+            "active": int(frame["Status"].eq("Active").sum()),
+            "resigned": int(frame["Status"].eq("Resigned").sum()),
+        },
+        "departments": frame["Department"].dropna().value_counts().sort_index(),
+        "genders": frame["Gender"].value_counts().reindex(["Male", "Female"], fill_value=0),
+        "salary": frame.dropna(subset=["Department", "Salary"]).groupby("Department")["Salary"].mean(),
+    }
+
+
+@pytest.mark.parametrize("where", OPERATOR_FILTERS)
+def test_operator_filters_match_sql(employees, where):
+    expected = _expected(where)
+    assert db.employee_kpis("Department", where) is not None  # answered from agg_department
+    assert get_summary_db(where) == expected["summary"]
+    assert department_distribution_db(where).to_dict() == expected["departments"].to_dict()
+    assert gender_ratio_db(where).to_dict() == expected["genders"].to_dict()
+    salary = average_salary_by_dept_db(where)
+    pd.testing.assert_series_equal(salary.sort_index(), expected["salary"].sort_index(),
+                                   check_names=False, check_index_type=False)
+
+
+def test_filters_outside_the_kpi_table_fall_back(employees):
+    where = {"Location": ("!=", "Pune")}
+    assert db.employee_kpis("Department", where) is None
+    assert get_summary_db(where) == _expected(where)["summary"]
@@ -0,0 +1,28 @@
+# tests/test_legacy_dashboard.py
+"""database.show(), the original all-in-one page, on the current schema"""
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from utils import database as db
+
+SCRIPT = """
+from utils import database as db
+db.show()
+"""
+
+
+@pytest.mark.parametrize("tab", ["Feedback", "Analytics"])
+def test_feedback_views_use_the_feedback_columns(employees, tab):
+    db.add_feedback(2, 1, "great release", 5)
+    db.add_feedback(1, 4, "thanks", 4)
+    at = AppTest.from_string(SCRIPT, default_timeout=60)
+    at.session_state["logged_in"] = True
+    at.session_state["role"] = "Admin"
+    at.session_state["user"] = "admin"
+    at.run()
+    at.sidebar.selectbox[0].select(tab).run()
+    assert not at.exception, [e.value for e in at.exception]
+    if tab == "Feedback":
+        shown = at.dataframe[-1].value
+        assert shown[["Sender", "Receiver", "message"]].values.tolist() == [
+            ["Ravi", "Asha", "great release"], ["Asha", "John", "thanks"]]
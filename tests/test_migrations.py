@@ -0,0 +1,160 @@
+# tests/test_migrations.py
+import sqlite3
+
+from utils import database as db
+from utils import db_pool, kpis, migrations, salary_stats
+
+# Layout written by the original utils/db_setup_general.py and init_tasks_mood.py
+LEGACY_SCHEMA = """
+    CREATE TABLE employees (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT, age INTEGER, department TEXT,
+        gender TEXT, salary REAL, joining_date TEXT
+    );
+    CREATE TABLE attendance (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, employee_id INTEGER, date TEXT, status TEXT,
+        FOREIGN KEY (employee_id) REFERENCES employees(id)
+    );
+    CREATE TABLE tasks (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, employee_id INTEGER, task_name TEXT, status TEXT,
+        deadline TEXT, FOREIGN KEY (employee_id) REFERENCES employees(id)
+    );
+    CREATE TABLE expenses (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, employee_id INTEGER, category TEXT, amount REAL,
+        date TEXT, FOREIGN KEY (employee_id) REFERENCES employees(id)
+    );
+    CREATE TABLE mood (
+        mood_id INTEGER PRIMARY KEY AUTOINCREMENT, emp_id INTEGER NOT NULL, mood TEXT NOT NULL,
+        remarks TEXT, log_date TEXT DEFAULT (date('now'))
+    );
+    INSERT INTO employees (id, name, age, department, gender, salary, joining_date) VALUES
+        (1, 'Asha', 31, 'IT', 'Female', 85000, '2020-01-15'),
+        (7, 'Ravi', 28, 'HR', 'Male', 52000, '2021-03-01');
+    INSERT INTO attendance (employee_id, date, status) VALUES (7, '2024-01-02', 'Present');
+    INSERT INTO expenses (employee_id, category, amount, date) VALUES (1, 'Travel', 120.5, '2024-01-03');
+    INSERT INTO tasks (employee_id, task_name, status, deadline) VALUES (7, 'Onboarding', 'Pending', '2024-02-01');
+    INSERT INTO mood (emp_id, mood, remarks, log_date) VALUES (1, 'Happy', 'ok', '2024-01-05');
+"""
+
+
+def _legacy_db(tmp_path, monkeypatch):
+    path = str(tmp_path / "legacy.db")
+    conn = sqlite3.connect(path)
+    conn.executescript(LEGACY_SCHEMA)
+    conn.close()
+    monkeypatch.setattr(db_pool, "DB_PATH", path)
+    db_pool.close_all()
+    db.clear_cache()
+    return path
+
+
+def _table_sql(conn, name):
+    row = conn.execute("SELECT sql FROM sqlite_master WHERE type='table' AND name=?", (name,)).fetchone()
+    return row[0] if row else None
+
+
+def test_fresh_database_reaches_latest_version(db_path):
+    assert migrations.current_version() == migrations.MIGRATIONS[-1][0]
+    assert migrations.migrate() == []
+    conn = db_pool.get_connection()
+    for table in ["employees", "tasks", "mood_logs", "feedback", "users",
+                  "employee_skills", "agg_department", "salary_bins", "data_versions"]:
+        assert migrations.table_exists(conn, table), table
+    versions = dict(conn.execute("SELECT name, version FROM data_versions"))
+    assert set(versions) == set(migrations.VERSIONED_TABLES)
+
+
+def test_legacy_layout_is_converted(tmp_path, monkeypatch):
+    path = _legacy_db(tmp_path, monkeypatch)
+    assert migrations.migrate(path) == [v for v, _, _ in migrations.MIGRATIONS]
+    conn = db_pool.get_connection(path)
+
+    employees = conn.execute("SELECT Emp_ID, Name, Department, Salary, Join_Date FROM employees ORDER BY Emp_ID").fetchall()
+    assert employees == [(1, "Asha", "IT", 85000.0, "2020-01-15"), (7, "Ravi", "HR", 52000.0, "2021-03-01")]
+    assert conn.execute("SELECT task_id, emp_id, task_name, due_date, priority FROM tasks").fetchall() == [
+        (1, 7, "Onboarding", "2024-02-01", "Low")]
+    assert conn.execute("SELECT emp_id, mood, remarks FROM mood_logs").fetchall() == [(1, "Happy", "ok")]
+    assert not migrations.table_exists(conn, "mood")
+    leftovers = conn.execute(
+        "SELECT name FROM sqlite_master WHERE name LIKE '%_legacy' OR name LIKE '%_new'").fetchall()
+    assert leftovers == []
+
+    # derived tables are filled from the converted rows
+    assert kpis.drift(conn) == 0
+    assert salary_stats.drift(conn) == 0
+    assert conn.execute("SELECT COUNT(*) FROM agg_department").fetchone()[0] == 2
+
+
+def test_legacy_rebuild_keeps_foreign_keys(tmp_path, monkeypatch):
+    path = _legacy_db(tmp_path, monkeypatch)
+    migrations.migrate(path)
+    conn = db_pool.get_connection(path)
+
+    for child in ("attendance", "expenses"):
+        assert [(r[2], r[3], r[4]) for r in conn.execute(f"PRAGMA foreign_key_list({child})")] == [
+            ("employees", "employee_id", "Emp_ID")]
+        assert "employees_legacy" not in _table_sql(conn, child)
+    assert conn.execute("PRAGMA foreign_key_check").fetchall() == []
+    assert conn.execute("SELECT employee_id, status FROM attendance").fetchall() == [(7, "Present")]
+
+    # the keys are real: with enforcement on, a referenced employee cannot be deleted
+    conn.execute("PRAGMA foreign_keys=ON")
+    try:
+        conn.execute("DELETE FROM employees WHERE Emp_ID = 7")
+    except sqlite3.IntegrityError:
+        pass
+    else:
+        raise AssertionError("delete of a referenced employee was allowed")
+    finally:
+        conn.execute("PRAGMA foreign_keys=OFF")
+
+
+def test_migrate_restores_foreign_keys_setting(tmp_path, monkeypatch):
+    path = _legacy_db(tmp_path, monkeypatch)
+    conn = db_pool.get_connection(path)
+    conn.execute("PRAGMA foreign_keys=ON")
+    migrations.migrate(path)
+    assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+    conn.execute("PRAGMA foreign_keys=OFF")
+
+
+def test_legacy_orphan_rows_fail_the_step(tmp_path, monkeypatch):
+    path = _legacy_db(tmp_path, monkeypatch)
+    raw = sqlite3.connect(path)
+    raw.execute("INSERT INTO attendance (employee_id, date, status) VALUES (99, '2024-01-02', 'Present')")
+    raw.commit()
+    raw.close()
+    try:
+        migrations.migrate(path)
+    except sqlite3.IntegrityError as e:
+        assert "foreign key check failed" in str(e)
+    else:
+        raise AssertionError("orphan attendance row passed the foreign key check")
+    # the failed step rolled back: legacy layout untouched, nothing recorded
+    conn = db_pool.get_connection(path)
+    assert "id" in migrations.table_columns(conn, "employees")
+    assert migrations.current_version(path) == 0
+
+
+def test_skills_index_built_from_existing_rows(employees):
+    conn = db_pool.get_connection()
+    assert conn.execute("SELECT skill FROM employee_skills WHERE emp_id = 4 ORDER BY skill").fetchall() == [
+        ("Excel",), ("SQL",)]
+    db.delete_employee(4)
+    assert conn.execute("SELECT COUNT(*) FROM employee_skills WHERE emp_id = 4").fetchone()[0] == 0
+
+
+def test_fulltext_search_tracks_writes(employees):
+    if not migrations.fts5_available(db_pool.get_connection()):
+        return
+    assert db.search("employees", "Meera")["Emp_ID"].tolist() == [3]
+    db.update_employee(3, {"Name": "Meenakshi"})
+    assert db.search("employees", "Meera").empty
+    assert db.search("employees", "Meenakshi")["Emp_ID"].tolist() == [3]
+
+
+def test_data_versions_count_every_write(employees):
+    before = db.table_data_version("employees")
+    db.update_employee(2, {"Salary": 54000})
+    db.delete_employee(6)
+    assert db.table_data_version("employees") == before + 2
+    assert db.table_data_version("tasks") == 0
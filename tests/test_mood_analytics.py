@@ -0,0 +1,61 @@
+# tests/test_mood_analytics.py
+import pandas as pd
+import pytest
+
+from utils import database as db
+from utils import mood_analytics
+from utils.mood_analytics import MoodEngine
+
+
+@pytest.fixture
+def moods(employees):
+    db.add_mood_entries([
+        {"emp_id": 1, "mood": "😊 Happy", "log_date": "2024-03-01 09:00:00"},
+        {"emp_id": 1, "mood": "Sad", "log_date": "2024-03-01 17:00:00"},
+        {"emp_id": 2, "mood": "Neutral", "log_date": "2024-03-02 09:00:00"},
+        {"emp_id": 4, "mood": "Angry", "log_date": "2024-03-05 09:00:00"},
+    ])
+    return employees
+
+
+def _org_scores(engine):
+    return engine.series("org").set_index("date")["score"].to_dict()
+
+
+def test_new_logs_are_folded_in_incrementally(moods):
+    engine = MoodEngine()
+    assert engine.refresh() == 4
+    assert engine.refresh() == 0
+    assert _org_scores(engine)[pd.Timestamp("2024-03-01")] == 3.5
+    db.add_mood_entries([{"emp_id": 2, "mood": "Happy", "log_date": "2024-03-01 12:00:00"}])
+    assert engine.refresh() == 1
+    assert _org_scores(engine)[pd.Timestamp("2024-03-01")] == 4.0
+    summary = engine.summary("employee", today="2024-03-05").set_index("emp_id")
+    assert summary.loc[2, "entries"] == 2 and summary.loc[2, "avg_score"] == 4.0
+
+
+def test_deleted_logs_trigger_a_rebuild(moods):
+    engine = MoodEngine()
+    engine.refresh()
+    with db._writing("mood_logs") as conn:
+        conn.execute("DELETE FROM mood_logs WHERE emp_id = 1")
+    assert engine.refresh() == 2
+    assert pd.Timestamp("2024-03-01") not in _org_scores(engine)
+
+
+def test_employee_series_needs_capped_keys(moods):
+    engine = MoodEngine()
+    with pytest.raises(ValueError):
+        engine.series("employee")
+    with pytest.raises(ValueError):
+        engine.series("employee", keys=range(mood_analytics.MAX_SERIES_KEYS + 1))
+    assert sorted(engine.series("employee", keys=[1, 4])["emp_id"].unique()) == [1, 4]
+
+
+def test_derived_cache_is_bounded(moods, monkeypatch):
+    monkeypatch.setattr(mood_analytics, "DERIVED_MAX", 3)
+    engine = MoodEngine()
+    for day in range(1, 8):
+        engine.summary("employee", today=f"2024-03-{day:02d}")
+    assert len(engine._derived) == 3
+    assert ("summary", "employee", None, pd.Timestamp("2024-03-07"), None) in engine._derived
@@ -0,0 +1,63 @@
+# tests/test_pdf_export.py
+import io
+
+import pandas as pd
+from reportlab.platypus import LongTable, Paragraph
+
+from utils import database as db
+from utils.pdf_export import generate_summary_pdf, table_section
+
+COLUMNS = ["Emp_ID", "Name"]
+
+
+def _frame(n, start=0):
+    return pd.DataFrame({"Emp_ID": range(start, start + n), "Name": [f"N{i}" for i in range(start, start + n)]})
+
+
+def _tables(flowables):
+    return [len(f._cellvalues) - 1 for f in flowables if isinstance(f, LongTable)]
+
+
+def test_tables_are_cut_into_page_rows_chunks():
+    assert _tables(table_section(_frame(95), COLUMNS, [], page_rows=40)) == [40, 40, 15]
+    chunks = (_frame(min(7, 95 - i), i) for i in range(0, 95, 7))  # iterables are re-cut to page_rows
+    assert _tables(table_section(chunks, COLUMNS, [], page_rows=40)) == [40, 40, 15]
+
+
+def test_max_rows_counts_the_rest():
+    done = []
+    flowables = list(table_section(_frame(95), COLUMNS, [], page_rows=40, max_rows=50, on_rows=done.append))
+    assert _tables(flowables) == [40, 10]
+    assert done == [40, 10]
+    more = [f for f in flowables if isinstance(f, Paragraph)]
+    assert "45 more rows not shown (showing the first 50)" in more[0].text
+
+
+def test_chunks_are_pulled_lazily():
+    pulled = []
+
+    def source():
+        for i in range(0, 1000, 10):
+            pulled.append(i)
+            yield _frame(10, i)
+
+    section = table_section(source(), COLUMNS, [], page_rows=20)
+    first = next(section)
+    assert len(first._cellvalues) == 21 and len(pulled) == 2
+
+
+def test_missing_columns_are_left_out_and_empty_sources_add_nothing():
+    table = next(table_section(_frame(3), ["Emp_ID", "Role", "Name"], []))
+    assert table._cellvalues[0] == ["Emp_ID", "Name"]
+    assert list(table_section(pd.DataFrame(), COLUMNS, [])) == []
+    assert list(table_section(None, COLUMNS, [])) == []
+
+
+def test_summary_pdf_streams_db_rows(employees):
+    db.add_employees([{"Name": f"Bulk {i}", "Status": "Active"} for i in range(120)])
+    progress = []
+    buf = io.BytesIO()
+    generate_summary_pdf(buf, 126, 124, 2, db.iter_rows("employees", chunk_size=25),
+                         page_rows=30, max_rows=100, on_progress=progress.append)
+    assert buf.getvalue()[:4] == b"%PDF"
+    assert progress == [30, 60, 90, 100]
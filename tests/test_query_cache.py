@@ -0,0 +1,54 @@
+# tests/test_query_cache.py
+import sqlite3
+
+from utils import database as db
+from utils import db_pool
+from utils.query_cache import VersionedCache
+
+
+def test_repeat_reads_hit_the_cache(employees):
+    db.fetch_employees()
+    hits = db.cache_stats()["hits"]
+    db.fetch_employees()
+    assert db.cache_stats()["hits"] == hits + 1
+
+
+def test_writes_invalidate_reads_of_that_table(employees):
+    assert db.fetch_employees(where={"Emp_ID": 2})["Name"].tolist() == ["Ravi"]
+    tasks_version = db.table_version("tasks")
+    db.update_employee(2, {"Name": "Ravi K"})
+    assert db.fetch_employees(where={"Emp_ID": 2})["Name"].tolist() == ["Ravi K"]
+    assert db.table_version("tasks") == tasks_version  # other tables keep their entries
+
+
+def test_cached_frames_are_copies(employees):
+    frame = db.fetch_employees()
+    frame["Name"] = "changed"
+    assert "changed" not in db.fetch_employees()["Name"].tolist()
+
+
+def test_nested_writes_bump_once_on_commit(employees):
+    before = db.table_version("employees")
+    with db._writing("employees") as conn:
+        conn.execute("UPDATE employees SET Name = 'X' WHERE Emp_ID = 1")
+        with db._writing("employees"):
+            pass
+        assert db.table_version("employees") == before
+    assert db.table_version("employees") == before + 1
+
+
+def test_other_processes_writes_invalidate_everything(employees):
+    assert db.count_employees() == 6
+    conn = sqlite3.connect(db_pool.DB_PATH)
+    conn.execute("DELETE FROM employees WHERE Emp_ID = 6")
+    conn.commit()
+    conn.close()
+    assert db.count_employees() == 5
+
+
+def test_lru_is_bounded():
+    cache = VersionedCache(max_entries=2)
+    for key in "abc":
+        cache.get_or_load("t", key, lambda k=key: k)
+    assert cache.stats()["entries"] == 2
+    assert cache.get_or_load("t", "a", lambda: "reloaded") == "reloaded"
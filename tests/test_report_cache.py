@@ -0,0 +1,64 @@
+# tests/test_report_cache.py
+import os
+
+import pandas as pd
+import pytest
+
+from utils import database as db
+from utils import report_cache
+from utils.report_jobs import rows
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(report_cache, "CACHE_DIR", str(tmp_path / "cache"))
+    return report_cache
+
+
+def _file(tmp_path, name, size):
+    path = tmp_path / name
+    path.write_bytes(b"x" * size)
+    return str(path)
+
+
+def test_keys_follow_inputs_not_their_order(employees):
+    frame = pd.DataFrame({"a": [1, 2]})
+    key = report_cache.key("summary_pdf", {"title": "T", "df": frame, "fig": b"png"})
+    assert key == report_cache.key("summary_pdf", {"fig": b"png", "df": frame.copy(), "title": "T"})
+    assert key != report_cache.key("summary_pdf", {"title": "T", "df": frame.assign(a=[1, 3]), "fig": b"png"})
+    assert key != report_cache.key("summary_pdf", {"title": "T", "df": frame, "fig": b"other"})
+    assert key != report_cache.key("other_pdf", {"title": "T", "df": frame, "fig": b"png"})
+    spec = rows("employees", {"Status": "Active"})
+    assert report_cache.key("r", {"df": spec}) != report_cache.key("r", {"df": tuple(spec)})
+
+
+def test_keys_change_when_source_tables_are_written(employees):
+    params = {"df": rows("employees")}
+    key = report_cache.key("summary_pdf", params, ["employees"])
+    assert report_cache.key("summary_pdf", params, ["employees"]) == key
+    db.add_feedback(1, 2, "unrelated table", 4)
+    assert report_cache.key("summary_pdf", params, ["employees"]) == key
+    db.update_employee(2, {"Salary": 1})
+    assert report_cache.key("summary_pdf", params, ["employees"]) != key
+
+
+def test_put_get_and_miss(cache, tmp_path):
+    assert cache.get("k1") is None
+    stored = cache.put("k1", _file(tmp_path, "a.pdf", 10))
+    assert cache.get("k1") == stored and open(stored, "rb").read() == b"x" * 10
+    assert cache.stats() == {"files": 1, "bytes": 10}
+
+
+def test_evicts_least_recently_used(cache, tmp_path, monkeypatch):
+    monkeypatch.setattr(report_cache, "MAX_BYTES", 250)
+    for i, name in enumerate(["old", "mid", "new"]):
+        cache.put(name, _file(tmp_path, f"{name}.pdf", 100))
+        os.utime(os.path.join(cache.CACHE_DIR, f"{name}.pdf"), (1000 + i, 1000 + i))
+    assert cache.stats()["files"] == 2  # third put went over the bound
+    assert cache.get("old") is None
+    os.utime(os.path.join(cache.CACHE_DIR, "mid.pdf"), (1000, 1000))
+    cache.get("mid")  # a hit makes it the most recent
+    assert cache.evict(max_bytes=100) == 1
+    assert cache.get("mid") is not None and cache.get("new") is None
+    cache.clear()
+    assert cache.stats() == {"files": 0, "bytes": 0}
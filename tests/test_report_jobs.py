@@ -0,0 +1,87 @@
+# tests/test_report_jobs.py
+import os
+import time
+
+import pytest
+
+from utils import report_cache, report_jobs
+
+
+@pytest.fixture
+def jobs(employees, tmp_path, monkeypatch):
+    monkeypatch.setattr(report_jobs, "REPORT_DIR", str(tmp_path / "reports"))
+    monkeypatch.setattr(report_cache, "CACHE_DIR", str(tmp_path / "cache"))
+    yield report_jobs
+    for name in ("_executor", "_pack_executor"):
+        pool = getattr(report_jobs, name)
+        if pool is not None:
+            pool.shutdown(wait=True)
+            setattr(report_jobs, name, None)
+
+
+def _wait(job_id, timeout=120):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        state = report_jobs.status(job_id)
+        if state["state"] in ("done", "failed"):
+            return state
+        time.sleep(0.2)
+    raise AssertionError(f"job {job_id} still {state['state']}")
+
+
+def test_summary_pdf_job_reads_rows_in_the_worker(jobs):
+    job_id = jobs.submit_summary_pdf(6, 4, 2, jobs.rows("employees", {"Status": "Active"}))
+    assert jobs.status(job_id)["state"] in ("queued", "running", "done")
+    state = _wait(job_id)
+    assert state["state"] == "done", state.get("error")
+    assert state["progress"] == 1.0
+    with open(jobs.result_path(job_id), "rb") as f:
+        assert f.read(4) == b"%PDF"
+
+
+def test_unchanged_report_is_served_from_the_cache(jobs):
+    first = jobs.submit_summary_pdf(6, 4, 2, jobs.rows("employees"))
+    _wait(first)
+    jobs._futures[first].result()  # done callback has stored the file
+    second = jobs.submit_summary_pdf(6, 4, 2, jobs.rows("employees"))
+    assert second != first
+    assert jobs.status(second)["cached"] is True
+
+
+def test_failed_jobs_name_the_file_type(jobs, monkeypatch):
+    errors = []
+    monkeypatch.setattr(report_jobs.st, "error", errors.append)
+    report_jobs._show_state({"state": "failed", "error": "boom"}, "x", "r.pdf", "Download")
+    report_jobs._show_state({"state": "failed", "error": "boom", "ext": "zip"}, "y", "p.zip", "Download")
+    assert errors == ["Failed to generate PDF: boom", "Failed to generate report pack: boom"]
+
+
+def test_unknown_and_interrupted_jobs(jobs):
+    assert jobs.status("missing") is None
+    os.makedirs(jobs.REPORT_DIR)
+    jobs._write_state("orphan", state="running")  # no future in this process: its server went away
+    assert jobs.status("orphan")["state"] == "failed"
+    assert jobs.result_path("orphan") is None
+
+
+def test_employee_pack_zips_one_pdf_per_employee(jobs, monkeypatch):
+    import zipfile
+
+    monkeypatch.setattr(jobs, "PACK_WORKERS", 2)
+    monkeypatch.setattr(jobs, "PACK_BATCH", 2)
+    job_id = jobs.submit_employee_pack()  # default: active employees
+    assert jobs.status(job_id)["total_files"] == 4
+    state = _wait(job_id)
+    assert state["state"] == "done", state.get("error")
+    assert state["files"] == 4 and state["mime"] == "application/zip"
+    path = jobs.result_path(job_id)
+    assert path.endswith(".zip")
+    with zipfile.ZipFile(path) as zf:
+        assert sorted(zf.namelist()) == [
+            "000001_Asha.pdf", "000002_Ravi.pdf", "000004_John.pdf", "000006_Vik.pdf"]
+        assert all(zf.read(name)[:4] == b"%PDF" for name in zf.namelist())
+
+
+def test_empty_pack_finishes_with_an_empty_zip(jobs):
+    state = _wait(jobs.submit_employee_pack(where={"Department": "Nowhere"}))
+    assert (state["state"], state["files"], state["total_files"]) == ("done", 0, 0)
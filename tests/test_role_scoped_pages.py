@@ -0,0 +1,92 @@
+# tests/test_role_scoped_pages.py
+"""Employee logins only ever read their own rows (Tasks, Feedback, Employee Dashboard)"""
+import os
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from utils import database as db
+from utils import db_pool
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# the pages run in-process, so they see the test database set by the db_path fixture
+SCRIPT = """
+import importlib.util
+spec = importlib.util.spec_from_file_location("page", {path!r})
+page = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(page)
+page.show()
+"""
+
+
+def _run(page, role, user, **state):
+    at = AppTest.from_string(SCRIPT.format(path=os.path.join(ROOT, "pages", page)), default_timeout=60)
+    at.session_state["logged_in"] = True
+    at.session_state["role"] = role
+    at.session_state["user"] = user
+    for key, value in state.items():
+        at.session_state[key] = value
+    at.run()
+    assert not at.exception, [e.value for e in at.exception]
+    return at
+
+
+@pytest.fixture
+def org(employees):
+    db.add_tasks([
+        {"task_name": "Asha task", "emp_id": 1, "assigned_by": "boss", "due_date": "2030-01-01", "status": "Pending"},
+        {"task_name": "Ravi task", "emp_id": 2, "assigned_by": "boss", "due_date": "2030-01-01", "status": "Pending"},
+    ])
+    db.add_feedback(2, 1, "to Asha from Ravi", 5)
+    db.add_feedback(1, 4, "to John from Asha", 4)
+    db.add_feedback(4, 2, "to Ravi from John", 3)
+    return employees
+
+
+def test_current_emp_id_resolved_from_login(org):
+    at = _run("5_Tasks.py", "Employee", "Asha")
+    assert at.session_state["my_emp_id"] == 1
+    at = _run("5_Tasks.py", "Employee", "nobody")
+    assert at.session_state["my_emp_id"] is None
+
+
+def test_tasks_page_shows_only_own_tasks(org):
+    rows = _run("5_Tasks.py", "Employee", "Asha").dataframe[0].value
+    assert rows["task_name"].tolist() == ["Asha task"]
+    assert len(_run("5_Tasks.py", "Admin", "admin").dataframe[0].value) == 2
+
+
+def test_unlinked_employee_sees_no_rows(org):
+    at = _run("5_Tasks.py", "Employee", "nobody")
+    assert at.dataframe[0].value.empty
+    assert any("No employee record" in i.value for i in at.info)
+    at = _run("7_Feedback.py", "Employee", "nobody")
+    assert at.dataframe[0].value.empty
+
+
+def test_feedback_page_shows_only_own_feedback(org):
+    at = _run("7_Feedback.py", "Employee", "Asha")
+    assert sorted(at.dataframe[0].value["message"]) == ["to Asha from Ravi", "to John from Asha"]
+    # no org-wide analytics tables for the Employee role
+    assert len(at.dataframe) == 1
+    at = _run("7_Feedback.py", "Admin", "admin")
+    assert len(at.dataframe[0].value) == 3
+    assert len(at.dataframe) == 3  # records, top-rated, frequent givers
+
+
+def test_feedback_is_saved_with_the_senders_emp_id(org):
+    db_pool.get_connection().execute("INSERT INTO users (id, username, password, role) VALUES (4, 'Asha', '', 'Employee')")
+    at = _run("7_Feedback.py", "Employee", "Asha")
+    at.selectbox[0].select("2 - Ravi")
+    at.text_area[0].input("thanks")
+    at.button[0].click().run()
+    sent = db.fetch_feedback(where={"message": "thanks"})
+    assert sent[["sender_id", "receiver_id"]].values.tolist() == [[1, 2]]
+
+
+def test_employee_dashboard_has_no_free_picker(org):
+    at = _run("employee_dashboard.py", "Employee", "nobody")
+    assert len(at.selectbox) == 0
+    assert any("No employee record" in i.value for i in at.info)
+    assert "my_emp_id" not in at.session_state or at.session_state["my_emp_id"] is None
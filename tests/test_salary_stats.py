@@ -0,0 +1,70 @@
+# tests/test_salary_stats.py
+import numpy as np
+import pytest
+
+from utils import database as db
+from utils import db_pool, salary_stats
+from utils.analytics import salary_quantiles_db, SALARY_QUANTILES
+
+
+def _drift():
+    return salary_stats.drift(db_pool.get_connection())
+
+
+def _exact(where, by="Department"):
+    frame = db.fetch_employees(columns=[by, "Salary"], where=where, compact=False).dropna()
+    return {key: np.quantile(part["Salary"], SALARY_QUANTILES) for key, part in frame.groupby(by)}
+
+
+def test_bins_follow_inserts_updates_deletes(employees):
+    assert _drift() == 0
+    db.add_employees([{"Name": f"Bulk {i}", "Department": "Ops", "Role": "Clerk", "Location": "Pune",
+                       "Status": "Active", "Salary": 30000 + 137 * i} for i in range(200)])
+    assert _drift() == 0
+    db.update_employee(1, {"Salary": 120000})
+    db.update_employee(2, {"Department": "Ops", "Role": "Lead"})
+    db.update_employee(4, {"Status": "Resigned", "Resign_Date": "2024-05-01"})
+    db.update_employee(5, {"Salary": 47000})  # NULL salary -> counted
+    db.update_employee(6, {"Salary": None})   # counted -> NULL salary
+    assert _drift() == 0
+    db.delete_employee(1)
+    with db_pool.transaction() as conn:
+        conn.execute("DELETE FROM employees WHERE Department = 'Ops' AND Emp_ID % 3 = 0")
+        conn.execute("UPDATE employees SET Location = NULL WHERE Location = 'Delhi'")
+    assert _drift() == 0
+    assert db_pool.get_connection().execute("SELECT COUNT(*) FROM salary_bins WHERE n <= 0").fetchone()[0] == 0
+
+
+def test_rebuild_reports_and_fixes_drift(employees):
+    with db_pool.transaction() as conn:
+        conn.execute("DELETE FROM salary_bins WHERE value = 'IT'")
+    assert db.rebuild_salary_stats() > 0
+    assert _drift() == 0
+    assert db.rebuild_salary_stats() == 0
+
+
+def test_histogram_quantiles_within_one_percent(employees):
+    db.add_employees([{"Name": f"Bulk {i}", "Department": "Ops", "Status": "Active", "Salary": 25000 + 311 * i}
+                      for i in range(500)])
+    where = {"Status": "Active"}
+    assert db.salary_histogram("Department", where) is not None
+    bands = salary_quantiles_db("Department", where=where)
+    # bins are <= 1% wide; with two or three rows the exact quantiles interpolate across gaps
+    approx = bands.loc["Ops", [f"p{round(q * 100):g}" for q in SALARY_QUANTILES]].to_numpy(dtype="float64")
+    assert np.allclose(approx, _exact(where)["Ops"], rtol=0.01)
+    assert bands.loc["IT", "count"] == 2
+
+
+@pytest.mark.parametrize("where", [
+    {"Status": ("!=", "Resigned")},
+    {"Department": ("LIKE", "I%")},
+    {"Status": "Active", "Role": ("!=", "Intern")},
+])
+def test_operator_filters_use_the_salary_column(employees, where):
+    assert db.salary_histogram("Department", where) is None
+    bands = salary_quantiles_db("Department", where=where)
+    exact = _exact(where)
+    assert sorted(bands.index) == sorted(exact)
+    for dept, values in exact.items():
+        got = bands.loc[dept, [f"p{round(q * 100):g}" for q in SALARY_QUANTILES]].to_numpy(dtype="float64")
+        assert np.allclose(got, values), dept
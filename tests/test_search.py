@@ -0,0 +1,71 @@
+# tests/test_search.py
+import sqlite3
+
+import pytest
+
+from utils import database as db
+from utils import migrations
+
+needs_fts5 = pytest.mark.skipif(not migrations.fts5_available(sqlite3.connect(":memory:")),
+                                reason="SQLite built without FTS5")
+
+
+def _ids(entity, query, key):
+    return db.search(entity, query, limit=None)[key].astype(int).tolist()
+
+
+@pytest.fixture
+def org(employees):
+    db.add_tasks([
+        {"task_name": "Quarterly audit", "emp_id": 4, "assigned_by": "boss", "status": "Pending"},
+        {"task_name": "Fix login bug", "emp_id": 1, "assigned_by": "boss", "status": "Pending",
+         "remarks": "python stack trace"},
+    ])
+    db.add_feedback(2, 1, "Great python mentoring", 5)
+    db.add_feedback(4, 2, "Careful testing", 4)
+    return employees
+
+
+@needs_fts5
+def test_employee_search_matches_prefixes_in_every_column(org):
+    assert _ids("employees", "sel", "Emp_ID") == [2]       # Skills prefix
+    assert sorted(_ids("employees", "analyst", "Emp_ID")) == [4, 5]
+    assert _ids("employees", "asha sql", "Emp_ID") == [1]  # every word must match
+    assert _ids("employees", "3", "Emp_ID") == [3]
+    assert db.search("employees", "  ?!  ").empty
+
+
+@needs_fts5
+def test_tasks_and_feedback_match_people_by_name(org):
+    assert _ids("tasks", "john", "emp_id") == [4]
+    assert _ids("tasks", "python", "emp_id") == [1]
+    assert sorted(_ids("feedback", "ravi", "feedback_id")) == [1, 2]  # sender or receiver
+    assert _ids("feedback", "mentor", "feedback_id") == [1]
+
+
+@needs_fts5
+def test_ranked_and_limited(org):
+    db.add_employees([{"Name": "Python Guru", "Skills": "Python", "Role": "Python Lead"}])
+    hits = db.search("employees", "python")
+    assert hits["Emp_ID"].iloc[0] == 7  # three matching columns beat one
+    assert hits["rank"].is_monotonic_increasing
+    assert len(db.search("employees", "python", limit=1)) == 1
+
+
+@needs_fts5
+def test_triggers_keep_the_index_in_sync(org):
+    db.update_employee(2, {"Name": "Ravindra", "Skills": "Cypress"})
+    assert _ids("employees", "ravindra cypress", "Emp_ID") == [2]
+    assert _ids("employees", "selenium", "Emp_ID") == []
+    db.delete_employee(3)
+    assert _ids("employees", "meera", "Emp_ID") == []
+    db.update_task(2, {"remarks": "rust rewrite"})
+    assert _ids("tasks", "rust", "task_id") == [2] and _ids("tasks", "trace", "task_id") == []
+    db.delete_feedback(1)
+    assert _ids("feedback", "mentoring", "feedback_id") == []
+
+
+def test_like_fallback_without_fts(org, monkeypatch):
+    monkeypatch.setattr(db, "_has_fts", lambda table: False)
+    assert _ids("employees", "selen", "Emp_ID") == [2]
+    assert _ids("feedback", "ravi", "feedback_id") == [1, 2]
@@ -1,6 +1,11 @@
 # utils/analytics.py
+import numpy as np
 import pandas as pd
 
+from utils import database as db
+from utils import salary_stats
+from utils import feedback_analytics
+
 def get_summary(df: pd.DataFrame):
     """
     Return a dict with keys: total, active, resigned
@@ -15,7 +20,8 @@ def get_summary(df: pd.DataFrame):
 def department_distribution(df: pd.DataFrame) -> pd.Series:
     if df is None or df.empty or "Department" not in df.columns:
         return pd.Series(dtype=int)
-    return df["Department"].value_counts().sort_index()
+    counts = df["Department"].value_counts().sort_index()
+    return counts[counts > 0]  # categorical columns also count unused categories
 
 def gender_ratio(df: pd.DataFrame) -> pd.Series:
     if df is None or df.empty or "Gender" not in df.columns:
@@ -25,17 +31,231 @@ def gender_ratio(df: pd.DataFrame) -> pd.Series:
 def average_salary_by_dept(df: pd.DataFrame) -> pd.Series:
     if df is None or df.empty or "Department" not in df.columns or "Salary" not in df.columns:
         return pd.Series(dtype=float)
-    return df.groupby("Department")["Salary"].mean().sort_values(ascending=False)
+    return df.groupby("Department", observed=True)["Salary"].mean().sort_values(ascending=False)
+
+# -------------------------
+# SQL-side variants: same results, aggregated in SQLite.
+# where / search take the page filters (see database.aggregate_employees).
+# Department / Status / Gender filters are answered from the agg_department KPI table.
+# -------------------------
+def _employee_groups(group_by, where=None, search=None):
+    """DataFrame: group_by, headcount, salary_sum, salary_count"""
+    kpis = None if search else db.employee_kpis(group_by, where)
+    if kpis is not None:
+        return kpis
+    return db.aggregate_employees(
+        {"headcount": ("count", None), "salary_sum": ("sum", "Salary"), "salary_count": ("count", "Salary")},
+        group_by=group_by, where=where, search=search)
+
+def _group_series(group_by, values, groups, name):
+    groups = groups[groups[group_by].notna()]
+    return pd.Series(groups[values].values, index=groups[group_by].values, name=name).rename_axis(group_by)
+
+def get_summary_db(where=None, search=None):
+    by_status = _employee_groups("Status", where, search)
+    counts = dict(zip(by_status["Status"], by_status["headcount"]))
+    return {
+        "total": int(by_status["headcount"].sum()),
+        "active": int(counts.get("Active", 0)),
+        "resigned": int(counts.get("Resigned", 0)),
+    }
+
+def department_distribution_db(where=None, search=None) -> pd.Series:
+    return _group_series("Department", "headcount", _employee_groups("Department", where, search), "count")
+
+def gender_ratio_db(where=None, search=None) -> pd.Series:
+    ser = _group_series("Gender", "headcount", _employee_groups("Gender", where, search), "count")
+    return ser.reindex(["Male","Female"], fill_value=0)
+
+def average_salary_by_dept_db(where=None, search=None) -> pd.Series:
+    groups = _employee_groups("Department", where, search)
+    groups = groups[groups["salary_count"] > 0].assign(
+        avg=lambda g: g["salary_sum"].astype(float) / g["salary_count"])
+    return _group_series("Department", "avg", groups, "Salary").sort_values(ascending=False)
+
+SALARY_QUANTILES = [0.1, 0.25, 0.5, 0.75, 0.9]
+
+def salary_quantiles_db(by="Department", quantiles=None, where=None, search=None) -> pd.DataFrame:
+    """
+    Salary quantiles per value of `by` (None for one company-wide row): count, p10 ... p90.
+    Read from the salary_bins histograms (within 1% of exact); filters the histograms
+    cannot answer (search, a second dimension, (op, value) filters) use the exact Salary column instead.
+    """
+    qs = list(quantiles or SALARY_QUANTILES)
+    names = [f"p{round(q * 100):g}" for q in qs]
+    hist = None if search else db.salary_histogram(by, where)
+    if hist is None:
+        frame = db.aggregate_employees({"n": ("count", None)}, group_by=([by] if by else []) + ["Salary"],
+                                       where=where, search=search)
+        hist = frame[frame["Salary"].notna()].rename(columns={"Salary": "bin"})
+        exact = True
+    else:
+        exact = False
+    rows = []
+    for key, part in (hist.groupby(by, sort=True) if by else [(None, hist)]):
+        if exact:  # each distinct salary is its own zero-width "bin"
+            values = np.repeat(part["bin"].to_numpy(dtype="float64"), part["n"].to_numpy(dtype="int64"))
+            result = pd.Series(np.quantile(values, qs) if len(values) else np.nan, index=qs)
+        else:
+            result = salary_stats.quantiles(part, qs)
+        rows.append([key, int(part["n"].sum())] + result.tolist())
+    out = pd.DataFrame(rows, columns=[by or "group", "count"] + names)
+    out = out[out["count"] > 0]
+    return out.set_index(by).rename_axis(by) if by else out.drop(columns="group")
+
+# -------------------------
+# Task SLA (vectorized over datetime64; no per-row Python)
+# -------------------------
+DONE_STATUSES = ["Completed"]
+DUE_BUCKETS = ["Overdue", "Due today", "Due this week", "Later", "No due date", "Completed"]
+
+def task_sla(tasks_df: pd.DataFrame, today=None) -> pd.DataFrame:
+    """
+    Copy of tasks_df with SLA columns added:
+      due          datetime64 due date (NaT when missing / unparseable)
+      overdue      past due and not completed
+      days_overdue whole days past due (0 when not overdue)
+      due_bucket   one of DUE_BUCKETS ("Due this week" = next 7 days)
+    """
+    out = tasks_df.copy()
+    if out.empty:
+        for col in ["due", "overdue", "days_overdue", "due_bucket"]:
+            out[col] = pd.Series(dtype="object")
+        return out
+    today = pd.Timestamp(today or pd.Timestamp.today()).normalize()
+    due = db.parse_dates(out["due_date"]).dt.normalize()
+    done = out["status"].isin(DONE_STATUSES) if "status" in out.columns else pd.Series(False, index=out.index)
+    days_left = (due - today).dt.days
+
+    out["due"] = due
+    out["overdue"] = (days_left < 0) & ~done
+    out["days_overdue"] = (-days_left).where(out["overdue"], 0).fillna(0).astype(int)
+    bucket = pd.Series("Later", index=out.index)
+    bucket[days_left < 7] = "Due this week"
+    bucket[days_left == 0] = "Due today"
+    bucket[days_left < 0] = "Overdue"
+    bucket[due.isna()] = "No due date"
+    bucket[done] = "Completed"
+    out["due_bucket"] = pd.Categorical(bucket, categories=DUE_BUCKETS)
+    return out
+
+def task_sla_summary(tasks_df: pd.DataFrame, by="emp_id", today=None) -> pd.DataFrame:
+    """
+    Per-group SLA counts, e.g. by="emp_id" (assignee) or by="assigned_by" (manager):
+    total, open, completed, overdue, due_this_week, max_days_overdue, overdue_rate (of open)
+    """
+    cols = [by, "total", "open", "completed", "overdue", "due_this_week", "max_days_overdue", "overdue_rate"]
+    if tasks_df is None or tasks_df.empty:
+        return pd.DataFrame(columns=cols)
+    sla = tasks_df if "due_bucket" in tasks_df.columns else task_sla(tasks_df, today)
+    flags = pd.DataFrame({
+        by: sla[by],
+        "total": 1,
+        "completed": sla["due_bucket"].eq("Completed"),
+        "overdue": sla["overdue"],
+        "due_this_week": sla["due_bucket"].isin(["Due today", "Due this week"]),
+        "max_days_overdue": sla["days_overdue"],
+    })
+    summary = flags.groupby(by, dropna=False).agg(
+        total=("total", "sum"), completed=("completed", "sum"), overdue=("overdue", "sum"),
+        due_this_week=("due_this_week", "sum"), max_days_overdue=("max_days_overdue", "max"),
+    ).reset_index()
+    summary["open"] = summary["total"] - summary["completed"]
+    summary["overdue_rate"] = (summary["overdue"] / summary["open"].where(summary["open"] > 0)).fillna(0).round(3)
+    return summary[cols].sort_values(["overdue", "max_days_overdue"], ascending=False).reset_index(drop=True)
+
+# -------------------------
+# Headcount history (event sweep: joins +1, resignations -1, cumulative sum)
+# -------------------------
+def _to_dates(col: pd.Series) -> pd.Series:
+    """Stored date text or already-typed datetime64 (compact frames) -> day timestamps"""
+    return db.parse_dates(col).dt.normalize()
+
+def headcount_history(df: pd.DataFrame = None, freq="D", by=None, start=None, end=None) -> pd.DataFrame:
+    """
+    Headcount, hires and resignations over time from Join_Date / Resign_Date.
+    An employee counts from Join_Date up to (not including) Resign_Date.
+      freq: "D" daily, or "W" / "M" / "Q" / "Y" periods (headcount at period end,
+            hires / resignations summed, attrition_rate = resignations / average headcount)
+      by:   optional grouping column, e.g. "Department" or "Location"
+    df defaults to the employees table (only the needed columns are loaded).
+    Returns a long DataFrame: date, [by], headcount, hires, resignations[, attrition_rate].
+    """
+    if df is None:
+        df = db.fetch_employees(columns=["Join_Date", "Resign_Date"] + ([by] if by else []))
+    cols = ["date"] + ([by] if by else []) + ["headcount", "hires", "resignations"] + (["attrition_rate"] if freq != "D" else [])
+    join = _to_dates(df["Join_Date"]) if not df.empty else pd.Series(dtype="datetime64[ns]")
+    known = join.notna()
+    if not known.any():
+        return pd.DataFrame(columns=cols)
+    join = join[known]
+    resign = _to_dates(df.loc[known, "Resign_Date"]) if "Resign_Date" in df.columns else pd.Series(pd.NaT, index=join.index)
+    resign = resign.where(resign.isna() | (resign >= join), join)  # resigned before joining -> zero-length stay
+    group = df.loc[known, by].astype(object).fillna("Unknown") if by else pd.Series("All", index=join.index)
+
+    start = pd.Timestamp(start).normalize() if start is not None else join.min()
+    end = pd.Timestamp(end or pd.Timestamp.today()).normalize()
+    days = pd.date_range(start, end, freq="D")
+
+    # events per (day, group) -> wide day x group grids
+    hires = join.groupby([join, group]).size().unstack(fill_value=0)
+    gone = resign.notna()
+    resigns = resign[gone].groupby([resign[gone], group[gone]]).size().unstack(fill_value=0)
+    resigns = resigns.reindex(columns=hires.columns, fill_value=0)
+    level = hires.sub(resigns, fill_value=0).sort_index().cumsum()
+    headcount = level.reindex(level.index.union(days)).ffill().fillna(0).reindex(days)
+    hires = hires.reindex(days, fill_value=0)
+    resigns = resigns.reindex(days, fill_value=0)
+
+    grids = {"headcount": headcount, "hires": hires, "resignations": resigns}
+    if freq != "D":
+        periods = days.to_period(freq)
+        before = level[level.index < start]
+        previous_day = headcount.shift(1)
+        previous_day.iloc[0] = before.iloc[-1] if len(before) else 0
+        opening = previous_day.groupby(periods).first()
+        grids = {
+            "headcount": headcount.groupby(periods).last(),
+            "hires": hires.groupby(periods).sum(),
+            "resignations": resigns.groupby(periods).sum(),
+        }
+        average = (opening + grids["headcount"]) / 2
+        grids["attrition_rate"] = (grids["resignations"] / average.where(average > 0)).fillna(0).round(4)
+        for name in grids:
+            grids[name].index = grids[name].index.to_timestamp()
+
+    key = by or "group"
+    long = None
+    for name, grid in grids.items():
+        part = grid.rename_axis(index="date", columns=key).stack().rename(name).reset_index()
+        long = part if long is None else long.merge(part, on=["date", key])
+    for name in ["headcount", "hires", "resignations"]:
+        long[name] = long[name].astype(int)
+    return long[cols].sort_values(([by] if by else []) + ["date"]).reset_index(drop=True)
 
 # Feedback summary
-def feedback_summary(feedback_df: pd.DataFrame, employee_df: pd.DataFrame):
-    if feedback_df is None or feedback_df.empty or employee_df is None or employee_df.empty:
+def feedback_summary(feedback_df: pd.DataFrame = None, employee_df: pd.DataFrame = None):
+    """
+    Employee, Avg_Rating, Feedback_Count per feedback receiver.
+    Without feedback_df the counts come from the incremental feedback engine
+    (utils.feedback_analytics) instead of a groupby over all feedback.
+    """
+    if feedback_df is None:
+        summary = feedback_analytics.feedback_by_person("receiver").rename(
+            columns={"avg_rating": "Avg_Rating", "rated": "Feedback_Count"})
+    elif feedback_df.empty:
+        summary = pd.DataFrame(columns=["receiver_id", "Avg_Rating", "Feedback_Count"])
+    else:
+        summary = feedback_df.groupby("receiver_id").agg(
+            Avg_Rating=("rating", "mean"), Feedback_Count=("rating", "count")
+        ).reset_index()
+    if summary.empty or (employee_df is not None and employee_df.empty):
         return pd.DataFrame(columns=["Employee", "Avg_Rating", "Feedback_Count"])
-    summary = feedback_df.groupby("receiver_id").agg(
-        Avg_Rating=("rating", "mean"), Feedback_Count=("rating", "count")
-    ).reset_index()
-    emp_map = employee_df.set_index("Emp_ID")["Name"].to_dict()
-    summary["Employee"] = summary["receiver_id"].map(emp_map)
+    if employee_df is None:
+        summary["Employee"] = db.names_for(summary["receiver_id"])
+    else:
+        emp_map = employee_df.set_index("Emp_ID")["Name"].to_dict()
+        summary["Employee"] = summary["receiver_id"].map(emp_map)
     summary = summary[["Employee", "Avg_Rating", "Feedback_Count"]]
     return summary
 
@@ -26,19 +26,34 @@ def login(username: str, password: str):
     st.session_state["user_id"] = user["id"]
 
     # map username to Emp_ID if present (optional)
-    try:
-        employees = db.fetch_employees()
-        emp_row = employees[employees["Name"] == username]
-        if not emp_row.empty:
-            st.session_state["my_emp_id"] = int(emp_row.iloc[0]["Emp_ID"])
-        else:
-            st.session_state.setdefault("my_emp_id", None)
-    except Exception:
-        st.session_state.setdefault("my_emp_id", None)
+    st.session_state.pop("my_emp_id", None)
+    current_emp_id()
 
     return True, "Login successful"
 
 
+# -------------------------
+# Logged-in employee
+# -------------------------
+def current_emp_id():
+    """
+    Emp_ID of the logged-in user: the one already chosen this session, else the
+    employee whose Name matches the username (an indexed lookup). None if neither.
+    Pages that limit an Employee to their own rows call this rather than reading
+    session_state, so it does not matter which page was opened first.
+    """
+    emp_id = st.session_state.get("my_emp_id")
+    if emp_id is not None or not st.session_state.get("logged_in", False):
+        return emp_id
+    try:
+        match = db.fetch_employees(columns=["Emp_ID"], where={"Name": st.session_state.get("user")}, limit=1)
+        emp_id = int(match["Emp_ID"].iloc[0]) if not match.empty else None
+    except Exception:
+        emp_id = None
+    st.session_state["my_emp_id"] = emp_id
+    return emp_id
+
+
 # -------------------------
 # Require login (used at top of pages)
 # -------------------------
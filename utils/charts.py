@@ -0,0 +1,143 @@
+# utils/charts.py
+"""
+Rendered-chart cache shared by on-screen display and PDF export.
+- bar_chart() / pie_chart() take the aggregate Series (band_chart() a quantile frame)
+  plus a chart spec (title, labels, size, palette) and return image bytes (PNG by
+  default, or SVG)
+- Each distinct (spec, data) is drawn once on a standalone matplotlib Figure, saved to
+  bytes and the Figure is dropped at once; nothing pyplot-global survives a rerun
+- Bytes are kept in a process-wide LRU bounded by MAX_BYTES, so every session, rerun and
+  PDF job asking for the same chart gets the same bytes (st.image, generate_summary_pdf)
+"""
+
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+import seaborn as sns
+from matplotlib.figure import Figure
+
+DPI = 150
+STYLE = "whitegrid"  # fixed seaborn style, whatever the calling page set globally
+MAX_BYTES = 32 * 1024 * 1024
+FORMATS = ("png", "svg")
+
+
+class ChartCache:
+    """LRU of rendered chart bytes, bounded by total size"""
+
+    def __init__(self, max_bytes=MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_render(self, key, render):
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return data
+            self.misses += 1
+        data = render()  # outside the lock: drawing is the slow part
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = data
+                self.bytes += len(data)
+                while self.bytes > self.max_bytes and len(self._entries) > 1:
+                    _, old = self._entries.popitem(last=False)
+                    self.bytes -= len(old)
+        return data
+
+    def stats(self):
+        with self._lock:
+            return {"charts": len(self._entries), "bytes": self.bytes, "hits": self.hits, "misses": self.misses}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+
+_cache = ChartCache()
+
+
+def _key(spec, series):
+    data = pd.util.hash_pandas_object(series, index=True).values.tobytes()
+    name = list(series.columns) if isinstance(series, pd.DataFrame) else series.name
+    text = repr(sorted(spec.items())) + repr(list(series.index)) + repr(name)
+    return hashlib.sha256(text.encode("utf-8") + data).hexdigest()
+
+
+def _colors(palette, n):
+    return sns.color_palette(palette, n) if palette else None
+
+
+def _draw(spec, series):
+    with sns.axes_style(STYLE):
+        fig = Figure(figsize=spec["figsize"])
+        ax = fig.subplots()
+        labels = [str(i) for i in series.index]
+        if spec["kind"] == "bar":
+            ax.bar(labels, series.values, color=_colors(spec["palette"], len(series)))
+            ax.set_xlabel(spec["xlabel"])
+            ax.set_ylabel(spec["ylabel"])
+            if spec["rotation"]:
+                ax.tick_params(axis="x", labelrotation=spec["rotation"])
+        elif spec["kind"] == "bands":
+            ax.vlines(labels, series["p10"], series["p90"], color="grey", label="P10 - P90")
+            ax.bar(labels, series["p75"] - series["p25"], bottom=series["p25"],
+                   color=sns.color_palette(spec["palette"])[0], label="P25 - P75")
+            ax.scatter(labels, series["p50"], marker="_", s=400, color="black", label="Median")
+            ax.set_xlabel(spec["xlabel"])
+            ax.set_ylabel(spec["ylabel"])
+            ax.legend()
+            if spec["rotation"]:
+                ax.tick_params(axis="x", labelrotation=spec["rotation"])
+        else:
+            ax.pie(series.values, labels=labels, autopct="%1.1f%%", startangle=spec["startangle"],
+                   colors=_colors(spec["palette"], len(series)))
+            ax.axis("equal")
+        ax.set_title(spec["title"])
+        buf = io.BytesIO()
+        fig.savefig(buf, format=spec["format"], dpi=DPI, bbox_inches="tight")
+        return buf.getvalue()
+
+
+def render(spec, series):
+    """Image bytes for spec (see bar_chart / pie_chart / band_chart) drawn from series; cached"""
+    if spec["format"] not in FORMATS:
+        raise ValueError(f"Unsupported chart format: {spec['format']}")
+    return _cache.get_or_render(_key(spec, series), lambda: _draw(spec, series))
+
+
+def bar_chart(series, title, xlabel="", ylabel="", figsize=(8, 5), palette="pastel", rotation=45, format="png"):
+    spec = {"kind": "bar", "title": title, "xlabel": xlabel, "ylabel": ylabel, "figsize": tuple(figsize),
+            "palette": palette, "rotation": rotation, "format": format}
+    return render(spec, series)
+
+
+def pie_chart(series, title, figsize=(6, 6), palette="pastel", startangle=90, format="png"):
+    spec = {"kind": "pie", "title": title, "figsize": tuple(figsize), "palette": palette,
+            "startangle": startangle, "format": format}
+    return render(spec, series)
+
+
+def band_chart(bands, title, xlabel="", ylabel="", figsize=(8, 5), palette="pastel", rotation=45, format="png"):
+    """bands: salary_quantiles_db() frame; P10-P90 whisker, P25-P75 box and median per row"""
+    spec = {"kind": "bands", "title": title, "xlabel": xlabel, "ylabel": ylabel, "figsize": tuple(figsize),
+            "palette": palette, "rotation": rotation, "format": format}
+    return render(spec, bands[["p10", "p25", "p50", "p75", "p90"]])
+
+
+def cache_stats():
+    return _cache.stats()
+
+
+def clear_cache():
+    _cache.clear()
@@ -0,0 +1,136 @@
+# utils/csv_import.py
+"""
+Chunked employee CSV import.
+- Reads the file in fixed-size chunks, so memory stays flat whatever the file size
+- Vectorized type / date coercion and validation per chunk
+- Valid rows of each chunk go to the database in one bulk transaction
+- Per-row rejects (CSV line number + reason) and progress callbacks
+"""
+
+import os
+
+import pandas as pd
+
+from utils import database as db
+
+TEXT_COLUMNS = ["Name", "Gender", "Department", "Role", "Skills", "Status", "Location"]
+DATE_COLUMNS = ["Join_Date", "Resign_Date"]
+CHUNK_SIZE = 5000
+MAX_REJECTS = 1000  # rejected rows kept for display; all are counted
+
+
+def _coerce_chunk(chunk: pd.DataFrame, first_line: int, seen_ids=None):
+    """
+    Return (clean employee frame, rejects frame) for one raw string chunk.
+    seen_ids: Emp_IDs accepted from earlier chunks of the same file (updated in place).
+    """
+    chunk = chunk.copy()
+    for col in db.EMPLOYEE_COLUMNS:
+        if col not in chunk.columns:
+            chunk[col] = ""
+    chunk = chunk[db.EMPLOYEE_COLUMNS]
+    for col in TEXT_COLUMNS + DATE_COLUMNS + ["Emp_ID", "Age", "Salary"]:
+        chunk[col] = chunk[col].fillna("").astype(str).str.strip()
+
+    # CSV line numbers (header is line 1)
+    line = pd.Series(range(first_line, first_line + len(chunk)), index=chunk.index)
+    reason = pd.Series("", index=chunk.index)
+
+    def reject(mask, why):
+        reason[mask & reason.eq("")] = why
+
+    reject(chunk["Name"].eq(""), "missing Name")
+
+    emp_id = pd.to_numeric(chunk["Emp_ID"], errors="coerce")
+    reject(chunk["Emp_ID"].ne("") & (emp_id.isna() | (emp_id % 1 != 0)), "bad Emp_ID")
+    age = pd.to_numeric(chunk["Age"], errors="coerce")
+    reject(chunk["Age"].ne("") & age.isna(), "bad Age")
+    salary = pd.to_numeric(chunk["Salary"], errors="coerce")
+    reject(chunk["Salary"].ne("") & salary.isna(), "bad Salary")
+
+    dates = {}
+    for col in DATE_COLUMNS:
+        dates[col] = db.parse_dates(chunk[col])
+        reject(chunk[col].ne("") & dates[col].isna(), f"bad {col}")
+
+    # duplicate ids, among rows still valid only: inside the chunk, in an earlier chunk
+    # of the file, or already in the database
+    seen_ids = set() if seen_ids is None else seen_ids
+    valid_id = emp_id.notna() & reason.eq("")
+    repeated = emp_id[valid_id].duplicated(keep="first") | emp_id[valid_id].isin(seen_ids)
+    reject(repeated.reindex(chunk.index, fill_value=False), "duplicate Emp_ID")
+    ids = emp_id[valid_id & reason.eq("")].astype("int64").tolist()
+    if ids:
+        existing = db.existing_employee_ids(ids)
+        reject(emp_id.isin(existing), "Emp_ID already exists")
+
+    ok = reason.eq("")
+    clean = chunk[ok].copy()
+    clean["Emp_ID"] = emp_id[ok].astype("Int64")
+    seen_ids.update(clean["Emp_ID"].dropna().astype("int64").tolist())
+    clean["Age"] = age[ok].round().astype("Int64")
+    clean["Salary"] = salary[ok].astype("float64")
+    for col in DATE_COLUMNS:
+        clean[col] = dates[col][ok].dt.strftime("%Y-%m-%d").fillna("")
+    blank_status = clean["Status"].eq("")
+    clean.loc[blank_status, "Status"] = clean.loc[blank_status, "Resign_Date"].ne("").map(
+        {True: "Resigned", False: "Active"})
+
+    rejects = chunk[~ok].assign(line=line[~ok], reason=reason[~ok])
+    return clean, rejects[["line", "reason"] + db.EMPLOYEE_COLUMNS]
+
+
+def import_employees_csv(source, chunksize=CHUNK_SIZE, on_progress=None, max_rejects=MAX_REJECTS):
+    """
+    Import employees from a CSV path or file-like object.
+    on_progress(rows_read, fraction) is called after every chunk; fraction is rows
+    read over the file's line count, None when the source cannot be scanned first.
+    Returns {"read", "imported", "rejected", "rejects": DataFrame of the first max_rejects}.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as fh:
+            return _import_stream(fh, chunksize, on_progress, max_rejects)
+    return _import_stream(source, chunksize, on_progress, max_rejects)
+
+
+def _count_rows(source, block_size=1 << 20):
+    """
+    Data rows in a seekable binary / text source (lines after the header), read in
+    blocks and rewound; None if it cannot be rewound. Quoted newlines overcount.
+    """
+    try:
+        start = source.tell()
+        lines, last = 0, None
+        for block in iter(lambda: source.read(block_size), b"" if isinstance(source.read(0), bytes) else ""):
+            lines += block.count(b"\n" if isinstance(block, bytes) else "\n")
+            last = block[-1:]
+        source.seek(start)
+    except (AttributeError, OSError, ValueError):
+        return None
+    if last not in (None, b"\n", "\n"):
+        lines += 1  # no newline after the last row
+    return max(lines - 1, 0)
+
+
+def _import_stream(source, chunksize, on_progress, max_rejects):
+    result = {"read": 0, "imported": 0, "rejected": 0}
+    kept_rejects = []
+    kept = 0
+    seen_ids = set()
+    total_rows = _count_rows(source) if on_progress is not None else None
+    reader = pd.read_csv(source, chunksize=chunksize, dtype=str, keep_default_na=False)
+    for chunk in reader:
+        clean, rejects = _coerce_chunk(chunk, first_line=result["read"] + 2, seen_ids=seen_ids)
+        result["read"] += len(chunk)
+        result["imported"] += db.add_employees(clean) if not clean.empty else 0
+        result["rejected"] += len(rejects)
+        if kept < max_rejects and not rejects.empty:
+            kept_rejects.append(rejects.head(max_rejects - kept))
+            kept += len(kept_rejects[-1])
+        if on_progress is not None:
+            fraction = min(result["read"] / total_rows, 1.0) if total_rows else None
+            on_progress(result["read"], fraction)
+
+    result["rejects"] = (pd.concat(kept_rejects, ignore_index=True) if kept_rejects
+                         else pd.DataFrame(columns=["line", "reason"] + db.EMPLOYEE_COLUMNS))
+    return result
@@ -1,21 +1,999 @@
-# pages/dashboard.py
+# utils/database.py
 """
-Professional Workforce Dashboard
-- Role-based access (Admin, Manager, Employee)
-- Employee Management
-- Task Management
-- Mood Tracker
-- Feedback System
-- Analytics / Summary
+Workforce data layer + legacy single-page dashboard
+- SQLite CRUD for employees, users, tasks, mood logs and feedback
+- All access goes through the pooled WAL connections in utils.db_pool
+- Reads are served from a process-wide cache until a write touches the table
+- show(): original all-in-one dashboard page
 """
 
+import re
+import hashlib
+import datetime
+import threading
+import itertools
+from contextlib import contextmanager
+
 import streamlit as st
+import numpy as np
 import pandas as pd
-import datetime
 
+from utils import db_pool
+from utils.db_pool import get_connection, transaction
+from utils.query_cache import VersionedCache
+from utils import migrations
+from utils.skills import write_skills, rebuild as _rebuild_skills
+from utils import kpis, salary_stats
 from utils.auth import require_login, show_role_badge, logout_user
 from utils import database as db
 
+EMPLOYEE_COLUMNS = [
+    "Emp_ID", "Name", "Age", "Gender", "Department", "Role",
+    "Skills", "Join_Date", "Resign_Date", "Status", "Salary", "Location"
+]
+TASK_COLUMNS = ["task_name", "emp_id", "assigned_by", "due_date", "priority", "status", "remarks", "created_date"]
+MOOD_COLUMNS = ["emp_id", "mood", "remarks", "log_date"]
+FEEDBACK_COLUMNS = ["sender_id", "receiver_id", "message", "rating", "log_date"]
+
+# Selectable columns per table (whitelist for projection / filters / ordering)
+TABLE_COLUMNS = {
+    "employees": EMPLOYEE_COLUMNS,
+    "tasks": ["task_id"] + TASK_COLUMNS,
+    "mood_logs": ["mood_id"] + MOOD_COLUMNS,
+    "feedback": ["feedback_id"] + FEEDBACK_COLUMNS,
+}
+TABLE_KEYS = {"employees": "Emp_ID", "tasks": "task_id", "mood_logs": "mood_id", "feedback": "feedback_id"}
+_OPERATORS = {"=", "!=", "<", "<=", ">", ">=", "LIKE"}
+# Filters answered by a related table: where={"Skill": "Python"} -> employees having that skill
+RELATED_FILTERS = {
+    ("employees", "Skill"): "Emp_ID IN (SELECT emp_id FROM employee_skills WHERE skill IN ({}))",
+}
+BULK_BATCH_SIZE = 5000
+STREAM_CHUNK_SIZE = 1000  # rows per chunk read by iter_rows()
+
+# In-memory employee frame returned by fetch_employees() (compact=True):
+#   Emp_ID                                      int32
+#   Age                                         Int32 (nullable)
+#   Gender, Department, Role, Status, Location  category
+#   Salary                                      float32
+#   Join_Date, Resign_Date                      datetime64, NaT when blank / unparseable
+#   Name, Skills                                object (free text)
+EMPLOYEE_DTYPES = {
+    "Emp_ID": "int32",
+    "Age": "Int32",
+    "Gender": "category",
+    "Department": "category",
+    "Role": "category",
+    "Status": "category",
+    "Location": "category",
+    "Salary": "float32",
+    "Join_Date": "datetime64[ns]",
+    "Resign_Date": "datetime64[ns]",
+}
+
+# --------------------------
+# Shared read cache
+# --------------------------
+_cache = VersionedCache(max_entries=128)
+_external = {"data_version": None, "generation": 0}
+_external_lock = threading.Lock()
+_local = threading.local()  # tables written by the current thread's open transaction
+
+def _sync_external_writes():
+    """
+    Invalidate the cache if another process committed to the db file.
+    data_version also moves on our own commits, so it only counts as external
+    when no in-process write was recorded since the previous check.
+    """
+    version = db_pool.get_pool().data_version()
+    with _external_lock:
+        seen = _external["data_version"]
+        if seen is not None and version != seen and _cache.generation == _external["generation"]:
+            _cache.bump_all()
+        _external["data_version"] = version
+        _external["generation"] = _cache.generation
+
+def _cached(tables, key, loader):
+    """Serve a query from the shared cache; callers get their own copy to mutate"""
+    _sync_external_writes()
+    result = _cache.get_or_load(tables, key, loader)
+    return result.copy() if hasattr(result, "copy") else result
+
+@contextmanager
+def _writing(*tables):
+    """
+    transaction() that invalidates cached reads of `tables` once it commits.
+    Nested calls join the outer transaction and defer their bump to its commit.
+    """
+    pending = getattr(_local, "tables", None)
+    if pending is not None:
+        pending.update(tables)
+        with transaction() as conn:
+            yield conn
+        return
+    _local.tables = set(tables)
+    try:
+        with transaction() as conn:
+            yield conn
+        written = _local.tables
+    finally:
+        _local.tables = None
+    _cache.bump(*written)
+
+def table_version(table):
+    """Write version of a table in the shared cache (moves on every committed write)"""
+    _sync_external_writes()
+    return _cache.version(table)
+
+def table_data_version(table):
+    """
+    Persistent write counter of a table (data_versions, trigger-maintained): unlike
+    table_version() it survives restarts and counts other processes' writes.
+    """
+    sql = "SELECT version FROM data_versions WHERE name = ?"
+    rows = _cached((table,), (sql, table), lambda: get_connection().execute(sql, (table,)).fetchall())
+    return rows[0][0] if rows else None
+
+def cache_stats():
+    """Hit / miss counters and per-table write versions of the shared read cache"""
+    return _cache.stats()
+
+def clear_cache():
+    _cache.clear()
+
+# --------------------------
+# Schema
+# --------------------------
+def create_tables():
+    """Create / upgrade all application tables (see utils.migrations)"""
+    if migrations.migrate():
+        _cache.bump_all()
+
+# Older scripts call these names
+initialize_all_tables = create_tables
+initialize_database = create_tables
+initialize_user_table = create_tables
+
+def _now():
+    return datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+def _clean(value):
+    """numpy scalars -> Python, NaN / NaT -> NULL, Timestamps -> ISO text (sqlite3 cannot bind them)"""
+    if value is pd.NaT:
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.strftime("%Y-%m-%d" if value == value.normalize() else "%Y-%m-%d %H:%M:%S")
+    if hasattr(value, "item"):
+        value = value.item()
+    if isinstance(value, float) and value != value:
+        return None
+    return value
+
+def _read_df(sql, params=()):
+    return pd.read_sql_query(sql, get_connection(), params=params)
+
+def parse_dates(col: pd.Series) -> pd.Series:
+    """Stored date text -> datetime64: ISO on the fast path, other formats only for rows that need it"""
+    dates = pd.to_datetime(col, errors="coerce", format="%Y-%m-%d")
+    retry = dates.isna() & col.notna() & col.astype(str).str.strip().ne("")
+    if retry.any():
+        dates[retry] = pd.to_datetime(col[retry].astype(str), errors="coerce", format="mixed")
+    return dates
+
+def compact_employees(df: pd.DataFrame) -> pd.DataFrame:
+    """Apply EMPLOYEE_DTYPES to whichever employee columns df has (in place; returns df)"""
+    for col, dtype in EMPLOYEE_DTYPES.items():
+        if col not in df.columns:
+            continue
+        if dtype.startswith("datetime"):
+            df[col] = parse_dates(df[col])
+        elif dtype == "int32" and df[col].isna().any():
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype("Int32")
+        elif dtype in ("int32", "Int32", "float32"):
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype(dtype)
+        else:
+            df[col] = df[col].astype(dtype)
+    return df
+
+def _check_column(table, col):
+    if col not in TABLE_COLUMNS[table]:
+        raise ValueError(f"Unknown column for {table}: {col}")
+    return col
+
+def _where_clause(table, where, extra=None):
+    """
+    Build a parameterized WHERE from a dict:
+      {"Department": "IT"}             -> Department = ?
+      {"Status": ["Active", "NA"]}     -> Status IN (?, ?)
+      {"due_date": ("<", "2024-01-01")} -> due_date < ?
+      {"Skill": "Python"}              -> RELATED_FILTERS subquery
+    None / "All" values are skipped so page filters can be passed straight through.
+    extra: list of (sql, params) conditions ANDed on (search, cursors, ...).
+    """
+    parts, params = [], []
+    for col, value in (where or {}).items():
+        related = RELATED_FILTERS.get((table, col))
+        if related is None:
+            _check_column(table, col)
+        if value is None or (isinstance(value, str) and value == "All"):
+            continue
+        if related is not None:
+            values = [_clean(v) for v in value] if isinstance(value, (list, set, frozenset)) else [_clean(value)]
+            parts.append(related.format(", ".join("?" * len(values))) if values else "0")
+            params.extend(values)
+            continue
+        if isinstance(value, tuple) and len(value) == 2 and value[0] in _OPERATORS:
+            parts.append(f"{col} {value[0]} ?")
+            params.append(_clean(value[1]))
+        elif isinstance(value, (list, set, frozenset)):
+            values = [_clean(v) for v in value]
+            if not values:
+                parts.append("0")
+                continue
+            parts.append(f"{col} IN ({', '.join('?' * len(values))})")
+            params.extend(values)
+        else:
+            parts.append(f"{col} = ?")
+            params.append(_clean(value))
+    for sql, values in extra or []:
+        parts.append(f"({sql})")
+        params.extend(values)
+    return (" WHERE " + " AND ".join(parts)) if parts else "", params
+
+def _order_clause(table, order_by):
+    """order_by: "col", "col DESC" or a list of those"""
+    if not order_by:
+        return f" ORDER BY {TABLE_KEYS[table]}"
+    items = [order_by] if isinstance(order_by, str) else list(order_by)
+    terms = []
+    for item in items:
+        col, _, direction = item.strip().partition(" ")
+        direction = direction.strip().upper() or "ASC"
+        if direction not in ("ASC", "DESC"):
+            raise ValueError(f"Bad sort direction: {item}")
+        terms.append(f"{_check_column(table, col)} {direction}")
+    return " ORDER BY " + ", ".join(terms)
+
+def _select(table, columns=None, where=None, order_by=None, limit=None, offset=None, convert=None):
+    """
+    SELECT with projection, predicate, ordering and limit pushed down to SQLite.
+    convert(frame) post-processes the result once, before it is cached.
+    """
+    cols = [_check_column(table, c) for c in columns] if columns else TABLE_COLUMNS[table]
+    where_sql, params = _where_clause(table, where)
+    sql = f"SELECT {', '.join(cols)} FROM {table}{where_sql}{_order_clause(table, order_by)}"
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(int(limit))
+        if offset:
+            sql += " OFFSET ?"
+            params.append(int(offset))
+    if convert is None:
+        return _cached(table, (sql, tuple(params)), lambda: _read_df(sql, params))
+    return _cached(table, (sql, tuple(params), convert.__name__), lambda: convert(_read_df(sql, params)))
+
+def iter_rows(table, columns=None, where=None, chunk_size=None, search=None):
+    """
+    Yield the matching rows as DataFrames of at most chunk_size rows, in key order.
+    Keyset-paged and not cached, so a consumer holds one chunk at a time (exports).
+    search: employees only, the same text search as fetch_employee_page.
+    """
+    chunk_size = int(chunk_size or STREAM_CHUNK_SIZE)
+    key = TABLE_KEYS[table]
+    cols = [_check_column(table, c) for c in columns] if columns else list(TABLE_COLUMNS[table])
+    select = cols if key in cols else cols + [key]
+    matching = _employee_search(search) if table == "employees" else []
+    last = None
+    while True:
+        extra = matching + ([(f"{key} > ?", [last])] if last is not None else [])
+        where_sql, params = _where_clause(table, where, extra=extra)
+        sql = f"SELECT {', '.join(select)} FROM {table}{where_sql} ORDER BY {key} LIMIT ?"
+        chunk = _read_df(sql, params + [chunk_size])
+        if chunk.empty:
+            return
+        last = int(chunk[key].iloc[-1])
+        yield chunk[cols]
+        if len(chunk) < chunk_size:
+            return
+
+def fetch_distinct(column, table="employees", where=None):
+    """Sorted distinct non-null values of a column (for filter dropdowns)"""
+    _check_column(table, column)
+    where_sql, params = _where_clause(table, where, extra=[(f"{column} IS NOT NULL", [])])
+    sql = f"SELECT DISTINCT {column} FROM {table}{where_sql} ORDER BY {column}"
+    return _cached(table, (sql, tuple(params)),
+                   lambda: [r[0] for r in get_connection().execute(sql, params).fetchall()])
+
+_AGGREGATES = {"count": "COUNT({})", "sum": "SUM({})", "avg": "AVG({})", "min": "MIN({})", "max": "MAX({})"}
+
+def aggregate(table, metrics, group_by=None, where=None, extra=None):
+    """
+    GROUP BY query computed in SQLite:
+      aggregate("employees", {"headcount": ("count", None), "avg_salary": ("avg", "Salary")},
+                group_by="Department", where={"Status": "Active"})
+    metrics: {output name: (count|sum|avg|min|max, column or None for *)}.
+    group_by: column or list of columns (returned first, sorted). extra: as in _where_clause.
+    """
+    groups = [group_by] if isinstance(group_by, str) else list(group_by or [])
+    terms = [_check_column(table, g) for g in groups]
+    for name, (func, col) in metrics.items():
+        if func not in _AGGREGATES or not name.isidentifier():
+            raise ValueError(f"Bad aggregate: {name}={func}")
+        terms.append(f"{_AGGREGATES[func].format(_check_column(table, col) if col else '*')} AS {name}")
+    where_sql, params = _where_clause(table, where, extra=extra)
+    sql = f"SELECT {', '.join(terms)} FROM {table}{where_sql}"
+    if groups:
+        sql += f" GROUP BY {', '.join(groups)} ORDER BY {', '.join(groups)}"
+    return _cached(table, (sql, tuple(params)), lambda: _read_df(sql, params))
+
+def _bulk_insert(table, columns, records, batch_size=None, defaults=None):
+    """
+    executemany() INSERT of a DataFrame or iterable of dicts in a single transaction.
+    Each record inserts the columns it has (dicts may differ; absent keys get the column's
+    SQL default); `defaults` fills columns the caller did not provide. Returns rows inserted.
+    """
+    batch_size = int(batch_size or BULK_BATCH_SIZE)
+    defaults = defaults or {}
+    if isinstance(records, pd.DataFrame):
+        if records.empty:
+            return 0
+        cols = [c for c in columns if c in records.columns]
+        frame = records[cols].astype(object)
+        frame = frame.where(frame.notna(), None)
+        extra = [c for c in defaults if c not in cols]
+        extra_vals = tuple(defaults[c] for c in extra)
+        cols = tuple(cols + extra)
+        rows = ((cols, tuple(_clean(v) for v in row) + extra_vals)
+                for row in frame.itertuples(index=False, name=None))
+    else:
+        def keyed(r):
+            cols = tuple(c for c in columns if c in r or c in defaults)
+            return cols, tuple(_clean(r.get(c, defaults.get(c))) for c in cols)
+        rows = (keyed(r) for r in records)
+
+    inserted = 0
+    with _writing(table) as conn:
+        while True:
+            batch = list(itertools.islice(rows, batch_size))
+            if not batch:
+                break
+            # one executemany per run of records with the same columns (keeps insert order)
+            for cols, run in itertools.groupby(batch, key=lambda item: item[0]):
+                sql = f"INSERT INTO {table} ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))})"
+                conn.executemany(sql, [values for _, values in run])
+            inserted += len(batch)
+    return inserted
+
+def _set_clause(updates, allowed):
+    """Build 'col=?, col=?' from a dict, keeping only whitelisted columns"""
+    cols = [c for c in updates if c in allowed]
+    return ", ".join(f"{c}=?" for c in cols), [_clean(updates[c]) for c in cols]
+
+# --------------------------
+# Users
+# --------------------------
+def hash_password(password):
+    """Hash password using SHA-256"""
+    return hashlib.sha256(password.encode()).hexdigest()
+
+def get_user_by_username(username):
+    row = get_connection().execute(
+        "SELECT id, username, password, role FROM users WHERE username=?", (username,)
+    ).fetchone()
+    if not row:
+        return None
+    return dict(zip(["id", "username", "password", "role"], row))
+
+def add_user(username, password, role):
+    """Add a user; password is given in plain text and stored hashed"""
+    with _writing("users") as conn:
+        conn.execute(
+            "INSERT INTO users (username, password, role) VALUES (?, ?, ?)",
+            (username, hash_password(password), role)
+        )
+
+# --------------------------
+# Employees
+# --------------------------
+def fetch_employees(columns=None, where=None, order_by=None, limit=None, offset=None, compact=True):
+    """
+    Employees as a DataFrame. Only the requested columns / matching rows leave SQLite:
+      fetch_employees(columns=["Emp_ID", "Name"], where={"Department": "IT"}, order_by="Name", limit=50)
+    compact=True types the columns per EMPLOYEE_DTYPES (categories, int32, float32,
+    datetime64 dates); compact=False returns them as stored.
+    """
+    return _select("employees", columns, where, order_by, limit, offset,
+                   convert=compact_employees if compact else None)
+
+def add_employee(emp):
+    """Insert one employee dict; Emp_ID is assigned by SQLite when missing"""
+    cols = [c for c in EMPLOYEE_COLUMNS if c in emp and not (c == "Emp_ID" and pd.isna(emp[c]))]
+    sql = f"INSERT INTO employees ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))})"
+    with _writing("employees", "employee_skills") as conn:
+        cur = conn.execute(sql, [_clean(emp[c]) for c in cols])
+        write_skills(conn, [(cur.lastrowid, emp.get("Skills"))])
+    return cur.lastrowid
+
+EMPLOYEE_SEARCH_COLUMNS = ["Name", "Emp_ID", "Skills", "Role"]
+
+def _employee_search(search):
+    """Search condition over Name / Emp_ID / Skills / Role (FTS5 when available, else LIKE)"""
+    if not search:
+        return []
+    query = _fts_query(search)
+    if query and _has_fts("employees_fts"):
+        return [("Emp_ID IN (SELECT rowid FROM employees_fts WHERE employees_fts MATCH ?)", [query])]
+    term = f"%{search}%"
+    sql = " OR ".join(f"CAST({c} AS TEXT) LIKE ?" for c in EMPLOYEE_SEARCH_COLUMNS)
+    return [(sql, [term] * len(EMPLOYEE_SEARCH_COLUMNS))]
+
+def count_employees(where=None, search=None):
+    """COUNT(*) with the same filters as fetch_employee_page (index-assisted)"""
+    where_sql, params = _where_clause("employees", where, extra=_employee_search(search))
+    sql = f"SELECT COUNT(*) FROM employees{where_sql}"
+    return _cached("employees", (sql, tuple(params)),
+                   lambda: get_connection().execute(sql, params).fetchone()[0])
+
+def aggregate_employees(metrics, group_by=None, where=None, search=None):
+    """aggregate() over employees with the same where / search filters as the record pages"""
+    return aggregate("employees", metrics, group_by, where, extra=_employee_search(search))
+
+def employee_kpis(group_by=None, where=None):
+    """
+    headcount / salary_sum / salary_count per group, read from the trigger-maintained
+    agg_department table (a few rows, no employees scan).
+    group_by / where may only use Department, Status, Gender (values, lists or
+    (op, value) filters as in _where_clause); returns None otherwise so callers can
+    fall back to aggregate_employees().
+    """
+    groups = [group_by] if isinstance(group_by, str) else list(group_by or [])
+    keys = {v: k for k, v in kpis.SOURCE.items()}  # employee column -> KPI column
+    if any(g not in keys for g in groups) or any(c not in keys for c in (where or {})):
+        return None
+    parts, params = [], []
+    for col, value in (where or {}).items():
+        if value is None or (isinstance(value, str) and value == "All"):
+            continue
+        if isinstance(value, tuple) and len(value) == 2 and value[0] in _OPERATORS:
+            parts.append(f"{keys[col]} {value[0]} ?")  # NULL groups stay NULL, as in employees
+            params.append(_clean(value[1]))
+            continue
+        values = list(value) if isinstance(value, (list, set, frozenset)) else [value]
+        parts.append(f"{keys[col]} IN ({', '.join('?' * len(values))})" if values else "0")
+        params.extend(_clean(v) for v in values)
+    cols = [f"{keys[g]} AS {g}" for g in groups]
+    sql = (f"SELECT {', '.join(cols + ['SUM(headcount) AS headcount', 'SUM(salary_sum) AS salary_sum', 'SUM(salary_count) AS salary_count'])} "
+           f"FROM agg_department{' WHERE ' + ' AND '.join(parts) if parts else ''}")
+    if groups:
+        sql += f" GROUP BY {', '.join(keys[g] for g in groups)} ORDER BY {', '.join(keys[g] for g in groups)}"
+    frame = _cached(("employees", "agg_department"), (sql, tuple(params)), lambda: _read_df(sql, params))
+    return frame[frame["headcount"].fillna(0) > 0].reset_index(drop=True) if groups else frame.fillna(0)
+
+def rebuild_kpis():
+    """Recompute agg_department from employees; returns the number of drifted groups fixed"""
+    with _writing("employees", "agg_department") as conn:
+        return kpis.rebuild(conn)
+
+def salary_histogram(by=None, where=None):
+    """
+    Merged salary histogram from the trigger-maintained salary_bins table:
+    columns [by,] bin, n with by None or one of salary_stats.DIMENSIONS.
+    where may filter Status and at most one dimension (the by column when given) by
+    value or list of values; returns None otherwise (other columns, (op, value) filters) so callers can fall back to the Salary column.
+    """
+    if by is not None and by not in salary_stats.DIMENSIONS:
+        return None
+    dims = {}
+    statuses = None
+    for col, value in (where or {}).items():
+        if value is None or (isinstance(value, str) and value == "All"):
+            continue
+        if isinstance(value, tuple):
+            return None  # operator filters ("!=", "LIKE", ...) need the Salary column
+        values = list(value) if isinstance(value, (list, set, frozenset)) else [value]
+        if col == "Status":
+            statuses = values
+        elif col in salary_stats.DIMENSIONS:
+            dims[col] = values
+        else:
+            return None
+    if len(dims) > 1 or (by is not None and dims and by not in dims):
+        return None
+    dimension = by or next(iter(dims), salary_stats.DIMENSIONS[0])  # no dimension: merge all of one
+    parts, params = ["dimension = ?"], [dimension]
+    for values, col in ((dims.get(dimension), "value"), (statuses, "status")):
+        if values is not None:
+            parts.append(f"{col} IN ({', '.join('?' * len(values))})" if values else "0")
+            params.extend(_clean(v) for v in values)
+    group = ["value", "bin"] if by else ["bin"]
+    select = ([f"NULLIF(value, '') AS {by}"] if by else []) + ["bin", "SUM(n) AS n"]
+    sql = (f"SELECT {', '.join(select)} FROM salary_bins WHERE {' AND '.join(parts)} "
+           f"GROUP BY {', '.join(group)} ORDER BY {', '.join(group)}")
+    return _cached(("employees", "salary_bins"), (sql, tuple(params)), lambda: _read_df(sql, params))
+
+def rebuild_salary_stats():
+    """Recompute salary_bins from employees; returns the number of drifted bins fixed"""
+    with _writing("employees", "salary_bins") as conn:
+        return salary_stats.rebuild(conn)
+
+def _keyset_condition(sort_by, descending, cursor):
+    """
+    Rows strictly after cursor=(last sort value, last Emp_ID) in
+    ORDER BY sort_by, Emp_ID (both ASC or both DESC). SQLite sorts NULL lowest.
+    """
+    value, last_id = cursor
+    if not descending:
+        if value is None:
+            return (f"({sort_by} IS NULL AND Emp_ID > ?) OR {sort_by} IS NOT NULL", [last_id])
+        return (f"{sort_by} > ? OR ({sort_by} = ? AND Emp_ID > ?)", [value, value, last_id])
+    if value is None:
+        return (f"{sort_by} IS NULL AND Emp_ID < ?", [last_id])
+    return (f"{sort_by} < ? OR ({sort_by} = ? AND Emp_ID < ?) OR {sort_by} IS NULL", [value, value, last_id])
+
+def fetch_employee_page(where=None, search=None, sort_by="Emp_ID", descending=False,
+                        page_size=50, cursor=None, columns=None):
+    """
+    One page of employees using keyset (seek) pagination.
+    cursor is None for the first page, else the next_cursor returned for the previous page.
+    Returns (page DataFrame, next_cursor or None when this is the last page).
+    """
+    _check_column("employees", sort_by)
+    cols = [_check_column("employees", c) for c in columns] if columns else list(EMPLOYEE_COLUMNS)
+    for c in (sort_by, "Emp_ID"):
+        if c not in cols:
+            cols.append(c)
+    extra = _employee_search(search)
+    if cursor is not None:
+        extra.append(_keyset_condition(sort_by, descending, cursor))
+    where_sql, params = _where_clause("employees", where, extra=extra)
+    direction = "DESC" if descending else "ASC"
+    order = f"Emp_ID {direction}" if sort_by == "Emp_ID" else f"{sort_by} {direction}, Emp_ID {direction}"
+    sql = f"SELECT {', '.join(cols)} FROM employees{where_sql} ORDER BY {order} LIMIT ?"
+    params.append(int(page_size) + 1)  # one extra row tells us whether a next page exists
+    page = _cached("employees", (sql, tuple(params)), lambda: _read_df(sql, params))
+    if len(page) <= page_size:
+        return page.reset_index(drop=True), None
+    page = page.iloc[:page_size].reset_index(drop=True)
+    last = page.iloc[-1]
+    return page, (_clean(last[sort_by]), int(last["Emp_ID"]))
+
+class EmployeeIndex:
+    """
+    Emp_ID -> row lookup over the compact employee frame, built once per employees
+    write version (see employee_index()). Ids map to row positions through a dense
+    array when they are reasonably packed, else through a hashed pd.Index.
+    """
+    def __init__(self, frame):
+        self.frame = frame.reset_index(drop=True)
+        ids = self.frame["Emp_ID"].to_numpy(dtype="int64")
+        self._dense = None
+        self._index = None
+        self._values = {}  # column -> object array, filled on first lookup
+        if len(ids) and ids.min() >= 0 and ids.max() < 4 * len(ids) + 1024:
+            self._dense = np.full(ids.max() + 1, -1, dtype="int64")
+            self._dense[ids] = np.arange(len(ids))
+        else:
+            self._index = pd.Index(ids)
+
+    def __len__(self):
+        return len(self.frame)
+
+    def __contains__(self, emp_id):
+        return self.positions([emp_id])[0] >= 0
+
+    def positions(self, ids):
+        """Row positions for ids (array-like), -1 where unknown / missing"""
+        ids = ids if isinstance(ids, pd.Series) else pd.Series(list(ids), dtype=object)
+        if ids.dtype.kind in "iu" and not ids.hasnans:
+            ids = ids.to_numpy(dtype="int64")
+        else:  # NaN never matches
+            ids = pd.to_numeric(ids, errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+        if self._index is not None:
+            return self._index.get_indexer(ids)
+        out = np.full(len(ids), -1, dtype="int64")
+        ok = (ids >= 0) & (ids < len(self._dense))
+        out[ok] = self._dense[ids[ok].astype("int64")]
+        return out
+
+    def lookup(self, ids, column="Name"):
+        """Values of one employee column for ids (Series aligned with ids; NaN where unknown)"""
+        index = ids.index if isinstance(ids, pd.Series) else None
+        pos = self.positions(ids)
+        if column not in self._values:
+            self._values[column] = self.frame[column].astype(object).to_numpy()
+        found = pos >= 0
+        out = np.full(len(pos), np.nan, dtype=object)
+        out[found] = self._values[column][pos[found]]
+        return pd.Series(out, index=index, dtype=object)
+
+    def names_for(self, ids):
+        """Employee names for ids; unknown ids come back as the id text"""
+        ids = ids if isinstance(ids, pd.Series) else pd.Series(list(ids), dtype=object)
+        names = self.lookup(ids)
+        missing = names.isna()
+        if missing.any():
+            names[missing] = ids[missing].astype(str)
+        return names
+
+    def row_for(self, emp_id):
+        """One employee as a dict, or None"""
+        pos = self.positions([emp_id])[0]
+        return None if pos < 0 else self.frame.iloc[pos].to_dict()
+
+
+def employee_index():
+    """Shared EmployeeIndex for the current employees data (rebuilt after writes)"""
+    return _cached("employees", ("employee_index",), lambda: EmployeeIndex(fetch_employees()))
+
+def names_for(ids):
+    """Vectorized Emp_ID -> Name (unknown ids as text), e.g. tasks["emp_id"] -> names"""
+    return employee_index().names_for(ids)
+
+def row_for(emp_id):
+    """Employee dict for one Emp_ID, or None"""
+    return employee_index().row_for(emp_id)
+
+def existing_employee_ids(ids):
+    """Subset of ids already present (uncached primary-key probe, used by imports)"""
+    ids = [int(i) for i in ids]
+    found = set()
+    conn = get_connection()
+    for i in range(0, len(ids), 900):  # stay under SQLite's bound-parameter limit
+        part = ids[i:i + 900]
+        found.update(r[0] for r in conn.execute(
+            f"SELECT Emp_ID FROM employees WHERE Emp_ID IN ({', '.join('?' * len(part))})", part))
+    return found
+
+def add_employees(records, batch_size=None):
+    """
+    Bulk insert employees (DataFrame or iterable of dicts) in one transaction.
+    Rows without an Emp_ID are numbered after the highest id in the table and in
+    the batch (as SQLite would, but before the insert, so they cannot collide with
+    an explicit id further down the batch). Duplicate explicit ids raise ValueError.
+    """
+    frame = records.copy() if isinstance(records, pd.DataFrame) else pd.DataFrame(list(records))
+    if frame.empty:
+        return 0
+    ids = pd.to_numeric(frame["Emp_ID"], errors="coerce") if "Emp_ID" in frame else pd.Series(np.nan, index=frame.index)
+    given = ids.dropna()
+    repeated = given[given.duplicated()]
+    if not repeated.empty:
+        raise ValueError(f"Duplicate Emp_ID in batch: {sorted(set(repeated.astype('int64').tolist()))[:10]}")
+    with _writing("employees", "employee_skills") as conn:
+        top = conn.execute("SELECT COALESCE(MAX(Emp_ID), 0) FROM employees").fetchone()[0]
+        missing = ids.isna()
+        start = max(top, int(given.max()) if not given.empty else 0) + 1
+        ids[missing] = range(start, start + int(missing.sum()))
+        frame["Emp_ID"] = ids.astype("int64")
+        inserted = _bulk_insert("employees", EMPLOYEE_COLUMNS, frame, batch_size)
+        if "Skills" in frame:
+            with_skills = frame.loc[frame["Skills"].notna(), ["Emp_ID", "Skills"]]
+            write_skills(conn, with_skills.itertuples(index=False, name=None))
+    return inserted
+
+def update_employee(emp_id, updates):
+    clause, values = _set_clause(updates, EMPLOYEE_COLUMNS[1:])
+    if not clause:
+        return
+    with _writing("employees", "employee_skills") as conn:
+        conn.execute(f"UPDATE employees SET {clause} WHERE Emp_ID=?", values + [int(emp_id)])
+        if "Skills" in updates:
+            write_skills(conn, [(emp_id, updates["Skills"])])
+
+def delete_employee(emp_id):
+    # employee_skills rows go with it (employee_skills_ad trigger)
+    with _writing("employees", "employee_skills") as conn:
+        conn.execute("DELETE FROM employees WHERE Emp_ID=?", (int(emp_id),))
+
+# --------------------------
+# Skills (employee_skills index, see utils.skills)
+# --------------------------
+def fetch_skills():
+    """Distinct canonical skill names (for filter dropdowns)"""
+    sql = "SELECT DISTINCT skill FROM employee_skills ORDER BY skill"
+    return _cached("employee_skills", sql, lambda: [r[0] for r in get_connection().execute(sql)])
+
+def skill_counts(where=None, by=None):
+    """
+    Employees per skill, most common first, for employees matching `where`.
+    by: optional employee column to break counts down by (e.g. "Role").
+    Returns a DataFrame: Skill, [by], Count.
+    """
+    where_sql, params = _where_clause("employees", where)
+    group = ["s.skill"]
+    cols = "s.skill AS Skill"
+    if by:
+        _check_column("employees", by)
+        group.append(f"e.{by}")
+        cols += f", e.{by} AS {by}"
+    sql = (f"SELECT {cols}, COUNT(*) AS Count FROM employee_skills s "
+           f"JOIN (SELECT Emp_ID{', ' + by if by else ''} FROM employees{where_sql}) e "
+           f"ON e.Emp_ID = s.emp_id GROUP BY {', '.join(group)} ORDER BY Count DESC, Skill")
+    return _cached(("employees", "employee_skills"), (sql, tuple(params)), lambda: _read_df(sql, params))
+
+def skill_cuboid(dimensions, metrics):
+    """
+    aggregate() over employees joined to employee_skills, grouped by Skill + dimensions.
+    An employee appears once per skill, so filter to one Skill before summing.
+    """
+    terms = ["s.skill AS Skill"] + [f"e.{_check_column('employees', d)}" for d in dimensions]
+    for name, (func, col) in metrics.items():
+        if func not in _AGGREGATES or not name.isidentifier():
+            raise ValueError(f"Bad aggregate: {name}={func}")
+        terms.append(f"{_AGGREGATES[func].format('e.' + _check_column('employees', col) if col else '*')} AS {name}")
+    groups = ", ".join(["s.skill"] + [f"e.{d}" for d in dimensions])
+    sql = (f"SELECT {', '.join(terms)} FROM employee_skills s JOIN employees e ON e.Emp_ID = s.emp_id "
+           f"GROUP BY {groups} ORDER BY {groups}")
+    return _cached(("employees", "employee_skills"), sql, lambda: _read_df(sql))
+
+def rebuild_skill_index():
+    """Re-derive employee_skills from employees.Skills (after raw SQL writes)"""
+    with _writing("employees", "employee_skills") as conn:
+        _rebuild_skills(conn)
+
+# --------------------------
+# Tasks
+# --------------------------
+def fetch_tasks(columns=None, where=None, order_by=None, limit=None, offset=None):
+    return _select("tasks", columns, where, order_by, limit, offset)
+
+def add_task(task):
+    task = dict(task)
+    task.setdefault("status", "Pending")
+    task.setdefault("created_date", _now())
+    cols = [c for c in TASK_COLUMNS if c in task]
+    sql = f"INSERT INTO tasks ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))})"
+    with _writing("tasks") as conn:
+        cur = conn.execute(sql, [_clean(task[c]) for c in cols])
+    return cur.lastrowid
+
+def add_tasks(records, batch_size=None):
+    """Bulk insert tasks in one transaction (status / created_date default like add_task)"""
+    return _bulk_insert("tasks", TASK_COLUMNS, records, batch_size,
+                        defaults={"status": "Pending", "created_date": _now()})
+
+def update_task(task_id, updates):
+    clause, values = _set_clause(updates, TASK_COLUMNS)
+    if not clause:
+        return
+    with _writing("tasks") as conn:
+        conn.execute(f"UPDATE tasks SET {clause} WHERE task_id=?", values + [int(task_id)])
+
+def delete_task(task_id):
+    with _writing("tasks") as conn:
+        conn.execute("DELETE FROM tasks WHERE task_id=?", (int(task_id),))
+
+# --------------------------
+# Mood logs
+# --------------------------
+def fetch_mood_logs(columns=None, where=None, order_by=None, limit=None, offset=None):
+    return _select("mood_logs", columns, where, order_by, limit, offset)
+
+def add_mood_entry(emp_id, mood, remarks=""):
+    with _writing("mood_logs") as conn:
+        cur = conn.execute(
+            "INSERT INTO mood_logs (emp_id, mood, remarks, log_date) VALUES (?, ?, ?, ?)",
+            (int(emp_id), mood, remarks or "", _now())
+        )
+    return cur.lastrowid
+
+def add_mood_entries(records, batch_size=None):
+    """Bulk insert mood logs (emp_id, mood, remarks, log_date) in one transaction"""
+    return _bulk_insert("mood_logs", MOOD_COLUMNS, records, batch_size,
+                        defaults={"remarks": "", "log_date": _now()})
+
+def add_mood(emp_id, mood):
+    return add_mood_entry(emp_id, mood, "")
+
+# Mood label -> score ("😊 Happy", "Happy" and numeric strings all score)
+MOOD_SCORES = {"Happy": 5, "Neutral": 3, "Sad": 2, "Angry": 1}
+MOOD_SCORE_SQL = ("CASE " + " ".join(f"WHEN m.mood LIKE '%{k}%' THEN {v}" for k, v in MOOD_SCORES.items())
+                  + " WHEN m.mood GLOB '[0-9]*' THEN CAST(m.mood AS REAL) END")
+
+def fetch_mood(emp_id=None, department=None, after_id=None, limit=None, newest_first=False):
+    """
+    Scored mood logs: mood_id, emp_id, username (employee name), date, mood (score), mood_label.
+    after_id returns only rows logged after that mood_id (incremental readers); those reads
+    skip the query cache, since every new after_id would be a new entry.
+    """
+    parts, params = [], []
+    if emp_id is not None:
+        parts.append("m.emp_id = ?")
+        params.append(int(emp_id))
+    if department not in (None, "All"):
+        parts.append("e.Department = ?")
+        params.append(department)
+    if after_id is not None:
+        parts.append("m.mood_id > ?")
+        params.append(int(after_id))
+    sql = (f"SELECT m.mood_id, m.emp_id, e.Name AS username, m.log_date AS date, "
+           f"{MOOD_SCORE_SQL} AS mood, m.mood AS mood_label "
+           f"FROM mood_logs m LEFT JOIN employees e ON e.Emp_ID = m.emp_id"
+           f"{' WHERE ' + ' AND '.join(parts) if parts else ''} "
+           f"ORDER BY m.mood_id {'DESC' if newest_first else 'ASC'}")
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(int(limit))
+    if after_id is not None:
+        return _read_df(sql, params)
+    return _cached(("mood_logs", "employees"), (sql, tuple(params)), lambda: _read_df(sql, params))
+
+# --------------------------
+# Feedback
+# --------------------------
+def fetch_feedback(columns=None, where=None, order_by=None, limit=None, offset=None):
+    return _select("feedback", columns, where, order_by, limit, offset)
+
+def add_feedback(sender_id, receiver_id, message, rating=None):
+    with _writing("feedback") as conn:
+        cur = conn.execute(
+            "INSERT INTO feedback (sender_id, receiver_id, message, rating, log_date) VALUES (?, ?, ?, ?, ?)",
+            (_clean(sender_id), int(receiver_id), message, _clean(rating), _now())
+        )
+    return cur.lastrowid
+
+def delete_feedback(feedback_id):
+    with _writing("feedback") as conn:
+        conn.execute("DELETE FROM feedback WHERE feedback_id=?", (int(feedback_id),))
+
+# --------------------------
+# Employee profile
+# --------------------------
+PROFILE_TABLES = ("employees", "tasks", "mood_logs", "feedback")
+
+def _profile(emp_id, moods, feedback, today):
+    conn = get_connection()
+    own = not conn.in_transaction
+    if own:
+        conn.execute("BEGIN")  # one read snapshot for all parts
+    def read(sql, params):
+        return pd.read_sql_query(sql, conn, params=params)
+
+    def limit(n):
+        return "" if n is None else f" LIMIT {int(n)}"
+
+    try:
+        employee = compact_employees(read("SELECT * FROM employees WHERE Emp_ID = ?", [emp_id]))
+        tasks = read(
+            f"SELECT {', '.join(TABLE_COLUMNS['tasks'])} FROM tasks WHERE emp_id = ? "
+            "ORDER BY status = 'Completed', due_date IS NULL OR due_date = '', due_date, task_id", [emp_id])
+        mood_sql = (f"SELECT m.mood_id, m.log_date AS date, {MOOD_SCORE_SQL} AS mood, m.mood AS mood_label "
+                    f"FROM mood_logs m WHERE m.emp_id = ? ORDER BY m.mood_id DESC")
+        mood_rows = read(mood_sql + limit(moods), [emp_id])
+        feedback_cols = ", ".join(f"f.{c}" for c in TABLE_COLUMNS["feedback"])
+        received = read(
+            f"SELECT {feedback_cols}, e.Name AS Sender FROM feedback f LEFT JOIN employees e ON e.Emp_ID = f.sender_id "
+            f"WHERE f.receiver_id = ? ORDER BY f.feedback_id DESC{limit(feedback)}", [emp_id])
+        given = read(
+            f"SELECT {feedback_cols}, e.Name AS Receiver FROM feedback f LEFT JOIN employees e ON e.Emp_ID = f.receiver_id "
+            f"WHERE f.sender_id = ? ORDER BY f.feedback_id DESC{limit(feedback)}", [emp_id])
+        stats = conn.execute(f"""
+            SELECT
+                (SELECT COUNT(*) FROM tasks WHERE emp_id = :id),
+                (SELECT COUNT(*) FROM tasks WHERE emp_id = :id AND status != 'Completed'),
+                (SELECT COUNT(*) FROM tasks WHERE emp_id = :id AND status != 'Completed' AND date(due_date) < date(:today)),
+                (SELECT COUNT(*) FROM mood_logs WHERE emp_id = :id),
+                (SELECT AVG({MOOD_SCORE_SQL}) FROM mood_logs m WHERE m.emp_id = :id),
+                (SELECT AVG({MOOD_SCORE_SQL}) FROM mood_logs m WHERE m.emp_id = :id
+                    AND date(m.log_date) > date(:today, '-30 days')),
+                (SELECT COUNT(*) FROM feedback WHERE receiver_id = :id),
+                (SELECT AVG(rating) FROM feedback WHERE receiver_id = :id),
+                (SELECT COUNT(*) FROM feedback WHERE sender_id = :id)
+        """, {"id": emp_id, "today": today}).fetchone()
+    finally:
+        if own:
+            conn.execute("COMMIT")
+    names = ["tasks_total", "tasks_open", "tasks_overdue", "mood_entries", "avg_mood", "avg_mood_30d",
+             "feedback_received", "avg_rating_received", "feedback_given"]
+    return {
+        "employee": employee.iloc[0].to_dict() if not employee.empty else None,
+        "tasks": tasks,
+        "moods": mood_rows,
+        "feedback_received": received,
+        "feedback_given": given,
+        "stats": dict(zip(names, stats)),
+    }
+
+def employee_profile(emp_id, moods=30, feedback=20, today=None):
+    """
+    One employee's 360 view, read in one snapshot through the per-employee indexes
+    and cached until any of PROFILE_TABLES is written:
+      employee           row dict (compact types) or None
+      tasks              all their tasks, open ones first by due date
+      moods              last `moods` scored logs (mood_id, date, mood, mood_label)
+      feedback_received  last `feedback` rows received, with Sender name
+      feedback_given     last `feedback` rows given, with Receiver name
+      stats              tasks_total / _open / _overdue, mood_entries, avg_mood, avg_mood_30d,
+                         feedback_received, avg_rating_received, feedback_given
+    moods / feedback None return every row. Overdue compares ISO due dates with today.
+    """
+    emp_id = int(emp_id)
+    today = pd.Timestamp(today or pd.Timestamp.today()).strftime("%Y-%m-%d")
+    profile = _cached(PROFILE_TABLES, ("employee_profile", emp_id, moods, feedback, today),
+                      lambda: _profile(emp_id, moods, feedback, today))
+    return {k: v.copy() if hasattr(v, "copy") else v for k, v in profile.items()}
+
+# --------------------------
+# Full-text search
+# --------------------------
+def _fts_query(text):
+    """User text -> safe FTS5 query: every word must match as a prefix"""
+    return " ".join(f'"{t}"*' for t in re.findall(r"\w+", text or ""))
+
+def _has_fts(fts_table):
+    row = get_connection().execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (fts_table,)
+    ).fetchone()
+    return row is not None
+
+_NAME_HITS = "SELECT rowid AS emp, bm25(employees_fts) AS rank FROM employees_fts WHERE employees_fts MATCH ?"
+
+def _search_sql(entity, query, like):
+    """(sql, params) returning the entity's rows plus a rank column (lower = better)"""
+    if query is not None:  # FTS5
+        name_q = f"Name : ({query})"
+        if entity == "employees":
+            return (f"""
+                SELECT e.*, h.rank FROM (
+                    SELECT rowid AS id, bm25(employees_fts) AS rank
+                    FROM employees_fts WHERE employees_fts MATCH ?
+                ) h JOIN employees e ON e.Emp_ID = h.id
+                ORDER BY h.rank LIMIT ?""", [query])
+        if entity == "tasks":
+            return (f"""
+                WITH hits(id, rank) AS (
+                    SELECT rowid, bm25(tasks_fts) FROM tasks_fts WHERE tasks_fts MATCH ?
+                    UNION ALL
+                    SELECT t.task_id, n.rank FROM ({_NAME_HITS}) n JOIN tasks t ON t.emp_id = n.emp
+                )
+                SELECT t.*, MIN(h.rank) AS rank FROM hits h JOIN tasks t ON t.task_id = h.id
+                GROUP BY t.task_id ORDER BY rank LIMIT ?""", [query, name_q])
+        return (f"""
+            WITH names AS ({_NAME_HITS}),
+            hits(id, rank) AS (
+                SELECT rowid, bm25(feedback_fts) FROM feedback_fts WHERE feedback_fts MATCH ?
+                UNION ALL
+                SELECT f.feedback_id, n.rank FROM names n JOIN feedback f ON f.sender_id = n.emp
+                UNION ALL
+                SELECT f.feedback_id, n.rank FROM names n JOIN feedback f ON f.receiver_id = n.emp
+            )
+            SELECT f.*, MIN(h.rank) AS rank FROM hits h JOIN feedback f ON f.feedback_id = h.id
+            GROUP BY f.feedback_id ORDER BY rank LIMIT ?""", [name_q, query])
+
+    # LIKE fallback (SQLite without FTS5)
+    by_name = "(SELECT Emp_ID FROM employees WHERE Name LIKE ?)"
+    if entity == "employees":
+        cond = " OR ".join(f"CAST({c} AS TEXT) LIKE ?" for c in EMPLOYEE_SEARCH_COLUMNS)
+        return f"SELECT *, 0 AS rank FROM employees WHERE {cond} ORDER BY Emp_ID LIMIT ?", [like] * 4
+    if entity == "tasks":
+        return (f"""SELECT *, 0 AS rank FROM tasks
+                   WHERE task_name LIKE ? OR remarks LIKE ? OR emp_id IN {by_name}
+                   ORDER BY task_id LIMIT ?""", [like] * 3)
+    return (f"""SELECT *, 0 AS rank FROM feedback
+               WHERE message LIKE ? OR sender_id IN {by_name} OR receiver_id IN {by_name}
+               ORDER BY feedback_id LIMIT ?""", [like] * 3)
+
+SEARCH_ENTITIES = {"employees": "employees_fts", "tasks": "tasks_fts", "feedback": "feedback_fts"}
+
+def search(entity, query, limit=50):
+    """
+    Ranked full-text search.
+      employees: Name, Emp_ID, Skills, Role
+      tasks:     task_name, remarks, assignee name
+      feedback:  message, sender / receiver name
+    Every word is matched as a prefix. limit=None returns all matches.
+    """
+    if entity not in SEARCH_ENTITIES:
+        raise ValueError(f"Unknown search entity: {entity}")
+    fts = _fts_query(query)
+    if not fts:
+        return pd.DataFrame(columns=TABLE_COLUMNS[entity] + ["rank"])
+    use_fts = _has_fts(SEARCH_ENTITIES[entity])
+    sql, params = _search_sql(entity, fts if use_fts else None, f"%{query.strip()}%")
+    params = params + [-1 if limit is None else int(limit)]
+    tables = tuple(sorted({entity, "employees"}))
+    return _cached(tables, (sql, tuple(params)), lambda: _read_df(sql, params))
+
 # --------------------------
 # Helper Functions
 # --------------------------
@@ -31,7 +1009,7 @@ def format_emp_options(emp_df):
     return (emp_df["Emp_ID"].astype(str) + " - " + emp_df["Name"]).tolist()
 
 def get_employee_name(emp_df, emp_id):
-    """Get employee name by ID"""
+    """Get employee name by ID (per-row helper; use names_for() for columns)"""
     if emp_df.empty or emp_id not in emp_df["Emp_ID"].values:
         return str(emp_id)
     return emp_df.loc[emp_df["Emp_ID"]==emp_id, "Name"].values[0]
@@ -250,9 +1228,9 @@ def show():
         if role in ["Admin","Manager"]:
             st.subheader("📊 Feedback Analytics")
             if not feedback_df.empty:
-                feedback_df["Receiver"] = feedback_df["to_emp"].map(lambda x: get_employee_name(emp_df,x))
-                feedback_df["Sender"] = feedback_df["from_emp"].map(lambda x: get_employee_name(emp_df,x))
-                st.dataframe(feedback_df[["feedback_id","Sender","Receiver","feedback","date"]])
+                feedback_df["Receiver"] = db.names_for(feedback_df["receiver_id"])
+                feedback_df["Sender"] = db.names_for(feedback_df["sender_id"])
+                st.dataframe(feedback_df[["feedback_id","Sender","Receiver","message","log_date"]])
             else:
                 st.info("No feedback available")
 
@@ -263,4 +1241,4 @@ def show():
         st.subheader("📊 Dashboard Analytics")
         if not tasks_df.empty: st.bar_chart(tasks_df["status"].value_counts())
         if not mood_df.empty: st.bar_chart(mood_df["mood"].value_counts())
-        if not feedback_df.empty: st.bar_chart(feedback_df["feedback"].apply(len))
+        if not feedback_df.empty: st.bar_chart(feedback_df["message"].fillna("").str.len())
@@ -0,0 +1,162 @@
+# utils/db_pool.py
+"""
+Pooled SQLite connections for the Workforce data layer.
+- One long-lived connection per (thread, database file), reused across calls
+- WAL journal mode so readers never block on the writer
+- Tuned pragmas: synchronous, cache_size, mmap_size, temp_store
+- Prepared-statement cache (sqlite3 cached_statements)
+- Busy-timeout plus retry for writers that hit "database is locked"
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+DB_PATH = "data/workforce.db"
+
+BUSY_TIMEOUT_MS = 5000
+STATEMENT_CACHE_SIZE = 256
+WRITE_RETRIES = 5
+RETRY_BACKOFF_S = 0.05
+
+# Applied to every new connection, in order
+PRAGMAS = [
+    ("journal_mode", "WAL"),
+    ("synchronous", "NORMAL"),      # safe with WAL, avoids an fsync per commit
+    ("cache_size", -32000),         # ~32 MB page cache (negative = KiB)
+    ("mmap_size", 268435456),       # 256 MB memory-mapped reads
+    ("temp_store", "MEMORY"),
+    ("busy_timeout", BUSY_TIMEOUT_MS),
+]
+
+
+class ConnectionPool:
+    """Thread-safe pool handing each thread its own connection to one database file."""
+
+    def __init__(self, path=DB_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conns = {}  # thread ident -> sqlite3.Connection
+        self._watcher = None  # dedicated connection for PRAGMA data_version
+
+    def _open(self):
+        folder = os.path.dirname(self.path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder, exist_ok=True)
+        conn = sqlite3.connect(
+            self.path,
+            timeout=BUSY_TIMEOUT_MS / 1000,
+            isolation_level=None,          # autocommit; writes use transaction()
+            check_same_thread=False,       # the pool enforces thread affinity itself
+            cached_statements=STATEMENT_CACHE_SIZE,
+        )
+        for name, value in PRAGMAS:
+            conn.execute(f"PRAGMA {name}={value}")
+        return conn
+
+    def _prune_dead_threads(self):
+        """Close connections owned by threads that have exited (Streamlit reruns spawn new threads)."""
+        alive = {t.ident for t in threading.enumerate()}
+        for ident in [i for i in self._conns if i not in alive]:
+            try:
+                self._conns.pop(ident).close()
+            except Exception:
+                pass
+
+    def get(self):
+        ident = threading.get_ident()
+        conn = self._conns.get(ident)
+        if conn is not None:
+            return conn
+        with self._lock:
+            self._prune_dead_threads()
+            conn = self._open()
+            self._conns[ident] = conn
+        return conn
+
+    def data_version(self):
+        """
+        PRAGMA data_version on a private connection: changes whenever any *other*
+        connection (pooled or another process) commits to the file.
+        """
+        with self._lock:
+            if self._watcher is None:
+                self._watcher = self._open()
+            return self._watcher.execute("PRAGMA data_version").fetchone()[0]
+
+    def close_all(self):
+        with self._lock:
+            if self._watcher is not None:
+                self._watcher.close()
+                self._watcher = None
+            for conn in self._conns.values():
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+            self._conns.clear()
+
+    def size(self):
+        return len(self._conns)
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(path=None):
+    """Return the process-wide pool for a database file."""
+    path = path or DB_PATH
+    pool = _pools.get(path)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.setdefault(path, ConnectionPool(path))
+    return pool
+
+
+def get_connection(path=None):
+    """Connection owned by the calling thread. Do not close it; the pool does."""
+    return get_pool(path).get()
+
+
+def _is_locked(exc):
+    msg = str(exc).lower()
+    return "locked" in msg or "busy" in msg
+
+
+@contextmanager
+def transaction(path=None):
+    """
+    Write transaction on the calling thread's connection.
+    BEGIN IMMEDIATE takes the write lock up front so concurrent writers queue on
+    busy_timeout instead of failing mid-transaction; lock errors are retried.
+    """
+    conn = get_connection(path)
+    if conn.in_transaction:
+        # nested call: join the outer transaction
+        yield conn
+        return
+    for attempt in range(WRITE_RETRIES):
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            break
+        except sqlite3.OperationalError as e:
+            if not _is_locked(e) or attempt == WRITE_RETRIES - 1:
+                raise
+            time.sleep(RETRY_BACKOFF_S * (2 ** attempt))
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    else:
+        conn.execute("COMMIT")
+
+
+def close_all():
+    """Close every pooled connection (tests, scripts that delete the db file)."""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close_all()
@@ -1,17 +1,18 @@
 # utils/db_setup_app.py
-import sqlite3
 import os
 import hashlib
 import datetime
 
-DB_PATH = "data/workforce.db"
+from utils.db_pool import DB_PATH, get_connection, transaction, close_all
+from utils import migrations
+from utils.skills import rebuild as rebuild_skills
 
 # -------------------------
 # Helpers
 # -------------------------
 def connect_db():
-    conn = sqlite3.connect(DB_PATH)
-    return conn
+    """Pooled WAL connection (autocommit; use transaction() for writes)"""
+    return get_connection(DB_PATH)
 
 def hash_password(password):
     """Hash password using SHA-256"""
@@ -25,88 +26,22 @@ if not os.path.exists("data"):
     print("✅ Created 'data' folder")
 
 # -------------------------
-# Create all tables
+# Create / upgrade all tables (utils/migrations.py)
 # -------------------------
+migrations.migrate(DB_PATH)
 conn = connect_db()
 cursor = conn.cursor()
 
-# Users table
-cursor.execute("""
-CREATE TABLE IF NOT EXISTS users (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    username TEXT UNIQUE,
-    password TEXT,
-    role TEXT
-)
-""")
-
-# Employees table
-cursor.execute("""
-CREATE TABLE IF NOT EXISTS employees (
-    Emp_ID INTEGER PRIMARY KEY,
-    Name TEXT,
-    Age INTEGER,
-    Gender TEXT,
-    Department TEXT,
-    Role TEXT,
-    Skills TEXT,
-    Join_Date TEXT,
-    Resign_Date TEXT,
-    Status TEXT,
-    Salary REAL,
-    Location TEXT
-)
-""")
-
-# Tasks table
-cursor.execute("""
-CREATE TABLE IF NOT EXISTS tasks (
-    task_id INTEGER PRIMARY KEY AUTOINCREMENT,
-    task_name TEXT,
-    emp_id INTEGER,
-    assigned_by TEXT,
-    due_date TEXT,
-    status TEXT DEFAULT 'Pending',
-    remarks TEXT,
-    created_date TEXT
-)
-""")
-
-# Mood logs table
-cursor.execute("""
-CREATE TABLE IF NOT EXISTS mood_logs (
-    mood_id INTEGER PRIMARY KEY AUTOINCREMENT,
-    emp_id INTEGER,
-    mood TEXT,
-    remarks TEXT,
-    log_date TEXT
-)
-""")
-
-# Feedback table
-cursor.execute("""
-CREATE TABLE IF NOT EXISTS feedback (
-    feedback_id INTEGER PRIMARY KEY AUTOINCREMENT,
-    sender_id INTEGER,
-    receiver_id INTEGER,
-    message TEXT,
-    rating INTEGER,
-    log_date TEXT
-)
-""")
-
-conn.commit()
-
 # -------------------------
 # Seed default admin
 # -------------------------
 cursor.execute("SELECT * FROM users WHERE username='admin'")
 if not cursor.fetchone():
-    cursor.execute(
-        "INSERT INTO users (username, password, role) VALUES (?, ?, ?)",
-        ("admin", hash_password("admin123"), "Admin")
-    )
-    conn.commit()
+    with transaction(DB_PATH) as tx:
+        tx.execute(
+            "INSERT INTO users (username, password, role) VALUES (?, ?, ?)",
+            ("admin", hash_password("admin123"), "Admin")
+        )
     print("✅ Default admin user created: username='admin', password='admin123'")
 else:
     print("ℹ️ Admin user already exists")
@@ -121,15 +56,16 @@ if cursor.fetchone()[0] == 0:
         (2, "Jane Smith", 28, "Female", "HR", "HR Executive", "Communication,Excel", "2021-06-15", "", "Active", 45000, "Mumbai"),
         (3, "Alice Johnson", 35, "Female", "Finance", "Accountant", "Excel,Accounting", "2020-03-20", "", "Active", 60000, "Bangalore")
     ]
-    cursor.executemany("""
-        INSERT INTO employees
-        (Emp_ID, Name, Age, Gender, Department, Role, Skills, Join_Date, Resign_Date, Status, Salary, Location)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """, sample_employees)
-    conn.commit()
+    with transaction(DB_PATH) as tx:
+        tx.executemany("""
+            INSERT INTO employees
+            (Emp_ID, Name, Age, Gender, Department, Role, Skills, Join_Date, Resign_Date, Status, Salary, Location)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, sample_employees)
+        rebuild_skills(tx)
     print("✅ Sample employees added")
 else:
     print("ℹ️ Employees already exist")
 
-conn.close()
+close_all()
 print("✅ Database setup completed successfully!")
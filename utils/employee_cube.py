@@ -0,0 +1,120 @@
+# utils/employee_cube.py
+"""
+Rollup cube for the sidebar filters: Department x Location x Role x Gender x Status.
+- The base cuboid (one row per combination present) holds headcount, salary sum /
+  count / min / max and is built by one GROUP BY per employees write version
+- Any filter selection and any roll-up (by one or more dimensions) is answered
+  from those few rows, never from raw employee rows
+- A second cuboid adds Skill (from employee_skills) for single-skill filters
+"""
+
+import threading
+
+import pandas as pd
+
+from utils import database as db
+
+DIMENSIONS = ["Department", "Location", "Role", "Gender", "Status"]
+MEASURES = {
+    "headcount": ("count", None),
+    "salary_sum": ("sum", "Salary"),
+    "salary_count": ("count", "Salary"),
+    "salary_min": ("min", "Salary"),
+    "salary_max": ("max", "Salary"),
+}
+
+
+def _combine(frame, by):
+    """Roll cube rows up to `by` (list of dimensions, may be empty)"""
+    agg = {"headcount": "sum", "salary_sum": "sum", "salary_count": "sum", "salary_min": "min", "salary_max": "max"}
+    if by:
+        out = frame.groupby(by, dropna=False).agg(agg).reset_index()
+    else:
+        out = frame.agg(agg).to_frame().T
+    out["avg_salary"] = out["salary_sum"] / out["salary_count"].where(out["salary_count"] > 0)
+    return out
+
+
+class EmployeeCube:
+    def __init__(self, base: pd.DataFrame, skills: pd.DataFrame, version=None):
+        self.base = base
+        self.skills = skills
+        self.version = version
+
+    @classmethod
+    def build(cls):
+        version = db.table_version("employees")
+        base = db.aggregate("employees", MEASURES, group_by=DIMENSIONS)
+        skills = db.skill_cuboid(DIMENSIONS, MEASURES)
+        return cls(base, skills, version)
+
+    def _slice(self, filters):
+        """
+        Cube rows matching {dimension: value or list}; None / "All" mean no filter.
+        (op, value) filters raise ValueError (can_answer() is False; callers use SQLite).
+        """
+        filters = {k: v for k, v in (filters or {}).items()
+                   if v is not None and not (isinstance(v, str) and v == "All")}
+        skill = filters.pop("Skill", None)
+        unknown = set(filters) - set(DIMENSIONS)
+        if unknown:
+            raise ValueError(f"Not a cube dimension: {', '.join(sorted(unknown))}")
+        if skill is not None and not isinstance(skill, str):
+            raise ValueError("The cube answers a single Skill filter only")
+        frame = self.base if skill is None else self.skills[self.skills["Skill"].str.lower() == skill.lower()]
+        mask = pd.Series(True, index=frame.index)
+        for dim, value in filters.items():
+            if isinstance(value, tuple) and len(value) == 2 and value[0] in db._OPERATORS:
+                raise ValueError(f"The cube answers value filters only, not {dim} {value[0]} ...")
+            values = list(value) if isinstance(value, (list, set, frozenset, tuple)) else [value]
+            mask &= frame[dim].isin(values)
+        return frame[mask]
+
+    def can_answer(self, filters):
+        try:
+            self._slice(filters)
+            return True
+        except ValueError:
+            return False
+
+    def totals(self, filters=None):
+        """{"headcount", "active", "resigned", "salary_sum", "avg_salary", "salary_min", "salary_max"}"""
+        rows = self._slice(filters)
+        total = _combine(rows, []).iloc[0]
+        by_status = rows.groupby("Status")["headcount"].sum()
+        return {
+            "headcount": int(total["headcount"] or 0),
+            "active": int(by_status.get("Active", 0)),
+            "resigned": int(by_status.get("Resigned", 0)),
+            "salary_sum": float(total["salary_sum"] or 0),
+            "avg_salary": None if pd.isna(total["avg_salary"]) else float(total["avg_salary"]),
+            "salary_min": None if pd.isna(total["salary_min"]) else float(total["salary_min"]),
+            "salary_max": None if pd.isna(total["salary_max"]) else float(total["salary_max"]),
+        }
+
+    def rollup(self, by, filters=None):
+        """Measures per value of `by` (dimension or list), for the filtered slice"""
+        by = [by] if isinstance(by, str) else list(by)
+        if set(by) - set(DIMENSIONS):
+            raise ValueError(f"Not a cube dimension: {by}")
+        return _combine(self._slice(filters), by)
+
+    def values(self, dim):
+        """Sorted distinct non-null values of a dimension (sidebar options)"""
+        return sorted(self.base[dim].dropna().unique().tolist())
+
+
+_cube = {"cube": None}
+_lock = threading.Lock()
+
+
+def get_cube():
+    """The cube for the current employees data version (rebuilt after writes)"""
+    version = db.table_version("employees")
+    cube = _cube["cube"]
+    if cube is None or cube.version != version:
+        with _lock:
+            cube = _cube["cube"]
+            if cube is None or cube.version != version:
+                cube = _cube["cube"] = EmployeeCube.build()
+    return cube
@@ -0,0 +1,190 @@
+# utils/feedback_analytics.py
+"""
+Feedback rating aggregates, maintained incrementally.
+- Per receiver, per sender and per week: feedback count, rated count, rating sum and
+  sum of squares (mean / std come from those), plus the last RECENT ratings per person
+- New feedback rows are read past the last seen feedback_id (streamed, uncached) and
+  folded in; feedback is only ever inserted or deleted, so when rows go missing the
+  aggregates are rebuilt by streaming the table once. No per-row state is kept.
+- Views (top rated, frequent givers, weekly trend, rating distribution) read the
+  aggregate tables only and are cached until feedback changes
+Results carry ids; callers resolve names.
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+from utils import database as db
+
+RECENT = 5
+KEYS = {"receiver": "receiver_id", "sender": "sender_id", "week": "week"}
+STATS = ["feedback", "rated", "rating_sum", "rating_sq"]
+
+
+def _stats(frame, key):
+    """feedback / rated / rating_sum / rating_sq per value of key"""
+    rating = frame["rating"]
+    return pd.DataFrame({
+        key: frame[key],
+        "feedback": 1,
+        "rated": rating.notna().astype(int),
+        "rating_sum": rating.fillna(0),
+        "rating_sq": rating.fillna(0) ** 2,
+    }).groupby(key)[STATS].sum()
+
+
+def _with_means(stats):
+    """Add avg_rating / std_rating (sample std, NaN below two ratings)"""
+    out = stats.copy()
+    rated = out["rated"].where(out["rated"] > 0)
+    out["avg_rating"] = out["rating_sum"] / rated
+    var = (out["rating_sq"] - out["rating_sum"] ** 2 / rated) / (rated - 1).where(rated > 1)
+    out["std_rating"] = np.sqrt(var.clip(lower=0))
+    return out
+
+
+class FeedbackEngine:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        self.tables = {name: pd.DataFrame(columns=STATS, index=pd.Index([], name=key), dtype=float)
+                       for name, key in KEYS.items()}
+        self.recent = {name: pd.DataFrame(columns=["feedback_id", KEYS[name], "rating"], dtype=float)
+                       for name in ("receiver", "sender")}
+        self.ratings = pd.Series(dtype="int64", name="feedback")
+        self.count = 0
+        self.last_id = 0
+        self.version = None
+        self._derived = {}
+
+    def _chunks(self, after_id=0):
+        """New feedback rows in feedback_id order, one chunk at a time (not cached)"""
+        where = {"feedback_id": (">", after_id)} if after_id else None
+        for rows in db.iter_rows("feedback", ["feedback_id", "sender_id", "receiver_id", "rating", "log_date"],
+                                 where=where):
+            rows["rating"] = pd.to_numeric(rows["rating"], errors="coerce")
+            dates = pd.to_datetime(rows["log_date"].astype(str).str[:10], errors="coerce", format="%Y-%m-%d")
+            rows["week"] = dates.dt.to_period("W").dt.start_time
+            yield rows.drop(columns="log_date").set_index("feedback_id")
+
+    def _apply(self, rows):
+        """Add a chunk of feedback rows to every aggregate"""
+        for name, key in KEYS.items():
+            part = rows[rows[key].notna()].reset_index()
+            if part.empty:
+                continue
+            self.tables[name] = self.tables[name].add(_stats(part, key), fill_value=0)
+        counts = rows["rating"].dropna().astype(int).value_counts()
+        self.ratings = self.ratings.add(counts, fill_value=0).astype("int64").sort_index()
+        self._update_recent(rows)
+        self.count += len(rows)
+        self.last_id = int(rows.index.max())
+
+    def _update_recent(self, rows):
+        """Keep the last RECENT ratings per receiver / sender (by feedback_id)"""
+        rated = rows[rows["rating"].notna()].reset_index()
+        for name in self.recent:
+            key = KEYS[name]
+            merged = pd.concat([self.recent[name], rated[["feedback_id", key, "rating"]]], ignore_index=True)
+            merged = merged.dropna(subset=[key]).sort_values("feedback_id")
+            self.recent[name] = merged.groupby(key).tail(RECENT).reset_index(drop=True)
+
+    def refresh(self):
+        """Fold feedback added since the last call (rebuild if any was deleted); returns rows read"""
+        with self._lock:
+            version = db.table_version("feedback")
+            if version == self.version:
+                return 0
+            total = int(db.aggregate("feedback", {"n": ("count", None)})["n"].iloc[0])
+            read = 0
+            if total >= self.count:
+                for rows in self._chunks(self.last_id):
+                    self._apply(rows)
+                    read += len(rows)
+            if self.count != total:  # rows were deleted: start over from the table
+                self._reset()
+                for rows in self._chunks():
+                    self._apply(rows)
+                    read += len(rows)
+            self.version = version
+            self._derived.clear()
+            return read
+
+    def _view(self, cache_key, compute):
+        self.refresh()
+        with self._lock:
+            if cache_key not in self._derived:
+                self._derived[cache_key] = compute()
+            return self._derived[cache_key].copy()
+
+    def people(self, by="receiver"):
+        """Per receiver / sender: feedback, rated, avg_rating, std_rating, recent_avg, recent"""
+        if by not in self.recent:
+            raise ValueError(f"Bad feedback grouping: {by}")
+        key = KEYS[by]
+
+        def compute():
+            out = _with_means(self.tables[by])
+            recent = self.recent[by].groupby(key)["rating"]
+            out["recent_avg"] = recent.mean()
+            out["recent"] = recent.agg(list).reindex(out.index)
+            out = out.drop(columns=["rating_sum", "rating_sq"]).rename_axis(key).reset_index()
+            out[key] = out[key].astype("int64")
+            out[["feedback", "rated"]] = out[["feedback", "rated"]].astype(int)
+            return out
+        return self._view(("people", by), compute)
+
+    def top_rated(self, n=10, min_ratings=3):
+        """Receivers with at least min_ratings ratings, best average first"""
+        people = self.people("receiver")
+        people = people[people["rated"] >= min_ratings]
+        return people.sort_values(["avg_rating", "rated"], ascending=False).head(n).reset_index(drop=True)
+
+    def frequent_givers(self, n=10):
+        """Senders with the most feedback given"""
+        people = self.people("sender")
+        return people.sort_values(["feedback", "avg_rating"], ascending=False).head(n).reset_index(drop=True)
+
+    def weekly(self):
+        """week, feedback, rated, avg_rating, std_rating for every week with feedback"""
+        def compute():
+            out = _with_means(self.tables["week"]).drop(columns=["rating_sum", "rating_sq"])
+            out = out.sort_index().rename_axis("week").reset_index()
+            out[["feedback", "rated"]] = out[["feedback", "rated"]].astype(int)
+            return out
+        return self._view(("weekly",), compute)
+
+    def rating_distribution(self):
+        """Feedback count per rating value"""
+        return self._view(("ratings",), lambda: self.ratings.rename_axis("rating"))
+
+
+_engine = FeedbackEngine()
+
+
+def feedback_by_person(by="receiver"):
+    return _engine.people(by)
+
+
+def top_rated(n=10, min_ratings=3):
+    return _engine.top_rated(n, min_ratings)
+
+
+def frequent_givers(n=10):
+    return _engine.frequent_givers(n)
+
+
+def weekly_trend():
+    return _engine.weekly()
+
+
+def rating_distribution():
+    return _engine.rating_distribution()
+
+
+def refresh():
+    return _engine.refresh()
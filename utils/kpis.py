@@ -0,0 +1,97 @@
+# utils/kpis.py
+"""
+Materialized employee KPIs: agg_department(department, status, gender, headcount,
+salary_sum, salary_count), one row per combination present in employees.
+- Kept current by triggers on employees insert / update / delete
+- Dashboards read a few rows instead of scanning employees (see database.employee_kpis)
+- rebuild() recomputes the table from employees and reports any drift it corrected
+Run from the project root:  python -m utils.kpis
+"""
+
+from utils.db_pool import DB_PATH, transaction
+
+KEY = ["department", "status", "gender"]
+SOURCE = {"department": "Department", "status": "Status", "gender": "Gender"}
+
+# NULL keys are kept as their own group, so rows are matched with IS, not =
+_MATCH = " AND ".join(f"{k} IS {{row}}.{SOURCE[k]}" for k in KEY)
+
+
+def _add(row, sign):
+    match = _MATCH.format(row=row)
+    sql = f"""
+        UPDATE agg_department SET
+            headcount = headcount {sign} 1,
+            salary_sum = salary_sum {sign} IFNULL({row}.Salary, 0),
+            salary_count = salary_count {sign} ({row}.Salary IS NOT NULL)
+        WHERE {match};
+    """
+    if sign == "+":
+        sql = f"""
+        INSERT INTO agg_department ({', '.join(KEY)})
+            SELECT {', '.join(f'{row}.{SOURCE[k]}' for k in KEY)}
+            WHERE NOT EXISTS (SELECT 1 FROM agg_department WHERE {match});""" + sql
+    else:
+        sql += f"\n        DELETE FROM agg_department WHERE headcount <= 0 AND {match};"
+    return sql
+
+
+def create(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS agg_department (
+            department TEXT,
+            status TEXT,
+            gender TEXT,
+            headcount INTEGER NOT NULL DEFAULT 0,
+            salary_sum REAL NOT NULL DEFAULT 0,
+            salary_count INTEGER NOT NULL DEFAULT 0  -- rows with a Salary (AVG ignores NULL)
+        )
+    """)
+    conn.execute(f"CREATE INDEX IF NOT EXISTS idx_agg_department_key ON agg_department({', '.join(KEY)})")
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS agg_department_ai AFTER INSERT ON employees BEGIN
+            {_add("new", "+")}
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS agg_department_ad AFTER DELETE ON employees BEGIN
+            {_add("old", "-")}
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS agg_department_au
+        AFTER UPDATE OF Department, Status, Gender, Salary ON employees BEGIN
+            {_add("old", "-")}
+            {_add("new", "+")}
+        END
+    """)
+
+
+_RECOMPUTE = f"""
+    SELECT {', '.join(f'{SOURCE[k]} AS {k}' for k in KEY)},
+           COUNT(*) AS headcount, IFNULL(SUM(Salary), 0) AS salary_sum, COUNT(Salary) AS salary_count
+    FROM employees GROUP BY {', '.join(SOURCE[k] for k in KEY)}
+"""
+
+
+def drift(conn):
+    """Number of groups whose stored KPIs differ from a fresh recount"""
+    stored = {tuple(r[:3]): (r[3], round(r[4], 2), r[5]) for r in conn.execute(
+        f"SELECT {', '.join(KEY)}, headcount, salary_sum, salary_count FROM agg_department")}
+    fresh = {tuple(r[:3]): (r[3], round(r[4], 2), r[5]) for r in conn.execute(_RECOMPUTE)}
+    return sum(1 for k in stored.keys() | fresh.keys() if stored.get(k) != fresh.get(k))
+
+
+def rebuild(conn):
+    """Recompute agg_department from employees; returns the number of groups corrected"""
+    corrected = drift(conn)
+    conn.execute("DELETE FROM agg_department")
+    conn.execute(f"INSERT INTO agg_department ({', '.join(KEY)}, headcount, salary_sum, salary_count) {_RECOMPUTE}")
+    return corrected
+
+
+if __name__ == "__main__":
+    with transaction(DB_PATH) as tx:
+        fixed = rebuild(tx)
+    print(f"🛠️ Database: {DB_PATH}")
+    print(f"✅ KPI tables rebuilt ({fixed} drifted groups corrected)")
@@ -0,0 +1,366 @@
+# utils/migrations.py
+"""
+Versioned schema migrations for data/workforce.db.
+- schema_migrations records every applied version
+- migrate() upgrades any existing database file in place, one transaction per step
+- Old layouts from the earlier setup scripts (lowercase employees/tasks, `mood` table)
+  are converted to the application schema
+
+Add a migration by appending (version, name, function) to MIGRATIONS.
+Run from the project root:  python -m utils.migrations
+"""
+
+import re
+import datetime
+import sqlite3
+
+from utils.db_pool import DB_PATH, get_connection, transaction
+from utils import skills, kpis, salary_stats
+
+BASE_TABLES = {
+    "users": """
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE,
+            password TEXT,
+            role TEXT
+        )
+    """,
+    "employees": """
+        CREATE TABLE IF NOT EXISTS employees (
+            Emp_ID INTEGER PRIMARY KEY,
+            Name TEXT,
+            Age INTEGER,
+            Gender TEXT,
+            Department TEXT,
+            Role TEXT,
+            Skills TEXT,
+            Join_Date TEXT,
+            Resign_Date TEXT,
+            Status TEXT,
+            Salary REAL,
+            Location TEXT
+        )
+    """,
+    "tasks": """
+        CREATE TABLE IF NOT EXISTS tasks (
+            task_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            task_name TEXT,
+            emp_id INTEGER,
+            assigned_by TEXT,
+            due_date TEXT,
+            status TEXT DEFAULT 'Pending',
+            remarks TEXT,
+            created_date TEXT
+        )
+    """,
+    "mood_logs": """
+        CREATE TABLE IF NOT EXISTS mood_logs (
+            mood_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            emp_id INTEGER,
+            mood TEXT,
+            remarks TEXT,
+            log_date TEXT
+        )
+    """,
+    "feedback": """
+        CREATE TABLE IF NOT EXISTS feedback (
+            feedback_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            sender_id INTEGER,
+            receiver_id INTEGER,
+            message TEXT,
+            rating INTEGER,
+            log_date TEXT
+        )
+    """,
+}
+
+
+# -------------------------
+# Helpers
+# -------------------------
+def table_exists(conn, table):
+    row = conn.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (table,)).fetchone()
+    return row is not None
+
+def table_columns(conn, table):
+    return [r[1] for r in conn.execute(f"PRAGMA table_info({table})")]
+
+def _add_missing_columns(conn, table, columns):
+    """columns: list of (name, 'TYPE [DEFAULT ...]')"""
+    have = set(table_columns(conn, table))
+    for name, decl in columns:
+        if name not in have:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {decl}")
+
+def _rebuild_table(conn, table, create_sql, columns, select, keep_extras=True):
+    """
+    Swap `table` for a new definition the way SQLite documents it (ALTER TABLE,
+    "other kinds of table schema changes"): create {table}_new, copy the rows, drop
+    the old table, rename _new into place, recreate its indexes / triggers. RENAME TO
+    only rewrites references to {table}_new, so other tables' foreign keys to `table`
+    keep pointing at it. Runs inside migrate(), which turns foreign_keys off.
+    create_sql: CREATE TABLE statement for `table`; columns / select: copied pairwise.
+    keep_extras=False drops the old indexes / triggers (they name the old columns).
+    """
+    new = f"{table}_new"
+    extras = [r[0] for r in conn.execute(
+        "SELECT sql FROM sqlite_master WHERE tbl_name=? AND type IN ('index', 'trigger') AND sql IS NOT NULL",
+        (table,))] if keep_extras else []
+    conn.execute(re.sub(rf"^\s*CREATE TABLE (IF NOT EXISTS )?\"?{table}\"?", f"CREATE TABLE {new}",
+                        create_sql, count=1, flags=re.IGNORECASE))
+    conn.execute(f"INSERT INTO {new} ({', '.join(columns)}) SELECT {', '.join(select)} FROM {table}")
+    conn.execute(f"DROP TABLE {table}")
+    conn.execute(f"ALTER TABLE {new} RENAME TO {table}")
+    for sql in extras:
+        conn.execute(sql)
+
+def _repoint_foreign_keys(conn, parent, renamed):
+    """Rebuild tables whose foreign keys name a renamed key column of `parent` {old: new}"""
+    tables = [r[0] for r in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'")]
+    for child in tables:
+        refs = {r[4] for r in conn.execute(f"PRAGMA foreign_key_list({child})") if r[2] == parent}
+        stale = [old for old in refs if old in renamed]
+        if not stale:
+            continue
+        sql = conn.execute("SELECT sql FROM sqlite_master WHERE type='table' AND name=?", (child,)).fetchone()[0]
+        for old in stale:
+            sql = re.sub(rf"(REFERENCES\s+\"?{parent}\"?\s*\(\s*)\"?{old}\"?(\s*\))",
+                         rf"\g<1>{renamed[old]}\g<2>", sql, flags=re.IGNORECASE)
+        cols = table_columns(conn, child)
+        _rebuild_table(conn, child, sql, cols, cols)
+
+def _rebuild_from_legacy(conn, table, mapping):
+    """
+    Replace a legacy-layout table with the application layout, copying rows
+    through `mapping` {new column: old column}. Foreign keys other tables hold on
+    a renamed key column (employees(id) -> employees(Emp_ID)) are moved along.
+    """
+    old_cols = set(table_columns(conn, table))
+    pairs = [(new, old) for new, old in mapping.items() if old in old_cols]
+    _rebuild_table(conn, table, BASE_TABLES[table], [n for n, _ in pairs], [o for _, o in pairs],
+                   keep_extras=False)
+    _repoint_foreign_keys(conn, table, {old: new for new, old in pairs if old != new})
+    violations = conn.execute("PRAGMA foreign_key_check").fetchall()
+    if violations:
+        raise sqlite3.IntegrityError(f"foreign key check failed after rebuilding {table}: {violations[:5]}")
+
+
+# -------------------------
+# Migrations
+# -------------------------
+def _m001_base_schema(conn):
+    # lowercase layout from utils/db_setup.py / utils/db_setup_general.py
+    if table_exists(conn, "employees") and "Emp_ID" not in table_columns(conn, "employees"):
+        _rebuild_from_legacy(conn, "employees", {
+            "Emp_ID": "id", "Name": "name", "Age": "age", "Department": "department",
+            "Gender": "gender", "Salary": "salary", "Join_Date": "joining_date",
+        })
+    if table_exists(conn, "tasks") and "task_id" not in table_columns(conn, "tasks"):
+        _rebuild_from_legacy(conn, "tasks", {
+            "task_id": "id", "emp_id": "employee_id", "task_name": "task_name",
+            "status": "status", "due_date": "deadline",
+        })
+    for ddl in BASE_TABLES.values():
+        conn.execute(ddl)
+    # `mood` table from init_tasks_mood.py / reset_tasks_mood_db.py
+    if table_exists(conn, "mood"):
+        conn.execute("""
+            INSERT INTO mood_logs (emp_id, mood, remarks, log_date)
+            SELECT emp_id, mood, remarks, log_date FROM mood ORDER BY mood_id
+        """)
+        conn.execute("DROP TABLE mood")
+
+def _m002_task_columns(conn):
+    # tasks tables created by init_tasks_mood.py lack assigned_by / created_date,
+    # and none of the scripts had the priority column the Tasks page writes
+    _add_missing_columns(conn, "tasks", [
+        ("assigned_by", "TEXT"),
+        ("created_date", "TEXT"),
+        ("priority", "TEXT DEFAULT 'Low'"),
+    ])
+    conn.execute("UPDATE tasks SET priority='Low' WHERE priority IS NULL OR priority=''")
+
+def _m003_indexes(conn):
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_emp ON tasks(emp_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_assigned_due ON tasks(assigned_by, due_date)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_mood_emp_date ON mood_logs(emp_id, log_date)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_feedback_receiver ON feedback(receiver_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_feedback_sender ON feedback(sender_id)")
+    conn.execute("ANALYZE")
+
+def _m004_employee_indexes(conn):
+    # filter / sort columns of the Employee Records page (counts and keyset pages)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_emp_dept_status ON employees(Department, Status)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_emp_status ON employees(Status)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_emp_name ON employees(Name, Emp_ID)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_emp_join ON employees(Join_Date, Emp_ID)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_emp_salary ON employees(Salary, Emp_ID)")
+    conn.execute("ANALYZE")
+
+# Full-text indexes: (fts table, content table, rowid column, indexed columns)
+FTS_TABLES = [
+    ("employees_fts", "employees", "Emp_ID", ["Name", "Emp_ID", "Skills", "Role"]),
+    ("tasks_fts", "tasks", "task_id", ["task_name", "remarks"]),
+    ("feedback_fts", "feedback", "feedback_id", ["message"]),
+]
+
+def fts5_available(conn):
+    try:
+        conn.execute("CREATE VIRTUAL TABLE temp._fts5_probe USING fts5(x)")
+        conn.execute("DROP TABLE temp._fts5_probe")
+        return True
+    except Exception:
+        return False
+
+def _m005_fulltext(conn):
+    # External-content FTS5 tables kept in sync by triggers. SQLite builds without
+    # FTS5 skip this step and utils.database.search() falls back to LIKE.
+    if not fts5_available(conn):
+        return
+    for fts, table, key, cols in FTS_TABLES:
+        col_list = ", ".join(cols)
+        new_vals = ", ".join(f"new.{c}" for c in cols)
+        old_vals = ", ".join(f"old.{c}" for c in cols)
+        conn.execute(f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+                {col_list}, content='{table}', content_rowid='{key}',
+                tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+            )
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN
+                INSERT INTO {fts}(rowid, {col_list}) VALUES (new.{key}, {new_vals});
+            END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN
+                INSERT INTO {fts}({fts}, rowid, {col_list}) VALUES ('delete', old.{key}, {old_vals});
+            END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {col_list} ON {table} BEGIN
+                INSERT INTO {fts}({fts}, rowid, {col_list}) VALUES ('delete', old.{key}, {old_vals});
+                INSERT INTO {fts}(rowid, {col_list}) VALUES (new.{key}, {new_vals});
+            END
+        """)
+        conn.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+def _m006_employee_skills(conn):
+    # one row per (employee, canonical skill); filled from the Skills text by utils.skills
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS employee_skills (
+            emp_id INTEGER NOT NULL,
+            skill TEXT NOT NULL COLLATE NOCASE,
+            PRIMARY KEY (emp_id, skill)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_employee_skills_skill ON employee_skills(skill, emp_id)")
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS employee_skills_ad AFTER DELETE ON employees BEGIN
+            DELETE FROM employee_skills WHERE emp_id = old.Emp_ID;
+        END
+    """)
+    skills.rebuild(conn)
+    conn.execute("ANALYZE employee_skills")
+
+def _m007_kpi_tables(conn):
+    # trigger-maintained dashboard aggregates (utils/kpis.py)
+    kpis.create(conn)
+    kpis.rebuild(conn)
+
+def _m008_salary_bins(conn):
+    # trigger-maintained salary histograms for quantile queries (utils/salary_stats.py)
+    salary_stats.create(conn)
+    salary_stats.rebuild(conn)
+
+# Tables whose every insert / update / delete moves a persistent counter in data_versions
+VERSIONED_TABLES = ["employees", "tasks", "mood_logs", "feedback"]
+
+def _m009_data_versions(conn):
+    # write counters that survive restarts and count writes from any process
+    # (cache keys for stored artifacts such as the report cache)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS data_versions (
+            name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    for table in VERSIONED_TABLES:
+        conn.execute("INSERT OR IGNORE INTO data_versions (name, version) VALUES (?, 0)", (table,))
+        for suffix, event in (("ai", "INSERT"), ("ad", "DELETE"), ("au", "UPDATE")):
+            conn.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {table}_version_{suffix} AFTER {event} ON {table} BEGIN
+                    UPDATE data_versions SET version = version + 1 WHERE name = '{table}';
+                END
+            """)
+
+MIGRATIONS = [
+    (1, "base schema (employees, users, tasks, mood_logs, feedback)", _m001_base_schema),
+    (2, "tasks: assigned_by, created_date, priority", _m002_task_columns),
+    (3, "secondary indexes for per-employee / per-manager lookups", _m003_indexes),
+    (4, "employee filter / sort indexes for paginated records", _m004_employee_indexes),
+    (5, "FTS5 search over employees, tasks and feedback", _m005_fulltext),
+    (6, "employee_skills index table", _m006_employee_skills),
+    (7, "agg_department KPI table", _m007_kpi_tables),
+    (8, "salary_bins quantile histograms", _m008_salary_bins),
+    (9, "data_versions write counters", _m009_data_versions),
+]
+
+
+# -------------------------
+# Runner
+# -------------------------
+def _ensure_history(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            name TEXT,
+            applied_at TEXT
+        )
+    """)
+
+def current_version(path=None):
+    conn = get_connection(path)
+    if not table_exists(conn, "schema_migrations"):
+        return 0
+    return conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_migrations").fetchone()[0]
+
+def migrate(path=None):
+    """Apply pending migrations in order. Returns the list of versions applied."""
+    applied = []
+    if current_version(path) >= MIGRATIONS[-1][0]:
+        return applied
+    conn = get_connection(path)
+    # table rebuilds drop and rename tables other tables reference; foreign_keys can
+    # only be switched outside a transaction, so it is off for the whole run
+    enforced = conn.execute("PRAGMA foreign_keys").fetchone()[0]
+    conn.execute("PRAGMA foreign_keys=OFF")
+    try:
+        _apply(path, applied)
+    finally:
+        conn.execute(f"PRAGMA foreign_keys={'ON' if enforced else 'OFF'}")
+    return applied
+
+def _apply(path, applied):
+    for version, name, step in MIGRATIONS:
+        with transaction(path) as conn:
+            _ensure_history(conn)
+            # re-checked inside the write lock so concurrent starters apply each step once
+            done = conn.execute("SELECT 1 FROM schema_migrations WHERE version=?", (version,)).fetchone()
+            if done:
+                continue
+            step(conn)
+            conn.execute(
+                "INSERT INTO schema_migrations (version, name, applied_at) VALUES (?, ?, ?)",
+                (version, name, datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+            )
+            applied.append(version)
+
+
+if __name__ == "__main__":
+    steps = migrate()
+    print(f"🛠️ Database: {DB_PATH}")
+    print(f"✅ Applied migrations: {steps}" if steps else "ℹ️ Schema already up to date")
+    print(f"Schema version: {current_version()}")
@@ -0,0 +1,171 @@
+# utils/mood_analytics.py
+"""
+Mood time series, maintained incrementally.
+- Per-employee daily score sums / counts are kept in memory and extended with only
+  the mood_logs rows added since the last processed mood_id
+- Daily or weekly series per employee, department or the whole org, with
+  entry-weighted rolling 7 / 30-day means
+- Derived series are cached (LRU of DERIVED_MAX entries) until new logs arrive or
+  employees change; employee-level series need an explicit, capped list of keys
+Scores come from database.MOOD_SCORES.
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from utils import database as db
+
+LEVELS = {"employee": "emp_id", "department": "Department", "org": "org"}
+WINDOWS = [7, 30]
+DERIVED_MAX = 32       # cached series / summaries kept per process
+MAX_SERIES_KEYS = 50   # employees per employee-level series (the grid is dates x keys)
+
+
+class MoodEngine:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        self.daily = pd.DataFrame(columns=["score_sum", "entries"],
+                                  index=pd.MultiIndex.from_tuples([], names=["emp_id", "date"]))
+        self.last_mood_id = 0
+        self.rows = 0
+        self._derived = OrderedDict()
+
+    def _fold(self, logs):
+        logs = logs.assign(date=pd.to_datetime(logs["date"].astype(str).str[:10], errors="coerce", format="%Y-%m-%d"))
+        logs = logs[logs["date"].notna() & logs["mood"].notna()]
+        if logs.empty:
+            return
+        new = logs.groupby(["emp_id", "date"]).agg(score_sum=("mood", "sum"), entries=("mood", "count"))
+        self.daily = new if self.daily.empty else self.daily.add(new, fill_value=0)
+
+    def refresh(self):
+        """Fold mood_logs rows added since the last call into the daily table; returns rows read"""
+        with self._lock:
+            stats = db.aggregate("mood_logs", {"n": ("count", None), "last": ("max", "mood_id")})
+            total, last = int(stats["n"].iloc[0]), int(stats["last"].fillna(0).iloc[0])
+            if total == self.rows and last == self.last_mood_id:
+                return 0
+            new = db.fetch_mood(after_id=self.last_mood_id)
+            if total - len(new) != self.rows:  # rows were deleted / replaced: start over
+                self._reset()
+                new = db.fetch_mood()
+            self._fold(new)
+            self.rows += len(new)
+            if not new.empty:
+                self.last_mood_id = int(new["mood_id"].max())
+            self._derived.clear()
+            return len(new)
+
+    def _memo(self, cache_key, compute):
+        with self._lock:
+            if cache_key in self._derived:
+                self._derived.move_to_end(cache_key)
+            else:
+                self._derived[cache_key] = compute()
+                while len(self._derived) > DERIVED_MAX:
+                    self._derived.popitem(last=False)
+            return self._derived[cache_key].copy()
+
+    def _keyed(self, level, keys):
+        daily = self.daily.reset_index()
+        if level == "employee":
+            daily["key"] = daily["emp_id"]
+        elif level == "department":
+            daily["key"] = db.employee_index().lookup(daily["emp_id"], "Department").fillna("Unknown")
+        else:
+            daily["key"] = "All"
+        if keys is not None:
+            daily = daily[daily["key"].isin(keys)]
+        return daily
+
+    def _compute_series(self, level, freq, keys):
+        col = LEVELS[level]
+        cols = ["date", col, "score", "entries"] + [f"rolling_{w}" for w in WINDOWS]
+        daily = self._keyed(level, keys)
+        if daily.empty:
+            return pd.DataFrame(columns=cols)
+        # dates x keys grids of sums and counts; rolling windows run down the rows
+        sums = daily.pivot_table(index="date", columns="key", values="score_sum", aggfunc="sum")
+        counts = daily.pivot_table(index="date", columns="key", values="entries", aggfunc="sum")
+        days = pd.date_range(sums.index.min(), sums.index.max(), freq="D")
+        sums = sums.reindex(days).fillna(0)
+        counts = counts.reindex(days).fillna(0)
+        metrics = {}
+        for w in WINDOWS:
+            metrics[f"rolling_{w}"] = sums.rolling(w, min_periods=1).sum() / counts.rolling(w, min_periods=1).sum().replace(0, np.nan)
+        if freq == "W":
+            sums, counts = sums.resample("W").sum(), counts.resample("W").sum()
+            for name in metrics:
+                metrics[name] = metrics[name].resample("W").last()
+        metrics["score"] = sums / counts.replace(0, np.nan)
+        metrics["entries"] = counts
+
+        long = None
+        for name, grid in metrics.items():
+            part = grid.rename_axis(index="date", columns=col).reset_index().melt(id_vars="date", var_name=col, value_name=name)
+            long = part if long is None else long.merge(part, on=["date", col])
+        long = long[long[f"rolling_{WINDOWS[-1]}"].notna()]  # drop stretches with no logs in the longest window
+        long["entries"] = long["entries"].astype(int)
+        if level == "employee":
+            long[col] = long[col].astype("int64")
+        return long[cols].sort_values([col, "date"]).reset_index(drop=True)
+
+    def series(self, level="org", freq="D", keys=None):
+        """
+        Long DataFrame: date, <emp_id | Department | org>, score, entries, rolling_7, rolling_30.
+        freq "D" (daily) or "W" (weekly, rolling values as of the week's last day).
+        keys limits the result to some employees / departments; required for "employee"
+        (at most MAX_SERIES_KEYS).
+        """
+        if level not in LEVELS or freq not in ("D", "W"):
+            raise ValueError(f"Bad mood series request: {level}/{freq}")
+        if level == "employee" and (keys is None or len(keys) > MAX_SERIES_KEYS):
+            raise ValueError(f"Employee mood series need 1-{MAX_SERIES_KEYS} emp_ids in keys")
+        self.refresh()
+        cache_key = ("series", level, freq, None if keys is None else tuple(sorted(keys)),
+                     db.table_version("employees") if level == "department" else None)
+        return self._memo(cache_key, lambda: self._compute_series(level, freq, keys))
+
+    def summary(self, level="employee", keys=None, today=None):
+        """Per key: entries, avg_score (all time), avg_7d, avg_30d (windows ending today)"""
+        if level not in LEVELS:
+            raise ValueError(f"Bad mood level: {level}")
+        self.refresh()
+        today = pd.Timestamp(today or pd.Timestamp.today()).normalize()
+        cache_key = ("summary", level, None if keys is None else tuple(sorted(keys)), today,
+                     db.table_version("employees") if level == "department" else None)
+
+        def compute():
+            col = LEVELS[level]
+            daily = self._keyed(level, keys)
+            out = pd.DataFrame(columns=[col, "entries", "avg_score"] + [f"avg_{w}d" for w in WINDOWS])
+            if not daily.empty:
+                out = daily.groupby("key").agg(entries=("entries", "sum"), score_sum=("score_sum", "sum"))
+                out["avg_score"] = out["score_sum"] / out["entries"]
+                for w in WINDOWS:
+                    recent = daily[daily["date"] > today - pd.Timedelta(days=w)].groupby("key")[["score_sum", "entries"]].sum()
+                    out[f"avg_{w}d"] = recent["score_sum"] / recent["entries"].replace(0, np.nan)
+                out = out.drop(columns="score_sum").rename_axis(col).reset_index()
+                out["entries"] = out["entries"].astype(int)
+            return out
+        return self._memo(cache_key, compute)
+
+_engine = MoodEngine()
+
+
+def mood_series(level="org", freq="D", keys=None):
+    return _engine.series(level, freq, keys)
+
+
+def mood_summary(level="employee", keys=None):
+    return _engine.summary(level, keys)
+
+
+def refresh():
+    return _engine.refresh()
@@ -1,14 +1,16 @@
 # utils/pdf_export.py
 from reportlab.lib.pagesizes import A4
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
+from reportlab.platypus import SimpleDocTemplate, LongTable, TableStyle, Paragraph, Spacer, Image, PageBreak
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib import colors
 from reportlab.lib.units import inch
 import io
-import matplotlib.pyplot as plt
 import re
 import pandas as pd
 
+PAGE_ROWS = 40      # table rows per LongTable chunk (about one A4 page at font size 9)
+MAX_ROWS = 5000     # default cap on rows printed per table section
+
 def _sanitize_text_for_pdf(s: str) -> str:
     """Replace emojis and non-ASCII chars to avoid PDF errors."""
     if s is None:
@@ -18,6 +20,100 @@ def _sanitize_text_for_pdf(s: str) -> str:
     s = re.sub(r"[^\x00-\x7F]+", " ", s)
     return s
 
+def _chunks(source, size):
+    """DataFrame -> page-sized slices; an iterable of DataFrames (db.iter_rows) is re-cut to size"""
+    if source is None:
+        return
+    if isinstance(source, pd.DataFrame):
+        for start in range(0, len(source), size):
+            yield source.iloc[start:start + size]
+        return
+    pending = None
+    for frame in source:
+        pending = frame if pending is None else pd.concat([pending, frame])
+        while len(pending) >= size:
+            yield pending.iloc[:size]
+            pending = pending.iloc[size:]
+    if pending is not None and len(pending):
+        yield pending
+
+def _employee_rows(chunk):
+    chunk = chunk.copy()
+    for col in chunk.select_dtypes("datetime").columns:
+        chunk[col] = chunk[col].dt.strftime("%Y-%m-%d").fillna("")
+    return chunk
+
+def _mood_rows(chunk):
+    chunk = chunk.copy()
+    if "remarks" in chunk.columns:
+        chunk["remarks"] = chunk["remarks"].fillna("").astype(str).apply(_sanitize_text_for_pdf)
+    if "Name" not in chunk.columns and "Employee" in chunk.columns:
+        chunk["Name"] = chunk["Employee"]
+    return chunk
+
+def table_section(source, columns, style, prepare=None, page_rows=PAGE_ROWS, max_rows=MAX_ROWS, on_rows=None):
+    """
+    Flowables for one table, produced lazily: a LongTable (header repeated) per
+    page_rows rows of source, so only one chunk of rows is held at a time.
+    source: DataFrame or iterable of DataFrames; columns that source lacks are left out.
+    Past max_rows (None = no cap) the rest is only counted and an "N more rows" line closes the section.
+    on_rows(n) is called once the n rows of a chunk have been handed to the layout.
+    """
+    table_style = TableStyle(style)
+    printed = skipped = 0
+    cols = None
+    for chunk in _chunks(source, page_rows):
+        if max_rows is not None and printed >= max_rows:
+            skipped += len(chunk)
+            continue
+        if max_rows is not None and len(chunk) > max_rows - printed:
+            skipped += len(chunk) - (max_rows - printed)
+            chunk = chunk.iloc[:max_rows - printed]
+        if prepare is not None:
+            chunk = prepare(chunk)
+        if cols is None:
+            cols = [c for c in columns if c in chunk.columns]
+            if not cols:
+                return
+        t = LongTable([cols] + chunk[cols].values.tolist(), hAlign='LEFT', repeatRows=1)
+        t.setStyle(table_style)
+        yield t
+        printed += len(chunk)
+        if on_rows is not None:
+            on_rows(len(chunk))
+    if skipped:
+        yield Paragraph(f"... {skipped} more rows not shown (showing the first {printed}).",
+                        ParagraphStyle(name="More", fontSize=9, leading=12, spaceBefore=4))
+    if cols is not None:
+        yield Spacer(1,12)
+
+class _FlowableStream(list):
+    """
+    The story for doc.build(), pulled from a generator as reportlab consumes it
+    (it only reads / deletes from the front), so finished pages' tables can be freed.
+    """
+    LOOKAHEAD = 8
+
+    def __init__(self, flowables):
+        super().__init__()
+        self._source = iter(flowables)
+        self._fill(1)
+
+    def _fill(self, n):
+        while self._source is not None and super().__len__() < n:
+            try:
+                self.append(next(self._source))
+            except StopIteration:
+                self._source = None
+
+    def __len__(self):
+        self._fill(self.LOOKAHEAD)  # keepWithNext looks len() items ahead
+        return super().__len__()
+
+    def __getitem__(self, i):
+        self._fill(i + 1 if isinstance(i, int) and i >= 0 else self.LOOKAHEAD)
+        return super().__getitem__(i)
+
 def generate_summary_pdf(
     buffer,
     total,
@@ -28,91 +124,91 @@ def generate_summary_pdf(
     dept_fig=None,
     gender_fig=None,
     salary_fig=None,
-    title="Workforce Summary Report"
+    title="Workforce Summary Report",
+    max_rows=MAX_ROWS,
+    page_rows=PAGE_ROWS,
+    section_breaks=False,
+    on_progress=None
 ):
     """
     buffer: file path or BytesIO
-    df: employee DataFrame
-    mood_df: mood DataFrame
-    dept_fig, gender_fig, salary_fig: matplotlib Figure objects
+    df: employee DataFrame, or an iterable of DataFrame chunks (e.g. db.iter_rows("employees", ...))
+    mood_df: mood DataFrame or iterable of chunks
+    dept_fig, gender_fig, salary_fig: matplotlib Figure objects or PNG bytes
+    max_rows: rows printed per table (None = all); page_rows: rows per LongTable chunk
+    section_breaks: start each table section on a new page
+    on_progress(rows): called with the running count of table rows laid out
     """
-    if isinstance(buffer, io.BytesIO):
-        doc = SimpleDocTemplate(buffer, pagesize=A4)
-    else:
-        doc = SimpleDocTemplate(buffer, pagesize=A4)
-
-    elements = []
+    doc = SimpleDocTemplate(buffer, pagesize=A4)
     styles = getSampleStyleSheet()
 
-    # Title
-    title_style = ParagraphStyle(name="Title", fontSize=18, leading=22, alignment=1, spaceAfter=12)
-    elements.append(Paragraph(title, title_style))
-
-    # Metrics
-    metrics_style = ParagraphStyle(name="Metrics", fontSize=11, leading=14, spaceAfter=6)
-    elements.append(Paragraph(f"Total Employees: {int(total)}", metrics_style))
-    elements.append(Paragraph(f"Active Employees: {int(active)}", metrics_style))
-    elements.append(Paragraph(f"Resigned Employees: {int(resigned)}", metrics_style))
-    elements.append(Spacer(1, 12))
-
-    # Employee Table
-    if df is not None and not df.empty:
-        df_display = df.copy()
-        cols_to_show = [c for c in ["Emp_ID","Name","Department","Role","Join_Date","Status"] if c in df_display.columns]
-        df_display = df_display[cols_to_show]
-        data = [cols_to_show] + df_display.values.tolist()
-
-        pastel_blue = colors.Color(173/255,216/255,230/255)
-        pastel_grey = colors.Color(240/255,240/255,240/255)
-        t = Table(data, hAlign='LEFT', repeatRows=1)
-        t.setStyle(TableStyle([
-            ('BACKGROUND',(0,0),(-1,0),pastel_blue),
-            ('TEXTCOLOR',(0,0),(-1,0),colors.black),
-            ('ALIGN',(0,0),(-1,-1),'LEFT'),
-            ('FONTNAME',(0,0),(-1,0),'Helvetica-Bold'),
-            ('FONTSIZE',(0,0),(-1,-1),9),
-            ('BACKGROUND',(0,1),(-1,-1),pastel_grey),
-            ('GRID',(0,0),(-1,-1),0.25,colors.black)
-        ]))
-        elements.append(t)
-        elements.append(Spacer(1,12))
-
-    # Mood Table
-    if mood_df is not None and not mood_df.empty:
-        mood_df_copy = mood_df.copy()
-        if "remarks" in mood_df_copy.columns:
-            mood_df_copy["remarks"] = mood_df_copy["remarks"].fillna("").astype(str).apply(_sanitize_text_for_pdf)
-        if "Name" not in mood_df_copy.columns and "Employee" in mood_df_copy.columns:
-            mood_df_copy["Name"] = mood_df_copy["Employee"]
-        mood_cols = [c for c in ["Name","log_date","mood","remarks"] if c in mood_df_copy.columns]
-        if len(mood_cols) > 0 and len(mood_df_copy) > 0:
-            mood_data = [mood_cols] + mood_df_copy[mood_cols].values.tolist()
-            t_mood = Table(mood_data,hAlign='LEFT',repeatRows=1)
-            t_mood.setStyle(TableStyle([
-                ('BACKGROUND',(0,0),(-1,0),colors.lightgreen),
-                ('TEXTCOLOR',(0,0),(-1,0),colors.black),
-                ('ALIGN',(0,0),(-1,-1),'LEFT'),
-                ('FONTNAME',(0,0),(-1,0),'Helvetica-Bold'),
-                ('FONTSIZE',(0,0),(-1,-1),9),
-                ('GRID',(0,0),(-1,-1),0.25,colors.black)
-            ]))
-            elements.append(t_mood)
-            elements.append(Spacer(1,12))
-
-    # Figures
-    for fig, heading in zip([dept_fig, gender_fig, salary_fig],
-                            ["Department Distribution", "Gender Ratio", "Average Salary by Department"]):
-        if fig is not None:
-            buf = io.BytesIO()
-            try:
-                fig.savefig(buf, format='png', bbox_inches='tight')
-                buf.seek(0)
-                elements.append(Paragraph(heading, styles['Heading2']))
-                elements.append(Image(buf, width=6*inch, height=3*inch))
-                elements.append(Spacer(1,12))
-            except Exception:
-                continue
-
-    doc.build(elements)
+    pastel_blue = colors.Color(173/255,216/255,230/255)
+    pastel_grey = colors.Color(240/255,240/255,240/255)
+    employee_style = [
+        ('BACKGROUND',(0,0),(-1,0),pastel_blue),
+        ('TEXTCOLOR',(0,0),(-1,0),colors.black),
+        ('ALIGN',(0,0),(-1,-1),'LEFT'),
+        ('FONTNAME',(0,0),(-1,0),'Helvetica-Bold'),
+        ('FONTSIZE',(0,0),(-1,-1),9),
+        ('BACKGROUND',(0,1),(-1,-1),pastel_grey),
+        ('GRID',(0,0),(-1,-1),0.25,colors.black)
+    ]
+    mood_style = [
+        ('BACKGROUND',(0,0),(-1,0),colors.lightgreen),
+        ('TEXTCOLOR',(0,0),(-1,0),colors.black),
+        ('ALIGN',(0,0),(-1,-1),'LEFT'),
+        ('FONTNAME',(0,0),(-1,0),'Helvetica-Bold'),
+        ('FONTSIZE',(0,0),(-1,-1),9),
+        ('GRID',(0,0),(-1,-1),0.25,colors.black)
+    ]
+
+    def story():
+        # Title
+        title_style = ParagraphStyle(name="Title", fontSize=18, leading=22, alignment=1, spaceAfter=12)
+        yield Paragraph(title, title_style)
+
+        # Metrics
+        metrics_style = ParagraphStyle(name="Metrics", fontSize=11, leading=14, spaceAfter=6)
+        yield Paragraph(f"Total Employees: {int(total)}", metrics_style)
+        yield Paragraph(f"Active Employees: {int(active)}", metrics_style)
+        yield Paragraph(f"Resigned Employees: {int(resigned)}", metrics_style)
+        yield Spacer(1, 12)
+
+        # Employee and Mood Tables
+        sections = [
+            (df, ["Emp_ID","Name","Department","Role","Join_Date","Status"], employee_style, _employee_rows),
+            (mood_df, ["Name","log_date","mood","remarks"], mood_style, _mood_rows),
+        ]
+        started = False
+        done = [0]
+
+        def on_rows(n):
+            done[0] += n
+            if on_progress is not None:
+                on_progress(done[0])
+
+        for source, columns, style, prepare in sections:
+            for i, flowable in enumerate(table_section(source, columns, style, prepare, page_rows, max_rows, on_rows)):
+                if i == 0 and started and section_breaks:
+                    yield PageBreak()
+                started = True
+                yield flowable
+
+        # Figures
+        for fig, heading in zip([dept_fig, gender_fig, salary_fig],
+                                ["Department Distribution", "Gender Ratio", "Average Salary by Department"]):
+            if fig is not None:
+                buf = io.BytesIO(fig) if isinstance(fig, bytes) else io.BytesIO()
+                try:
+                    if not isinstance(fig, bytes):
+                        fig.savefig(buf, format='png', bbox_inches='tight')
+                        buf.seek(0)
+                except Exception:
+                    continue
+                yield Paragraph(heading, styles['Heading2'])
+                yield Image(buf, width=6*inch, height=3*inch)
+                yield Spacer(1,12)
+
+    doc.build(_FlowableStream(story()))
     if isinstance(buffer, io.BytesIO):
         buffer.seek(0)
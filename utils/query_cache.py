@@ -0,0 +1,88 @@
+# utils/query_cache.py
+"""
+Process-wide cache for query results, shared by all Streamlit sessions.
+- Entries are keyed by query and tagged with the write version of every table they read
+- Writers bump a table's version; stale entries are dropped immediately
+- Bounded LRU with hit / miss counters
+"""
+
+import threading
+from collections import OrderedDict
+
+
+class VersionedCache:
+    def __init__(self, max_entries=128):
+        self.max_entries = max_entries
+        self._lock = threading.RLock()
+        self._entries = OrderedDict()  # key -> (tables, version snapshot, value)
+        self._versions = {}            # table -> write version
+        self.generation = 0            # total number of bumps, all tables
+        self.hits = 0
+        self.misses = 0
+
+    def version(self, table):
+        return self._versions.get(table, 0)
+
+    def _snapshot(self, tables):
+        return tuple(self._versions.get(t, 0) for t in tables)
+
+    def bump(self, *tables):
+        """Record a write to the given tables and drop entries that read them."""
+        with self._lock:
+            for t in tables:
+                self._versions[t] = self._versions.get(t, 0) + 1
+            self.generation += 1
+            touched = set(tables)
+            for key in [k for k, (tbls, _, _) in self._entries.items() if touched.intersection(tbls)]:
+                del self._entries[key]
+
+    def bump_all(self):
+        """Invalidate everything (e.g. the database was changed by another process)."""
+        with self._lock:
+            tables = set(self._versions)
+            for _, (tbls, _, _) in self._entries.items():
+                tables.update(tbls)
+            if tables:
+                self.bump(*tables)
+            self._entries.clear()
+
+    def get_or_load(self, tables, key, loader):
+        """
+        Return the cached value for key if none of `tables` were written since it was
+        loaded; otherwise call loader() and cache its result.
+        """
+        tables = (tables,) if isinstance(tables, str) else tuple(tables)
+        full_key = (tables, key)
+        with self._lock:
+            snapshot = self._snapshot(tables)
+            entry = self._entries.get(full_key)
+            if entry is not None and entry[1] == snapshot:
+                self._entries.move_to_end(full_key)
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+        # load outside the lock; a write during the load leaves the entry stale (snapshot taken before)
+        value = loader()
+        with self._lock:
+            self._entries[full_key] = (tables, snapshot, value)
+            self._entries.move_to_end(full_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+                "entries": len(self._entries),
+                "versions": dict(self._versions),
+            }
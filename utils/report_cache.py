@@ -0,0 +1,115 @@
+# utils/report_cache.py
+"""
+Content-addressed cache of generated report files.
+- key() hashes the report type with every input: filters, title, options, inline
+  DataFrames (by content), figures (PNG bytes) and the persistent data version of each
+  table a rows(table, where) source reads, so any write to those tables changes the key
+- Files live in CACHE_DIR as <key>.pdf; a hit refreshes the file's mtime and the oldest
+  files are evicted once the directory grows past MAX_BYTES (LRU)
+"""
+
+import hashlib
+import os
+import shutil
+import threading
+
+import pandas as pd
+
+from utils import database as db
+
+CACHE_DIR = os.path.join("data", "report_cache")
+MAX_BYTES = 200 * 1024 * 1024
+
+_lock = threading.Lock()
+
+
+def _canonical(value):
+    """Stable text for a report input (dict order ignored, frames and bytes hashed)"""
+    if isinstance(value, pd.DataFrame):
+        digest = hashlib.sha256(pd.util.hash_pandas_object(value, index=False).values.tobytes()).hexdigest()
+        return f"frame({list(value.columns)},{value.shape},{digest})"
+    if isinstance(value, (bytes, bytearray)):
+        return f"bytes({hashlib.sha256(value).hexdigest()})"
+    if isinstance(value, dict):
+        return "{" + ",".join(f"{k!r}:{_canonical(v)}" for k, v in sorted(value.items(), key=lambda kv: str(kv[0]))) + "}"
+    if isinstance(value, (set, frozenset)):
+        return "{" + ",".join(sorted(_canonical(v) for v in value)) + "}"
+    if isinstance(value, (list, tuple)):
+        # namedtuples (report_jobs.RowSource) keep their type name so specs don't collide with plain tuples
+        return f"{type(value).__name__}(" + ",".join(_canonical(v) for v in value) + ")"
+    if hasattr(value, "item"):
+        value = value.item()
+    return repr(value)
+
+
+def key(report_type, params, tables=()):
+    """Cache key for report_type built from params (dict) and the data versions of `tables`"""
+    versions = {t: db.table_data_version(t) for t in sorted(set(tables))}
+    text = f"{report_type}|{_canonical(params)}|{_canonical(versions)}"
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _path(cache_key):
+    return os.path.join(CACHE_DIR, f"{cache_key}.pdf")
+
+
+def get(cache_key):
+    """Path of the cached file for cache_key (marked as recently used), or None"""
+    path = _path(cache_key)
+    try:
+        os.utime(path)
+    except OSError:
+        return None
+    return path
+
+
+def put(cache_key, source_path):
+    """Store a copy of source_path under cache_key; returns the cached path"""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    path = _path(cache_key)
+    tmp = f"{path}.{threading.get_ident()}.tmp"
+    shutil.copyfile(source_path, tmp)
+    os.replace(tmp, path)
+    evict()
+    return path
+
+
+def evict(max_bytes=None):
+    """Remove least recently used files until the cache fits in max_bytes; returns files removed"""
+    max_bytes = MAX_BYTES if max_bytes is None else max_bytes
+    with _lock:
+        if not os.path.isdir(CACHE_DIR):
+            return 0
+        files = []
+        for name in os.listdir(CACHE_DIR):
+            if not name.endswith(".pdf"):
+                continue
+            try:
+                info = os.stat(os.path.join(CACHE_DIR, name))
+            except OSError:
+                continue
+            files.append((info.st_mtime, info.st_size, name))
+        total = sum(size for _, size, _ in files)
+        removed = 0
+        for _, size, name in sorted(files):
+            if total <= max_bytes:
+                break
+            try:
+                os.remove(os.path.join(CACHE_DIR, name))
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
+
+
+def stats():
+    """{"files", "bytes"} currently held in the cache"""
+    if not os.path.isdir(CACHE_DIR):
+        return {"files": 0, "bytes": 0}
+    sizes = [os.path.getsize(os.path.join(CACHE_DIR, n)) for n in os.listdir(CACHE_DIR) if n.endswith(".pdf")]
+    return {"files": len(sizes), "bytes": sum(sizes)}
+
+
+def clear():
+    shutil.rmtree(CACHE_DIR, ignore_errors=True)
@@ -0,0 +1,367 @@
+# utils/report_jobs.py
+"""
+Background PDF report jobs.
+- submit_summary_pdf() queues generate_summary_pdf in a small process pool and returns a
+  job id at once, so the Streamlit run that pressed the button is not blocked
+- Table rows are read inside the worker (rows(table, where, search) specs are streamed with
+  db.iter_rows); figures travel as PNG bytes
+- Each job keeps <job_id>.json (state, progress) and the finished <job_id>.pdf under
+  REPORT_DIR, so any rerun or session can poll it and download the file
+- Finished PDFs go into utils.report_cache; a submit whose inputs and source data are
+  unchanged is answered from it at once, and one still being built is joined, not repeated
+- submit_employee_pack() fans personal summary PDFs out over a second pool (one process
+  per core) in batches; each worker reads its employees with db.employee_profile() and the
+  PDFs are written into a zip on disk as batches complete
+- show_job() is the page panel: a progress bar while the job runs, a download button after
+"""
+
+import io
+import json
+import multiprocessing
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+import zipfile
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+import pandas as pd
+import streamlit as st
+
+from utils import db_pool, report_cache
+
+REPORT_DIR = os.path.join("data", "reports")
+MAX_WORKERS = 2
+PACK_WORKERS = os.cpu_count() or 2  # processes for bulk per-employee packs
+PACK_BATCH = 25                      # employees per pack task
+KEEP_HOURS = 24          # finished reports older than this are removed on the next submit
+POLL_SECONDS = 1.0
+PROGRESS_EVERY_S = 0.5   # minimum interval between progress writes from a worker
+
+RowSource = namedtuple("RowSource", ["table", "where", "columns", "search"])
+
+_executor = None
+_pack_executor = None
+_coordinator = ThreadPoolExecutor(max_workers=2, thread_name_prefix="report-pack")
+_futures = {}  # job_id -> Future, for jobs submitted by this process
+_inflight = {}  # report cache key -> job_id still being built
+_lock = threading.Lock()
+
+
+def rows(table, where=None, columns=None, search=None):
+    """
+    Table rows for a report, read by the worker instead of being pickled into the job.
+    search: employees only, the page's text search (see db.iter_rows).
+    """
+    return RowSource(table, where, columns, search or None)
+
+
+def _pool():
+    global _executor
+    with _lock:
+        if _executor is None:
+            # spawn: never fork the threaded Streamlit server
+            _executor = ProcessPoolExecutor(max_workers=MAX_WORKERS,
+                                            mp_context=multiprocessing.get_context("spawn"))
+        return _executor
+
+
+def _pack_pool():
+    global _pack_executor
+    with _lock:
+        if _pack_executor is None:
+            _pack_executor = ProcessPoolExecutor(max_workers=PACK_WORKERS,
+                                                 mp_context=multiprocessing.get_context("spawn"))
+        return _pack_executor
+
+
+def _path(job_id, ext):
+    return os.path.join(REPORT_DIR, f"{job_id}.{ext}")
+
+
+def _read_state(job_id):
+    try:
+        with open(_path(job_id, "json")) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_state(job_id, **updates):
+    state = _read_state(job_id) or {}
+    state.update(updates, updated=time.time())
+    tmp = _path(job_id, "json.tmp")
+    with open(tmp, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp, _path(job_id, "json"))
+    return state
+
+
+def _png(fig):
+    if fig is None or isinstance(fig, bytes):
+        return fig
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", bbox_inches="tight")
+    return buf.getvalue()
+
+
+def _run_summary_pdf(job_id, db_path, report_dir, kwargs):
+    """Worker: build the PDF into REPORT_DIR, recording progress in the job's state file"""
+    global REPORT_DIR
+    from utils import database as db
+    from utils.pdf_export import generate_summary_pdf, MAX_ROWS
+
+    db_pool.DB_PATH, REPORT_DIR = db_path, report_dir  # as configured in the submitting process
+    _write_state(job_id, state="running", started=time.time())
+    try:
+        max_rows = kwargs.get("max_rows", MAX_ROWS)
+        expected = 0
+        for key in ("df", "mood_df"):
+            source = kwargs.get(key)
+            if isinstance(source, RowSource):
+                if source.table == "employees":
+                    n = db.count_employees(source.where, source.search)
+                else:
+                    n = int(db.aggregate(source.table, {"n": ("count", None)}, where=source.where)["n"].iloc[0])
+                kwargs[key] = db.iter_rows(source.table, source.columns, source.where, search=source.search)
+            else:
+                n = 0 if source is None else len(source)
+            expected += n if max_rows is None else min(n, max_rows)
+        last = [0.0]
+
+        def on_progress(done):
+            now = time.time()
+            if now - last[0] >= PROGRESS_EVERY_S:
+                last[0] = now
+                _write_state(job_id, progress=min(done / expected, 0.99) if expected else 0.0, rows=done)
+
+        tmp = _path(job_id, "pdf.tmp")
+        generate_summary_pdf(tmp, on_progress=on_progress, **kwargs)
+        os.replace(tmp, _path(job_id, "pdf"))
+        _write_state(job_id, state="done", progress=1.0, finished=time.time())
+    except Exception as e:
+        _write_state(job_id, state="failed", error=f"{type(e).__name__}: {e}", finished=time.time())
+
+
+def _on_done(job_id, cache_key, future):
+    """
+    Cache a finished PDF; record jobs whose worker never got to write a final state
+    (pickling error, killed pool)
+    """
+    with _lock:
+        if _inflight.get(cache_key) == job_id:
+            del _inflight[cache_key]
+    error = future.exception()
+    state = (_read_state(job_id) or {}).get("state")
+    if error is not None and state not in ("done", "failed"):
+        _write_state(job_id, state="failed", error=f"{type(error).__name__}: {error}", finished=time.time())
+    elif state == "done":
+        report_cache.put(cache_key, _path(job_id, "pdf"))
+
+
+def _link(source, target):
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copyfile(source, target)
+
+
+def submit_summary_pdf(total, active, resigned, df, **kwargs):
+    """
+    Queue generate_summary_pdf(total, active, resigned, df, **kwargs) and return its job id.
+    df / mood_df: DataFrame or rows(table, where, search); figures are rendered to PNG here.
+    An unchanged report comes back as an already finished job from the report cache.
+    """
+    cleanup()
+    os.makedirs(REPORT_DIR, exist_ok=True)
+    for key in ("dept_fig", "gender_fig", "salary_fig"):
+        if key in kwargs:
+            kwargs[key] = _png(kwargs[key])
+    kwargs.update(total=total, active=active, resigned=resigned, df=df)
+    tables = [s.table for s in (kwargs.get("df"), kwargs.get("mood_df")) if isinstance(s, RowSource)]
+    cache_key = report_cache.key("summary_pdf", kwargs, tables)
+    job_id = uuid.uuid4().hex
+    cached = report_cache.get(cache_key)
+    if cached is not None:
+        _link(cached, _path(job_id, "pdf"))
+        _write_state(job_id, state="done", progress=1.0, title=kwargs.get("title"), cached=True,
+                     created=time.time(), finished=time.time())
+        return job_id
+    with _lock:
+        running = _inflight.get(cache_key)
+        if running is not None and (running not in _futures or not _futures[running].done()):
+            return running
+        _inflight[cache_key] = job_id
+    _write_state(job_id, state="queued", progress=0.0, title=kwargs.get("title"), created=time.time())
+    future = _pool().submit(_run_summary_pdf, job_id, db_pool.DB_PATH, REPORT_DIR, kwargs)
+    _futures[job_id] = future
+    future.add_done_callback(lambda f: _on_done(job_id, cache_key, f))
+    return job_id
+
+
+def status(job_id):
+    """{"state": queued / running / done / failed, "progress": 0..1, ...} or None for an unknown job"""
+    state = _read_state(job_id)
+    if state is None:
+        return None
+    if state.get("state") in ("queued", "running") and job_id not in _futures:
+        # left over from a server that stopped before the job finished
+        state = _write_state(job_id, state="failed", error="Interrupted", finished=time.time())
+    return state
+
+
+def result_path(job_id):
+    """Path of the finished PDF (or zip), or None while the job is not done"""
+    state = _read_state(job_id) or {}
+    path = _path(job_id, state.get("ext", "pdf"))
+    return path if state.get("state") == "done" and os.path.exists(path) else None
+
+
+# -------------------------
+# Per-employee summary packs
+# -------------------------
+def personal_frames(profile):
+    """(employee frame, mood frame) for a personal summary from db.employee_profile()"""
+    employee = pd.DataFrame([profile["employee"]]) if profile and profile["employee"] else pd.DataFrame(
+        columns=["Emp_ID","Name","Age","Gender","Department","Role","Skills",
+                 "Join_Date","Resign_Date","Status","Salary","Location"])
+    moods = profile["moods"].rename(columns={"mood": "score", "mood_label": "mood", "date": "log_date"}) \
+        if profile else pd.DataFrame()
+    return employee, moods
+
+
+def _run_employee_batch(db_path, emp_ids):
+    """Worker: personal summary PDFs for a batch of employees -> [(file name, PDF bytes)]"""
+    from utils import database as db
+    from utils.pdf_export import generate_summary_pdf
+
+    db_pool.DB_PATH = db_path
+    out = []
+    for emp_id in emp_ids:
+        employee, moods = personal_frames(db.employee_profile(emp_id))
+        if employee.empty:
+            continue
+        name = str(employee["Name"].iloc[0])
+        status = employee["Status"]
+        buf = io.BytesIO()
+        generate_summary_pdf(buf, len(employee), int(status.eq("Active").sum()), int(status.eq("Resigned").sum()),
+                             employee, mood_df=moods, title=f"{name} - Employee Summary")
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", name).strip("_") or "employee"
+        out.append((f"{int(emp_id):06d}_{slug}.pdf", buf.getvalue()))
+    return out
+
+
+def _run_pack(job_id, db_path, emp_ids):
+    """Coordinator thread: keep the pack pool busy and stream finished PDFs into the zip"""
+    _write_state(job_id, state="running", started=time.time())
+    batches = [emp_ids[i:i + PACK_BATCH] for i in range(0, len(emp_ids), PACK_BATCH)]
+    pending, done, last = set(), 0, 0.0
+    pool = _pack_pool()
+    tmp = _path(job_id, "zip.tmp")
+    try:
+        with zipfile.ZipFile(tmp, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+            while batches or pending:
+                # at most two batches per worker in flight: memory stays bounded by batch size
+                while batches and len(pending) < 2 * PACK_WORKERS:
+                    pending.add(pool.submit(_run_employee_batch, db_path, batches.pop(0)))
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    for name, data in future.result():
+                        zf.writestr(name, data)
+                        done += 1
+                if time.time() - last >= PROGRESS_EVERY_S:
+                    last = time.time()
+                    _write_state(job_id, progress=min(done / len(emp_ids), 0.99), files=done)
+        os.replace(tmp, _path(job_id, "zip"))
+        _write_state(job_id, state="done", progress=1.0, files=done, finished=time.time())
+    except Exception as e:
+        for future in pending:
+            future.cancel()
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        _write_state(job_id, state="failed", error=f"{type(e).__name__}: {e}", finished=time.time())
+
+
+def submit_employee_pack(where=None, title="Personal summaries"):
+    """
+    Queue a zip with one personal summary PDF per employee matching where
+    (default: active employees) and return its job id.
+    """
+    from utils import database as db
+
+    cleanup()
+    os.makedirs(REPORT_DIR, exist_ok=True)
+    where = {"Status": "Active"} if where is None else where
+    emp_ids = db.fetch_employees(columns=["Emp_ID"], where=where, compact=False)["Emp_ID"].astype(int).tolist()
+    job_id = uuid.uuid4().hex
+    _write_state(job_id, state="queued", progress=0.0, title=title, ext="zip", mime="application/zip",
+                 total_files=len(emp_ids), files=0, created=time.time())
+    _futures[job_id] = _coordinator.submit(_run_pack, job_id, db_pool.DB_PATH, emp_ids)
+    return job_id
+
+
+def cleanup(max_age_hours=KEEP_HOURS):
+    """Delete report files older than max_age_hours; returns the number removed"""
+    if not os.path.isdir(REPORT_DIR):
+        return 0
+    cutoff = time.time() - max_age_hours * 3600
+    removed = 0
+    for name in os.listdir(REPORT_DIR):
+        path = os.path.join(REPORT_DIR, name)
+        job_id = name.split(".")[0]
+        if job_id in _futures and not _futures[job_id].done():
+            continue
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+                _futures.pop(job_id, None)
+                removed += 1
+        except OSError:
+            pass
+    return removed
+
+
+def _show_state(state, job_id, file_name, label):
+    if state["state"] == "done":
+        path = result_path(job_id)
+        if path is None:  # removed by cleanup()
+            return
+        with open(path, "rb") as f:
+            st.download_button(label, f.read(), file_name=file_name, mime=state.get("mime", "application/pdf"))
+    elif state["state"] == "failed":
+        what = "report pack" if state.get("ext") == "zip" else "PDF"
+        st.error(f"Failed to generate {what}: {state.get('error', 'unknown error')}")
+    else:
+        if state["state"] == "queued":
+            text = "Queued..."
+        elif "total_files" in state:
+            text = f"Generating PDFs... {state.get('files', 0)} / {state['total_files']}"
+        else:
+            text = f"Generating PDF... {state.get('rows', 0)} rows"
+        st.progress(float(state.get("progress", 0.0)), text=text)
+
+
+def show_job(key, file_name, label="📥 Download Report (PDF)"):
+    """
+    Panel for the job id kept in st.session_state[key]. While the job runs only this
+    panel re-runs (every POLL_SECONDS); the page reruns once when it finishes.
+    """
+    job_id = st.session_state.get(key)
+    state = status(job_id) if job_id else None
+    if state is None:
+        return
+    if state["state"] in ("done", "failed"):
+        _show_state(state, job_id, file_name, label)
+        return
+
+    @st.fragment(run_every=POLL_SECONDS)
+    def poll():
+        current = status(job_id)
+        if current is not None and current["state"] in ("done", "failed"):
+            st.rerun()
+        _show_state(current or state, job_id, file_name, label)
+
+    poll()
@@ -0,0 +1,135 @@
+# utils/salary_stats.py
+"""
+Salary distribution sketches: salary_bins(dimension, value, status, bin, n).
+- One fixed-bin histogram per Department, Role and Location value, split by Status;
+  bins keep 3 significant digits, so each is at most 1% wide
+- Kept current by triggers on employees insert / update / delete (one upsert per
+  row), like agg_department
+- Histograms merge by adding counts, so roll-ups (all statuses, several values, the
+  whole company = all Department histograms) are SUMs over a few hundred rows
+  instead of a sort of the Salary column
+- quantiles() interpolates inside the bin holding each requested rank
+Run from the project root:  python -m utils.salary_stats
+"""
+
+import numpy as np
+import pandas as pd
+
+from utils.db_pool import DB_PATH, transaction
+
+DIMENSIONS = ["Department", "Role", "Location"]
+
+# bin width grows by 10x per decade: [THRESHOLDS[i-1], THRESHOLDS[i]) has width 10**i
+THRESHOLDS = [10 ** d for d in range(3, 13)]
+_WIDTH_SQL = "CASE " + " ".join(f"WHEN {{s}} < {t} THEN {10 ** i}" for i, t in enumerate(THRESHOLDS)) + \
+             f" ELSE {10 ** len(THRESHOLDS)} END"
+
+
+def bin_sql(salary):
+    """SQL expression: lower bound of the bin holding `salary`"""
+    width = _WIDTH_SQL.format(s=salary)
+    return f"(CAST({salary} / ({width}) AS INTEGER) * ({width}))"
+
+
+def bin_width(lower):
+    """Width of the bins starting at `lower` (array-like), same rule as bin_sql"""
+    return 10.0 ** np.searchsorted(THRESHOLDS, np.asarray(lower, dtype="float64"), side="right")
+
+
+def _keys(row):
+    """VALUES list of the (dimension, value) histograms one employees row belongs to"""
+    return "VALUES " + ", ".join(f"('{d}', IFNULL({row}.{d}, ''))" for d in DIMENSIONS)
+
+
+def _add(row):
+    return f"""
+        INSERT INTO salary_bins (dimension, value, status, bin, n)
+            SELECT k.column1, k.column2, IFNULL({row}.Status, ''), {bin_sql(f'{row}.Salary')}, 1
+            FROM ({_keys(row)}) AS k WHERE {row}.Salary IS NOT NULL
+            ON CONFLICT (dimension, value, status, bin) DO UPDATE SET n = n + 1;"""
+
+
+def _remove(row):
+    match = (f"status = IFNULL({row}.Status, '') AND bin = {bin_sql(f'{row}.Salary')} "
+             f"AND (dimension, value) IN ({_keys(row)})")
+    return f"""
+        UPDATE salary_bins SET n = n - 1 WHERE {match};
+        DELETE FROM salary_bins WHERE n <= 0 AND {match};"""
+
+
+def create(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS salary_bins (
+            dimension TEXT NOT NULL,
+            value TEXT NOT NULL,        -- '' for a missing Department / Role / Location
+            status TEXT NOT NULL,       -- '' for a missing Status
+            bin REAL NOT NULL,          -- lower bound; width from bin_width()
+            n INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (dimension, value, status, bin)
+        ) WITHOUT ROWID
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS salary_bins_ai AFTER INSERT ON employees BEGIN
+            {_add("new")}
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS salary_bins_ad AFTER DELETE ON employees BEGIN
+            {_remove("old")}
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS salary_bins_au
+        AFTER UPDATE OF {', '.join(DIMENSIONS)}, Status, Salary ON employees BEGIN
+            {_remove("old")}
+            {_add("new")}
+        END
+    """)
+
+
+_RECOMPUTE = " UNION ALL ".join(
+    f"SELECT '{d}' AS dimension, IFNULL({d}, '') AS value, IFNULL(Status, '') AS status, "
+    f"{bin_sql('Salary')} AS bin, COUNT(*) AS n "
+    f"FROM employees WHERE Salary IS NOT NULL GROUP BY 2, 3, 4"
+    for d in DIMENSIONS
+)
+
+
+def drift(conn):
+    """Number of histogram bins whose stored count differs from a fresh recount"""
+    stored = {tuple(r[:4]): r[4] for r in conn.execute("SELECT dimension, value, status, bin, n FROM salary_bins")}
+    fresh = {tuple(r[:4]): r[4] for r in conn.execute(_RECOMPUTE)}
+    return sum(1 for k in stored.keys() | fresh.keys() if stored.get(k) != fresh.get(k))
+
+
+def rebuild(conn):
+    """Recompute salary_bins from employees; returns the number of bins corrected"""
+    corrected = drift(conn)
+    conn.execute("DELETE FROM salary_bins")
+    conn.execute(f"INSERT INTO salary_bins (dimension, value, status, bin, n) {_RECOMPUTE}")
+    return corrected
+
+
+def quantiles(bins: pd.DataFrame, qs) -> pd.Series:
+    """
+    Quantiles from one merged histogram (columns bin, n; any order, repeated bins allowed).
+    Values are interpolated linearly inside the bin that holds each rank.
+    """
+    merged = bins.groupby("bin")["n"].sum()
+    merged = merged[merged > 0]
+    if merged.empty:
+        return pd.Series(np.nan, index=list(qs), dtype="float64")
+    lower = merged.index.to_numpy(dtype="float64")
+    counts = merged.to_numpy(dtype="float64")
+    cum = counts.cumsum()
+    target = np.clip(np.asarray(qs, dtype="float64"), 0, 1) * cum[-1]
+    i = np.minimum(np.searchsorted(cum, target, side="left"), len(cum) - 1)
+    frac = (target - (cum[i] - counts[i])) / counts[i]
+    return pd.Series(lower[i] + bin_width(lower[i]) * frac, index=list(qs))
+
+
+if __name__ == "__main__":
+    with transaction(DB_PATH) as tx:
+        fixed = rebuild(tx)
+    print(f"🛠️ Database: {DB_PATH}")
+    print(f"✅ Salary histograms rebuilt ({fixed} drifted bins corrected)")
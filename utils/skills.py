@@ -0,0 +1,67 @@
+# utils/skills.py
+"""
+Normalized skills index: employee_skills(emp_id, skill), one row per skill.
+- The free-text Skills column is parsed once, when an employee is written
+- Separators ; , | and newlines are all accepted
+- Skill names are canonical: whitespace collapsed, case-insensitive, one stored
+  spelling per skill (the first one written wins)
+Reads / filters live in utils.database (skill_counts, fetch_skills, where={"Skill": ...}).
+"""
+
+import re
+
+SEPARATORS = re.compile(r"[;,|\n]")
+EMPTY_VALUES = {"", "na", "n/a", "none", "-"}
+
+
+def parse_skills(text):
+    """'python; SQL ,  machine learning' -> ['Python', 'SQL', 'Machine learning']"""
+    if text is None or (isinstance(text, float) and text != text):
+        return []
+    skills, seen = [], set()
+    for raw in SEPARATORS.split(str(text)):
+        skill = " ".join(raw.split())
+        key = skill.lower()
+        if key in EMPTY_VALUES or key in seen:
+            continue
+        seen.add(key)
+        skills.append(skill[0].upper() + skill[1:] if skill.islower() else skill)
+    return skills
+
+
+def _stored_spellings(conn, keys):
+    """lowercase name -> spelling already in employee_skills (column is COLLATE NOCASE)"""
+    keys = list(keys)
+    found = {}
+    for i in range(0, len(keys), 900):
+        part = keys[i:i + 900]
+        rows = conn.execute(
+            f"SELECT DISTINCT skill FROM employee_skills WHERE skill IN ({', '.join('?' * len(part))})", part)
+        found.update((r[0].lower(), r[0]) for r in rows)
+    return found
+
+
+def write_skills(conn, pairs):
+    """
+    Replace the skill rows of each (emp_id, Skills text) pair.
+    Runs on the caller's connection, inside the caller's transaction.
+    """
+    parsed = [(int(emp_id), parse_skills(text)) for emp_id, text in pairs]
+    if not parsed:
+        return
+    spelling = {}
+    for _, skills in parsed:
+        for s in skills:
+            spelling.setdefault(s.lower(), s)
+    spelling.update(_stored_spellings(conn, spelling))
+    conn.executemany("DELETE FROM employee_skills WHERE emp_id=?", [(e,) for e, _ in parsed])
+    conn.executemany(
+        "INSERT OR IGNORE INTO employee_skills (emp_id, skill) VALUES (?, ?)",
+        [(e, spelling[s.lower()]) for e, skills in parsed for s in skills]
+    )
+
+
+def rebuild(conn):
+    """Re-derive the whole index from employees.Skills (after raw SQL writes)"""
+    conn.execute("DELETE FROM employee_skills")
+    write_skills(conn, conn.execute("SELECT Emp_ID, Skills FROM employees").fetchall())